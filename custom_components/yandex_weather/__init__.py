@@ -5,24 +5,92 @@ from __future__ import annotations
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME
+from homeassistant.const import (
+    CONF_API_KEY,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_NAME,
+    Platform,
+)
 from homeassistant.core import HomeAssistant
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import slugify
 
+from .analytics import ForecastAccuracy
+from .archive import ForecastArchive
+from .area import grid_points, parse_area
+from .cache import create_backend
 from .config_flow import get_value
 from .const import (
+    AREA_PLATFORMS,
+    CACHE_BACKEND_NONE,
+    CONF_ARCHIVE,
+    CONF_AREA,
+    CONF_CACHE_BACKEND,
+    CONF_CACHE_URL,
+    CONF_COOLING_BASE,
+    CONF_ENTRY_TYPE,
+    CONF_FAIR_SHARE,
+    CONF_GRID_SIZE,
+    CONF_HEATING_BASE,
+    CONF_INTERPOLATE,
+    CONF_INTERPOLATION_RESOLUTION,
+    CONF_KEY_POOL,
     CONF_LANGUAGE_KEY,
+    CONF_POOL_API_KEYS,
+    CONF_QUOTA_PRIORITY,
+    CONF_QUOTA_WEIGHT,
+    CONF_REFRESH_PHASE,
+    CONF_SCHEDULE_MODE,
     CONF_UPDATES_PER_DAY,
+    DEFAULT_CACHE_BACKEND,
+    DEFAULT_COOLING_BASE,
+    DEFAULT_GRID_SIZE,
+    DEFAULT_HEATING_BASE,
+    DEFAULT_INTERPOLATION_RESOLUTION,
+    DEFAULT_QUOTA_PRIORITY,
+    DEFAULT_QUOTA_WEIGHT,
+    DEFAULT_SCHEDULE_MODE,
     DEFAULT_UPDATES_PER_DAY,
     DOMAIN,
     ENTRY_NAME,
+    ENTRY_OPTIONS,
+    ENTRY_TYPE_AREA,
+    ENTRY_TYPE_POINT,
+    ICON_CACHE,
+    ICON_CACHE_MAX_BYTES,
     PLATFORMS,
+    PRESENTATION_OPTIONS,
     UPDATE_LISTENER,
     UPDATER,
     UPDATES_PER_DAY,
+    changed_options,
 )
-from .updater import WeatherUpdater
+from .degree_days import DegreeDays
+from .history import ConditionHistory
+from .icons import IconCache, IconView
+from .keys import KEY_POOL, parse_api_keys
+from .quota import QuotaScheduler, QuotaShare
+from .services import async_setup_services
+from .updater import AreaUpdater, WeatherUpdater
+from .websocket import async_setup_websocket
 
 _LOGGER = logging.getLogger(__name__)
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up integration services, websocket commands and icon proxy."""
+    await async_setup_services(hass)
+    await async_setup_websocket(hass)
+    hass.data[ICON_CACHE] = IconCache(
+        hass, hass.config.path(STORAGE_DIR, DOMAIN, "icons"), ICON_CACHE_MAX_BYTES
+    )
+    if hass.http is not None:
+        hass.http.register_view(IconView(hass.data[ICON_CACHE]))
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -32,39 +100,145 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     latitude = get_value(entry, CONF_LATITUDE, hass.config.latitude)
     longitude = get_value(entry, CONF_LONGITUDE, hass.config.longitude)
     updates_per_day = get_value(entry, UPDATES_PER_DAY, DEFAULT_UPDATES_PER_DAY)
+    updater_options = {
+        "api_key": api_key,
+        "hass": hass,
+        "device_id": entry.unique_id,
+        "language": get_value(entry, CONF_LANGUAGE_KEY, "EN"),
+        "updates_per_day": updates_per_day,
+        "name": name,
+        "schedule_mode": get_value(entry, CONF_SCHEDULE_MODE, DEFAULT_SCHEDULE_MODE),
+        "refresh_phase": get_value(entry, CONF_REFRESH_PHASE),
+    }
+    cache_backend = get_value(entry, CONF_CACHE_BACKEND, DEFAULT_CACHE_BACKEND)
+    if cache_backend != CACHE_BACKEND_NONE:
+        cache = create_backend(hass, cache_backend, get_value(entry, CONF_CACHE_URL))
+        entry.async_on_unload(cache.async_close)
+        updater_options["cache"] = cache
+    if get_value(entry, CONF_KEY_POOL, False):
+        keys = [api_key, *parse_api_keys(get_value(entry, CONF_POOL_API_KEYS))]
+        await KEY_POOL.async_load(hass)
+        KEY_POOL.add(keys)
+        entry.async_on_unload(lambda: KEY_POOL.remove(keys))
+        updater_options["key_pool"] = KEY_POOL
+    quota = None
+    if get_value(entry, CONF_FAIR_SHARE, False):
+        quota = (
+            QuotaScheduler.for_pool(KEY_POOL)
+            if "key_pool" in updater_options
+            else QuotaScheduler.for_key(api_key)
+        )
+        updater_options["quota"] = quota
 
-    weather_updater = WeatherUpdater(
-        latitude=latitude,
-        longitude=longitude,
-        api_key=api_key,
-        hass=hass,
-        device_id=entry.unique_id,
-        language=get_value(entry, CONF_LANGUAGE_KEY, "EN"),
-        updates_per_day=updates_per_day,
-        name=name,
-    )
+    if is_area_entry(entry):
+        weather_updater = AreaUpdater(
+            points=grid_points(
+                parse_area(get_value(entry, CONF_AREA)),
+                get_value(entry, CONF_GRID_SIZE, DEFAULT_GRID_SIZE),
+            ),
+            **updater_options,
+        )
+    else:
+        archive = accuracy = None
+        if get_value(entry, CONF_ARCHIVE, False):
+            archive = ForecastArchive(
+                hass.config.path(STORAGE_DIR, DOMAIN, f"{slugify(entry.unique_id)}.bin")
+            )
+            accuracy = ForecastAccuracy(hass, slugify(entry.unique_id))
+            await accuracy.async_load()
+        condition_history = ConditionHistory(hass, slugify(entry.unique_id))
+        await condition_history.async_load()
+        degree_days = DegreeDays(
+            hass,
+            slugify(entry.unique_id),
+            heating_base=get_value(entry, CONF_HEATING_BASE, DEFAULT_HEATING_BASE),
+            cooling_base=get_value(entry, CONF_COOLING_BASE, DEFAULT_COOLING_BASE),
+        )
+        await degree_days.async_load()
+        weather_updater = WeatherUpdater(
+            latitude=latitude,
+            longitude=longitude,
+            archive=archive,
+            accuracy=accuracy,
+            interpolation_resolution=get_interpolation_resolution(entry),
+            condition_history=condition_history,
+            degree_days=degree_days,
+            **updater_options,
+        )
+
+    if quota is not None:
+        quota.register(
+            entry.unique_id,
+            QuotaShare(
+                weight=get_value(entry, CONF_QUOTA_WEIGHT, DEFAULT_QUOTA_WEIGHT),
+                priority=get_value(entry, CONF_QUOTA_PRIORITY, DEFAULT_QUOTA_PRIORITY),
+                demand=updates_per_day,
+                status=weather_updater.quota_status,
+            ),
+        )
+        entry.async_on_unload(lambda: quota.unregister(entry.unique_id))
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
         ENTRY_NAME: name,
+        ENTRY_OPTIONS: {**entry.data, **entry.options},
         UPDATER: weather_updater,
     }
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await hass.config_entries.async_forward_entry_setups(entry, entry_platforms(entry))
+    entry.async_on_unload(weather_updater.async_start_interpolation())
     update_listener = entry.add_update_listener(async_update_options)
     hass.data[DOMAIN][entry.entry_id][UPDATE_LISTENER] = update_listener
 
     return True
 
 
+def is_area_entry(entry: ConfigEntry) -> bool:
+    """Is entry weather over area?"""
+    return get_value(entry, CONF_ENTRY_TYPE, ENTRY_TYPE_POINT) == ENTRY_TYPE_AREA
+
+
+def entry_platforms(entry: ConfigEntry) -> list[Platform]:
+    """Platforms of entry."""
+    return AREA_PLATFORMS if is_area_entry(entry) else PLATFORMS
+
+
+def get_interpolation_resolution(entry: ConfigEntry) -> float | None:
+    """Get interpolation resolution, None if interpolation is disabled."""
+    if not get_value(entry, CONF_INTERPOLATE, False):
+        return None
+    return get_value(
+        entry, CONF_INTERPOLATION_RESOLUTION, DEFAULT_INTERPOLATION_RESOLUTION
+    )
+
+
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Update options for entry that was configured via user interface."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Update options for entry that was configured via user interface.
+
+    Presentation-only changes are applied to already fetched data, any other
+    change requires entry reload.
+    """
+    domain_data = hass.data[DOMAIN][entry.entry_id]
+    old_options: dict = domain_data[ENTRY_OPTIONS]
+    new_options = {**entry.data, **entry.options}
+    changed = changed_options(old_options, new_options)
+    if not changed <= PRESENTATION_OPTIONS:
+        _LOGGER.debug(f"Reloading {entry.title} due to changed {changed}")
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    _LOGGER.debug(f"Applying {changed} for {entry.title} without reload")
+    domain_data[ENTRY_OPTIONS] = new_options
+    updater: WeatherUpdater = domain_data[UPDATER]
+    updater.interpolation_resolution = get_interpolation_resolution(entry)
+    if updater.data:
+        # re-render entities from cached data
+        updater.async_update_listeners()
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Remove entry configured via user interface."""
     unload_ok = True
-    for platform in PLATFORMS:
+    for platform in entry_platforms(entry):
         unload_ok = unload_ok & await hass.config_entries.async_forward_entry_unload(
             entry=entry, domain=platform
         )
@@ -0,0 +1,265 @@
+"""Forecast accuracy analytics over forecast archive."""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+import numpy as np
+
+from .archive import (
+    KIND_FORECAST,
+    KIND_OBSERVATION,
+    MAX_FORECAST_LEAD,
+    NO_CONDITION,
+    ForecastArchive,
+)
+from .const import (
+    ATTR_ACCURACY_CONDITION_HIT_RATE,
+    ATTR_ACCURACY_SAMPLES,
+    ATTR_ACCURACY_TEMPERATURE_BIAS,
+    ATTR_ACCURACY_TEMPERATURE_MAE,
+    ATTR_ACCURACY_WIND_SPEED_MAE,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("issued", "<u4"),
+        ("time", "<u4"),
+        ("kind", "u1"),
+        ("condition", "u1"),
+        ("wind_bearing", "<u2"),
+        ("temperature", "<f4"),
+        ("feels_like", "<f4"),
+        ("wind_speed", "<f4"),
+        ("wind_gust", "<f4"),
+        ("precipitation", "<f4"),
+    ]
+)
+"""Same layout as archive.RECORD."""
+
+MAX_LEAD_HOURS = MAX_FORECAST_LEAD // 3600
+HOUR = 3600
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+
+def load_records(archive: ForecastArchive, since: int) -> np.ndarray:
+    """Load archive records issued since timestamp.
+
+    :param archive: forecast archive
+    :param since: skip records issued before this timestamp
+    """
+    chunks = []
+    for path in archive.files():
+        if os.path.getsize(path) < RECORD_DTYPE.itemsize:
+            continue
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            records = np.frombuffer(
+                mapped, dtype=RECORD_DTYPE, count=len(mapped) // RECORD_DTYPE.itemsize
+            )
+            first = np.searchsorted(records["issued"], since)
+            if first < len(records):
+                chunks.append(records[first:].copy())
+            # mapping can not be closed while array uses it
+            del records
+    if not chunks:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.concatenate(chunks)
+
+
+class ForecastAccuracy:
+    """Forecast error by lead time, updated incrementally.
+
+    Forecast for some hour is verified with observation nearest to this hour.
+    Hour is verified once, after all observations that may be nearest to it
+    are in archive. Accumulators are kept between restarts.
+    """
+
+    def __init__(self, hass: HomeAssistant | None = None, device_id: str = ""):
+        """Initialize accumulators.
+
+        :param hass: Home Assistant object, accumulators are not saved without it
+        :param device_id: ID of integration Device in Home Assistant
+        """
+        self.verified_until = 0
+        """All hours up to this timestamp are verified."""
+        self._samples = np.zeros(MAX_LEAD_HOURS + 1, dtype=np.int64)
+        self._temperature_error = np.zeros(MAX_LEAD_HOURS + 1)
+        self._temperature_abs_error = np.zeros(MAX_LEAD_HOURS + 1)
+        self._condition_samples = np.zeros(MAX_LEAD_HOURS + 1, dtype=np.int64)
+        self._condition_hits = np.zeros(MAX_LEAD_HOURS + 1, dtype=np.int64)
+        self._wind_samples = np.zeros(MAX_LEAD_HOURS + 1, dtype=np.int64)
+        self._wind_abs_error = np.zeros(MAX_LEAD_HOURS + 1)
+        self._store: Store | None = None
+        if hass is not None:
+            self._store = Store(
+                hass, STORAGE_VERSION, f"{DOMAIN}.forecast_accuracy.{device_id}"
+            )
+
+    @property
+    def _accumulators(self) -> dict[str, np.ndarray]:
+        return {
+            "samples": self._samples,
+            "temperature_error": self._temperature_error,
+            "temperature_abs_error": self._temperature_abs_error,
+            "condition_samples": self._condition_samples,
+            "condition_hits": self._condition_hits,
+            "wind_samples": self._wind_samples,
+            "wind_abs_error": self._wind_abs_error,
+        }
+
+    async def async_load(self):
+        """Load saved accumulators."""
+        if self._store is None or (data := await self._store.async_load()) is None:
+            return
+        self.restore(data)
+        _LOGGER.debug(f"Loaded forecast accuracy verified until {self.verified_until}")
+
+    def restore(self, data: dict):
+        """Restore accumulators from saved data.
+
+        Accumulators saved with different lead time limit are dropped.
+        """
+        accumulators = self._accumulators
+        saved = data.get("accumulators", {})
+        if any(len(saved.get(name, ())) != len(a) for name, a in accumulators.items()):
+            _LOGGER.debug("Saved forecast accuracy does not match, dropping it")
+            return
+        for name, a in accumulators.items():
+            a[:] = saved[name]
+        self.verified_until = int(data.get("verified_until", 0))
+
+    def as_dict(self) -> dict:
+        """Accumulators ready for JSON."""
+        return {
+            "verified_until": self.verified_until,
+            "accumulators": {
+                name: a.tolist() for name, a in self._accumulators.items()
+            },
+        }
+
+    def schedule_save(self):
+        """Save accumulators after update, should be called from event loop."""
+        if self._store is not None:
+            self._store.async_delay_save(self.as_dict, SAVE_DELAY)
+
+    def update(self, archive: ForecastArchive, now: float) -> int:
+        """Verify forecasts for hours observed since last update.
+
+        Should be called in executor.
+
+        :param archive: forecast archive
+        :param now: current timestamp
+        :returns: how many forecasts were verified
+        """
+        records = load_records(archive, max(0, self.verified_until - MAX_FORECAST_LEAD))
+        observations = records[records["kind"] == KIND_OBSERVATION]
+        if len(observations) == 0:
+            return 0
+
+        # nearest observation for every complete hour after verified one
+        hours = (observations["time"].astype(np.int64) + HOUR // 2) // HOUR * HOUR
+        distance = np.abs(observations["time"] - hours)
+        new = (hours > self.verified_until) & (hours + HOUR // 2 <= now)
+        if not new.any():
+            return 0
+        hours, distance, observations = hours[new], distance[new], observations[new]
+        order = np.lexsort((distance, hours))
+        hours, observations = hours[order], observations[order]
+        hours, first = np.unique(hours, return_index=True)
+        observations = observations[first]
+
+        forecasts = records[records["kind"] == KIND_FORECAST]
+        position = np.searchsorted(hours, forecasts["time"])
+        position = np.minimum(position, len(hours) - 1)
+        verified = (hours[position] == forecasts["time"]) & (
+            forecasts["issued"] < forecasts["time"]
+        )
+        forecasts, observed = forecasts[verified], observations[position[verified]]
+        lead = np.minimum(
+            np.ceil(
+                (forecasts["time"].astype(np.int64) - forecasts["issued"]) / HOUR
+            ).astype(np.int64),
+            MAX_LEAD_HOURS,
+        )
+
+        self._accumulate(lead, forecasts, observed)
+        self.verified_until = int(hours[-1])
+        return len(forecasts)
+
+    def _accumulate(
+        self, lead: np.ndarray, forecasts: np.ndarray, observed: np.ndarray
+    ):
+        def add(dst: np.ndarray, mask: np.ndarray, weights=None):
+            dst += np.bincount(
+                lead[mask],
+                weights=None if weights is None else weights[mask],
+                minlength=len(dst),
+            ).astype(dst.dtype)
+
+        error = (forecasts["temperature"] - observed["temperature"]).astype(float)
+        valid = ~np.isnan(error)
+        add(self._samples, valid)
+        add(self._temperature_error, valid, error)
+        add(self._temperature_abs_error, valid, np.abs(error))
+
+        valid = (forecasts["condition"] != NO_CONDITION) & (
+            observed["condition"] != NO_CONDITION
+        )
+        add(self._condition_samples, valid)
+        add(
+            self._condition_hits,
+            valid & (forecasts["condition"] == observed["condition"]),
+        )
+
+        error = np.abs(forecasts["wind_speed"] - observed["wind_speed"]).astype(float)
+        valid = ~np.isnan(error)
+        add(self._wind_samples, valid)
+        add(self._wind_abs_error, valid, error)
+
+    @staticmethod
+    def _ratio(value, count, scale: float = 1) -> float | None:
+        return round(float(value) / count * scale, 2) if count else None
+
+    def _statistics(self, s: slice | int) -> dict[str, float | None]:
+        samples = np.sum(self._samples[s])
+        condition_samples = np.sum(self._condition_samples[s])
+        wind_samples = np.sum(self._wind_samples[s])
+        return {
+            ATTR_ACCURACY_TEMPERATURE_MAE: self._ratio(
+                np.sum(self._temperature_abs_error[s]), samples
+            ),
+            ATTR_ACCURACY_TEMPERATURE_BIAS: self._ratio(
+                np.sum(self._temperature_error[s]), samples
+            ),
+            ATTR_ACCURACY_CONDITION_HIT_RATE: self._ratio(
+                np.sum(self._condition_hits[s]), condition_samples, 100
+            ),
+            ATTR_ACCURACY_WIND_SPEED_MAE: self._ratio(
+                np.sum(self._wind_abs_error[s]), wind_samples
+            ),
+            ATTR_ACCURACY_SAMPLES: int(samples),
+        }
+
+    def summary(self) -> dict[str, float | int | None]:
+        """Accuracy over all lead times."""
+        return self._statistics(slice(None))
+
+    def by_lead(self) -> list[dict]:
+        """Accuracy for every lead time in hours that have samples."""
+        return [
+            {"lead_hours": lead, **self._statistics(lead)}
+            for lead in np.flatnonzero(self._samples + self._condition_samples)
+            .astype(int)
+            .tolist()
+        ]
@@ -0,0 +1,258 @@
+"""Compact on-disk archive of issued forecasts and observations."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from datetime import datetime, timezone
+import logging
+import math
+import mmap
+import os
+import struct
+
+from homeassistant.components.weather import (
+    ATTR_FORECAST_CONDITION,
+    ATTR_FORECAST_NATIVE_APPARENT_TEMP,
+    ATTR_FORECAST_NATIVE_PRECIPITATION,
+    ATTR_FORECAST_NATIVE_TEMP,
+    ATTR_FORECAST_NATIVE_WIND_GUST_SPEED,
+    ATTR_FORECAST_NATIVE_WIND_SPEED,
+    ATTR_FORECAST_TIME,
+    ATTR_FORECAST_WIND_BEARING,
+)
+
+from .const import (
+    ATTR_API_CONDITION,
+    ATTR_API_FEELS_LIKE_TEMPERATURE,
+    ATTR_API_TEMPERATURE,
+    ATTR_API_WEATHER_TIME,
+    ATTR_API_WIND_BEARING,
+    ATTR_API_WIND_SPEED,
+    ATTR_FORECAST_HOURLY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+RECORD = struct.Struct("<IIBBHfffff")
+"""issued, time, kind, condition, wind bearing, temperature, feels like,
+wind speed, wind gust, precipitation"""
+_ISSUED = struct.Struct("<I")
+
+KIND_OBSERVATION = 0
+KIND_FORECAST = 1
+KINDS = ("observation", "forecast")
+
+ARCHIVE_CONDITIONS: tuple[str, ...] = (
+    "clear-night",
+    "cloudy",
+    "exceptional",
+    "fog",
+    "hail",
+    "lightning",
+    "lightning-rainy",
+    "partlycloudy",
+    "pouring",
+    "rainy",
+    "snowy",
+    "snowy-rainy",
+    "sunny",
+    "windy",
+    "windy-variant",
+)
+"""HA conditions by archive code. Append only: codes are stored on disk."""
+_CONDITION_CODES = {c: i for i, c in enumerate(ARCHIVE_CONDITIONS)}
+NO_CONDITION = 0xFF
+NO_BEARING = 0xFFFF
+
+MAX_FORECAST_LEAD = 48 * 3600
+"""Forecasts older than this are not searched for time range."""
+ARCHIVE_MAX_BYTES = 4 * 1024 * 1024
+ARCHIVE_RETENTION_FILES = 5
+
+
+def _float(value) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _timestamp(value: datetime | str) -> int:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return int(value.timestamp())
+
+
+def _record(
+    issued: int, kind: int, time: datetime | str, data: Mapping, keys: tuple
+) -> tuple:
+    condition, bearing, temperature, feels_like, speed, gust, prec = (
+        data.get(k) for k in keys
+    )
+    return (
+        issued,
+        _timestamp(time),
+        kind,
+        _CONDITION_CODES.get(condition, NO_CONDITION),
+        NO_BEARING if bearing is None else int(bearing) % 360,
+        _float(temperature),
+        _float(feels_like),
+        _float(speed),
+        _float(gust),
+        _float(prec),
+    )
+
+
+_OBSERVATION_KEYS = (
+    ATTR_API_CONDITION,
+    ATTR_API_WIND_BEARING,
+    ATTR_API_TEMPERATURE,
+    ATTR_API_FEELS_LIKE_TEMPERATURE,
+    ATTR_API_WIND_SPEED,
+    None,
+    None,
+)
+_FORECAST_KEYS = (
+    ATTR_FORECAST_CONDITION,
+    ATTR_FORECAST_WIND_BEARING,
+    ATTR_FORECAST_NATIVE_TEMP,
+    ATTR_FORECAST_NATIVE_APPARENT_TEMP,
+    ATTR_FORECAST_NATIVE_WIND_SPEED,
+    ATTR_FORECAST_NATIVE_WIND_GUST_SPEED,
+    ATTR_FORECAST_NATIVE_PRECIPITATION,
+)
+
+
+def unpack_record(raw: tuple) -> dict:
+    """Convert archive record to dict."""
+    issued, time, kind, condition, bearing, *values = raw
+    return {
+        "issued": datetime.fromtimestamp(issued, timezone.utc).isoformat(),
+        "datetime": datetime.fromtimestamp(time, timezone.utc).isoformat(),
+        "kind": KINDS[kind],
+        "condition": ARCHIVE_CONDITIONS[condition]
+        if condition < len(ARCHIVE_CONDITIONS)
+        else None,
+        "wind_bearing": None if bearing == NO_BEARING else bearing,
+        **{
+            k: None if math.isnan(v) else round(v, 2)
+            for k, v in zip(
+                [
+                    "temperature",
+                    "apparent_temperature",
+                    "wind_speed",
+                    "wind_gust_speed",
+                    "precipitation",
+                ],
+                values,
+            )
+        },
+    }
+
+
+class ForecastArchive:
+    """Fixed-width record file with size based rotation.
+
+    File I/O is blocking, so methods should be called in executor.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = ARCHIVE_MAX_BYTES,
+        retention: int = ARCHIVE_RETENTION_FILES,
+    ):
+        """Initialize archive.
+
+        :param path: current archive file, rotated files get .1, .2, ... suffix
+        :param max_bytes: rotate file when it grows over this size
+        :param retention: how many rotated files should be kept
+        """
+        self._path = path
+        self._max_bytes = max(max_bytes, RECORD.size)
+        self._retention = retention
+
+    @property
+    def path(self) -> str:
+        """Current archive file."""
+        return self._path
+
+    @staticmethod
+    def records(snapshot: Mapping) -> list[tuple]:
+        """Get archive records for weather data snapshot."""
+        observed = snapshot[ATTR_API_WEATHER_TIME]
+        issued = _timestamp(observed)
+        return [
+            _record(issued, KIND_OBSERVATION, observed, snapshot, _OBSERVATION_KEYS),
+            *(
+                _record(issued, KIND_FORECAST, f[ATTR_FORECAST_TIME], f, _FORECAST_KEYS)
+                for f in snapshot.get(ATTR_FORECAST_HOURLY, ())
+            ),
+        ]
+
+    def files(self) -> list[str]:
+        """Existing archive files from oldest to newest."""
+        paths = [f"{self._path}.{i}" for i in range(self._retention, 0, -1)]
+        paths.append(self._path)
+        return [p for p in paths if os.path.exists(p)]
+
+    def append(self, records: list[tuple]):
+        """Append records to archive."""
+        data = b"".join(RECORD.pack(*r) for r in records)
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        try:
+            size = os.path.getsize(self._path)
+        except FileNotFoundError:
+            size = 0
+        if size and size + len(data) > self._max_bytes:
+            self._rotate()
+        with open(self._path, "ab") as f:
+            f.write(data)
+
+    def _rotate(self):
+        _LOGGER.debug(f"Rotating {self._path}")
+        oldest = f"{self._path}.{self._retention}"
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for i in range(self._retention - 1, 0, -1):
+            if os.path.exists(src := f"{self._path}.{i}"):
+                os.replace(src, f"{self._path}.{i + 1}")
+        if self._retention > 0:
+            os.replace(self._path, f"{self._path}.1")
+        else:
+            os.remove(self._path)
+
+    @staticmethod
+    def _first_issued_after(mm: mmap.mmap, count: int, issued: int) -> int:
+        """Binary search for first record issued not before `issued`."""
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _ISSUED.unpack_from(mm, mid * RECORD.size)[0] < issued:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def iter_raw(self, start: float, end: float) -> Iterator[tuple]:
+        """Iterate records for time in [start, end] range.
+
+        Files are memory-mapped and searched by issue time, so only part of
+        archive is read.
+        """
+        for path in self.files():
+            with open(path, "rb") as f:
+                count = os.fstat(f.fileno()).st_size // RECORD.size
+                if count == 0:
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    first = self._first_issued_after(
+                        mm, count, int(start) - MAX_FORECAST_LEAD
+                    )
+                    for i in range(first, count):
+                        record = RECORD.unpack_from(mm, i * RECORD.size)
+                        if record[0] > end:
+                            break
+                        if start <= record[1] <= end:
+                            yield record
+
+    def read(self, start: float, end: float) -> list[dict]:
+        """Read records for time in [start, end] range."""
+        return [unpack_record(r) for r in self.iter_raw(start, end)]
@@ -0,0 +1,152 @@
+"""Weather over area: grid of points fetched in one request."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .const import (
+    ATTR_API_CONDITION,
+    ATTR_API_TEMPERATURE,
+    ATTR_API_WIND_SPEED,
+    ATTR_AREA_CONDITION,
+    ATTR_AREA_POINTS,
+    ATTR_AREA_TEMPERATURE_MAX,
+    ATTR_AREA_TEMPERATURE_MIN,
+    ATTR_AREA_WIND_SPEED_MAX,
+)
+
+MAX_GRID_SIZE = 5
+"""Points per side of grid, so request has 25 points at most."""
+
+CONDITION_SEVERITY: tuple[str, ...] = (
+    "sunny",
+    "clear-night",
+    "partlycloudy",
+    "cloudy",
+    "fog",
+    "windy",
+    "windy-variant",
+    "rainy",
+    "snowy",
+    "snowy-rainy",
+    "pouring",
+    "hail",
+    "lightning",
+    "lightning-rainy",
+    "exceptional",
+)
+"""HA conditions from best to worst."""
+_SEVERITY = {c: i for i, c in enumerate(CONDITION_SEVERITY)}
+
+AREA_QUERY_POINT = """
+        p{i}: weatherByPoint(request: {{ lat: $lat{i}, lon: $lon{i} }}, language: EN) {{
+            now {{
+              temperature
+              feelsLike
+              windSpeed
+              windDirection
+              condition
+              daytime
+            }}
+        }}"""
+
+
+def parse_area(text: str) -> list[tuple[float, float]]:
+    """Parse area from "lat,lon; lat,lon; ..." text.
+
+    Two points are corners of bounding box, three and more are polygon.
+
+    :raises ValueError: for invalid area
+    """
+    vertices = []
+    for point in text.replace("\n", ";").split(";"):
+        if not point.strip():
+            continue
+        lat, lon = (float(v) for v in point.split(","))
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError(f"Invalid coordinates {point}")
+        vertices.append((lat, lon))
+    if len(vertices) < 2:
+        raise ValueError("Area should have two corners or polygon vertices")
+    return vertices
+
+
+def grid_points(
+    vertices: list[tuple[float, float]], grid_size: int
+) -> list[tuple[float, float]]:
+    """Get grid points inside area.
+
+    :param vertices: bounding box corners or polygon vertices
+    :param grid_size: points per side of grid over bounding box
+    """
+    polygon = np.asarray(vertices, dtype=float)
+    lat = np.linspace(polygon[:, 0].min(), polygon[:, 0].max(), grid_size + 2)[1:-1]
+    lon = np.linspace(polygon[:, 1].min(), polygon[:, 1].max(), grid_size + 2)[1:-1]
+    lat, lon = (a.ravel() for a in np.meshgrid(lat, lon, indexing="ij"))
+
+    if len(polygon) > 2:
+        # ray casting for all points and edges at once
+        a, b = polygon, np.roll(polygon, -1, axis=0)
+        y, x = lat[:, None], lon[:, None]
+        crosses = (a[:, 0] > y) != (b[:, 0] > y)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_cross = a[:, 1] + (y - a[:, 0]) * (b[:, 1] - a[:, 1]) / (
+                b[:, 0] - a[:, 0]
+            )
+        inside = np.count_nonzero(crosses & (x < x_cross), axis=1) % 2 == 1
+        if inside.any():
+            lat, lon = lat[inside], lon[inside]
+        else:
+            # too thin polygon, use its center
+            center = polygon.mean(axis=0)
+            lat, lon = center[:1], center[1:]
+
+    return list(
+        dict.fromkeys(
+            (round(float(p), 4), round(float(q), 4)) for p, q in zip(lat, lon)
+        )
+    )
+
+
+def build_area_query(points: int) -> str:
+    """Build one query for all points with aliases p0, p1, ..."""
+    variables = ", ".join(f"$lat{i}: Float!, $lon{i}: Float!" for i in range(points))
+    body = "".join(AREA_QUERY_POINT.format(i=i) for i in range(points))
+    return f"query({variables}) {{{body}\n}}"
+
+
+def area_variables(points: list[tuple[float, float]]) -> dict[str, float]:
+    """Variables for aliased query."""
+    result = {}
+    for i, (lat, lon) in enumerate(points):
+        result[f"lat{i}"] = lat
+        result[f"lon{i}"] = lon
+    return result
+
+
+def aggregate(points: list[dict]) -> dict:
+    """Aggregate processed weather of points.
+
+    :param points: current weather of every point after process_data
+    """
+
+    def values(key: str) -> np.ndarray:
+        return np.array(
+            [np.nan if (v := p.get(key)) is None else v for p in points], dtype=float
+        )
+
+    def reduce(func, key: str) -> float | None:
+        array = values(key)
+        return None if np.isnan(array).all() else round(float(func(array)), 1)
+
+    severity = np.array(
+        [_SEVERITY.get(p.get(ATTR_API_CONDITION), -1) for p in points], dtype=int
+    )
+    worst = int(severity.max(initial=-1))
+    return {
+        ATTR_AREA_CONDITION: CONDITION_SEVERITY[worst] if worst >= 0 else None,
+        ATTR_AREA_TEMPERATURE_MIN: reduce(np.nanmin, ATTR_API_TEMPERATURE),
+        ATTR_AREA_TEMPERATURE_MAX: reduce(np.nanmax, ATTR_API_TEMPERATURE),
+        ATTR_AREA_WIND_SPEED_MAX: reduce(np.nanmax, ATTR_API_WIND_SPEED),
+        ATTR_AREA_POINTS: len(points),
+    }
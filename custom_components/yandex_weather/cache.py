@@ -0,0 +1,333 @@
+"""Response cache backends shared between updaters and Home Assistant instances."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+import hashlib
+import logging
+import os
+import struct
+import time
+from urllib.parse import urlparse
+import uuid
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import (
+    CACHE_BACKEND_FILE,
+    CACHE_BACKEND_MEMORY,
+    CACHE_BACKEND_REDIS,
+    DEFAULT_REDIS_PORT,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_EXPIRES = struct.Struct("<d")
+
+
+class CacheError(Exception):
+    """Cache backend is not usable."""
+
+
+def cache_key(*parts: str) -> str:
+    """Backend key for request parts."""
+    digest = hashlib.blake2b("\n".join(parts).encode(), digest_size=12).hexdigest()
+    return f"{DOMAIN}:{digest}"
+
+
+class CacheBackend(ABC):
+    """Key-value store with expiration and locks.
+
+    Lock is a key set only if it does not exist, so it works across processes
+    for backends that are shared.
+    """
+
+    @abstractmethod
+    async def async_get(self, key: str) -> bytes | None:
+        """Get value, None if it is missing or expired."""
+
+    @abstractmethod
+    async def async_set(self, key: str, value: bytes, ttl: float):
+        """Set value for ttl seconds."""
+
+    @abstractmethod
+    async def async_lock(self, key: str, ttl: float) -> str | None:
+        """Try to take lock for ttl seconds.
+
+        :returns: token for unlock, None if lock is held by somebody else
+        """
+
+    @abstractmethod
+    async def async_unlock(self, key: str, token: str):
+        """Release lock, if it is still held with token."""
+
+    async def async_close(self):
+        """Release backend resources."""
+
+
+class MemoryBackend(CacheBackend):
+    """Cache in process memory, shared by updaters of this instance only."""
+
+    def __init__(self):
+        """Initialize backend."""
+        self._values: dict[str, tuple[float, bytes]] = {}
+
+    def _get(self, key: str) -> bytes | None:
+        if (item := self._values.get(key)) is None:
+            return None
+        if item[0] <= time.time():
+            del self._values[key]
+            return None
+        return item[1]
+
+    async def async_get(self, key: str) -> bytes | None:
+        """Get value, None if it is missing or expired."""
+        return self._get(key)
+
+    async def async_set(self, key: str, value: bytes, ttl: float):
+        """Set value for ttl seconds."""
+        self._values[key] = (time.time() + ttl, value)
+
+    async def async_lock(self, key: str, ttl: float) -> str | None:
+        """Try to take lock for ttl seconds."""
+        if self._get(f"{key}:lock") is not None:
+            return None
+        token = uuid.uuid4().hex
+        await self.async_set(f"{key}:lock", token.encode(), ttl)
+        return token
+
+    async def async_unlock(self, key: str, token: str):
+        """Release lock, if it is still held with token."""
+        if self._get(f"{key}:lock") == token.encode():
+            del self._values[f"{key}:lock"]
+
+
+class FileBackend(CacheBackend):
+    """Cache in directory, may be shared by instances on the same host or NFS.
+
+    Every value is a file with expiration time header. Lock is a file created
+    exclusively.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str):
+        """Initialize backend.
+
+        :param hass: Home Assistant object, used to run file I/O in executor
+        :param path: cache directory
+        """
+        self._hass = hass
+        self._path = path
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self._path, key.replace(":", "_"))
+
+    def _read(self, path: str) -> bytes | None:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < _EXPIRES.size:
+            return None
+        if _EXPIRES.unpack_from(data)[0] <= time.time():
+            return None
+        return data[_EXPIRES.size :]
+
+    def _write(self, path: str, value: bytes, ttl: float):
+        os.makedirs(self._path, exist_ok=True)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_EXPIRES.pack(time.time() + ttl) + value)
+        os.replace(tmp, path)
+
+    def _lock(self, path: str, ttl: float) -> str | None:
+        os.makedirs(self._path, exist_ok=True)
+        token = uuid.uuid4().hex
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self._read(path) is not None:
+                    return None
+                # lock of crashed owner
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(fd, "wb") as f:
+                f.write(_EXPIRES.pack(time.time() + ttl) + token.encode())
+            return token
+        return None
+
+    def _unlock(self, path: str, token: str):
+        if self._read(path) == token.encode():
+            os.remove(path)
+
+    async def _run(self, func, *args):
+        try:
+            return await self._hass.async_add_executor_job(func, *args)
+        except OSError as e:
+            raise CacheError(e) from e
+
+    async def async_get(self, key: str) -> bytes | None:
+        """Get value, None if it is missing or expired."""
+        return await self._run(self._read, self._file(key))
+
+    async def async_set(self, key: str, value: bytes, ttl: float):
+        """Set value for ttl seconds."""
+        await self._run(self._write, self._file(key), value, ttl)
+
+    async def async_lock(self, key: str, ttl: float) -> str | None:
+        """Try to take lock for ttl seconds."""
+        return await self._run(self._lock, self._file(f"{key}:lock"), ttl)
+
+    async def async_unlock(self, key: str, token: str):
+        """Release lock, if it is still held with token."""
+        await self._run(self._unlock, self._file(f"{key}:lock"), token)
+
+
+def encode_command(*args: str | bytes) -> bytes:
+    """Encode command in Redis serialization protocol."""
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode()
+        parts.append(f"${len(arg)}\r\n".encode() + arg + b"\r\n")
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> bytes | int | list | None:
+    """Read one reply in Redis serialization protocol."""
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise CacheError("Connection closed")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload
+    if kind == b"-":
+        raise CacheError(payload.decode(errors="replace"))
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        if (length := int(payload)) < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        if (count := int(payload)) < 0:
+            return None
+        return [await read_reply(reader) for _ in range(count)]
+    raise CacheError(f"Unexpected reply {line!r}")
+
+
+class RedisBackend(CacheBackend):
+    """Cache in Redis or any server speaking its protocol.
+
+    Only GET, SET with NX/PX, DEL, AUTH and SELECT are used.
+    """
+
+    def __init__(self, url: str, timeout: float = 5):
+        """Initialize backend.
+
+        :param url: redis://[:password@]host[:port][/db]
+        :param timeout: connection and reply timeout, in seconds
+        """
+        parsed = urlparse(url)
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port or DEFAULT_REDIS_PORT
+        self._password = parsed.password
+        self._db = parsed.path.strip("/") or None
+        self._timeout = timeout
+        self._lock = asyncio.Lock()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(
+            self._host, self._port
+        )
+        if self._password:
+            await self._call("AUTH", self._password)
+        if self._db:
+            await self._call("SELECT", self._db)
+
+    async def _call(self, *args: str | bytes):
+        self._writer.write(encode_command(*args))
+        await self._writer.drain()
+        return await read_reply(self._reader)
+
+    async def execute(self, *args: str | bytes):
+        """Execute command, connecting if needed."""
+        async with self._lock:
+            try:
+                async with asyncio.timeout(self._timeout):
+                    if self._writer is None:
+                        await self._connect()
+                    return await self._call(*args)
+            except (
+                OSError,
+                TimeoutError,
+                CacheError,
+                asyncio.IncompleteReadError,
+            ) as e:
+                await self._disconnect()
+                raise CacheError(f"{self._host}:{self._port}: {e}") from e
+
+    async def _disconnect(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def async_close(self):
+        """Close connection."""
+        async with self._lock:
+            await self._disconnect()
+
+    async def async_get(self, key: str) -> bytes | None:
+        """Get value, None if it is missing or expired."""
+        return await self.execute("GET", key)
+
+    async def async_set(self, key: str, value: bytes, ttl: float):
+        """Set value for ttl seconds."""
+        await self.execute("SET", key, value, "PX", str(int(ttl * 1000)))
+
+    async def async_lock(self, key: str, ttl: float) -> str | None:
+        """Try to take lock for ttl seconds."""
+        token = uuid.uuid4().hex
+        reply = await self.execute(
+            "SET", f"{key}:lock", token, "NX", "PX", str(int(ttl * 1000))
+        )
+        return token if reply == b"OK" else None
+
+    async def async_unlock(self, key: str, token: str):
+        """Release lock, if it is still held with token.
+
+        GET and DEL are not atomic, but lock expires anyway.
+        """
+        if await self.execute("GET", f"{key}:lock") == token.encode():
+            await self.execute("DEL", f"{key}:lock")
+
+
+_MEMORY = MemoryBackend()
+
+
+def create_backend(hass: HomeAssistant, backend: str, url: str | None) -> CacheBackend:
+    """Create cache backend.
+
+    :param hass: Home Assistant object
+    :param backend: one of CACHE_BACKENDS
+    :param url: directory for file backend, server URL for Redis backend
+    """
+    if backend == CACHE_BACKEND_MEMORY:
+        return _MEMORY
+    if backend == CACHE_BACKEND_FILE:
+        return FileBackend(
+            hass, url or hass.config.path(STORAGE_DIR, DOMAIN, "response_cache")
+        )
+    if backend == CACHE_BACKEND_REDIS:
+        return RedisBackend(url or "redis://localhost")
+    raise ValueError(f"Unknown cache backend {backend}")
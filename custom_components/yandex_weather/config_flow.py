@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 
 from homeassistant import config_entries
@@ -10,16 +11,49 @@ from homeassistant.core import HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 
+from .area import MAX_GRID_SIZE, grid_points, parse_area
 from .const import (
+    CACHE_BACKENDS,
     CONDITION_IMAGE,
+    CONF_ARCHIVE,
+    CONF_AREA,
+    CONF_CACHE_BACKEND,
+    CONF_CACHE_URL,
+    CONF_COOLING_BASE,
+    CONF_ENTRY_TYPE,
+    CONF_FAIR_SHARE,
+    CONF_GRID_SIZE,
+    CONF_HEATING_BASE,
     CONF_IMAGE_SOURCE,
+    CONF_INTERPOLATE,
+    CONF_INTERPOLATION_RESOLUTION,
+    CONF_KEY_POOL,
     CONF_LANGUAGE_KEY,
+    CONF_LOCAL_ICONS,
+    CONF_POOL_API_KEYS,
+    CONF_QUOTA_PRIORITY,
+    CONF_QUOTA_WEIGHT,
+    CONF_REFRESH_PHASE,
+    CONF_SCHEDULE_MODE,
     CONF_UPDATES_PER_DAY,
+    DEFAULT_CACHE_BACKEND,
+    DEFAULT_COOLING_BASE,
+    DEFAULT_GRID_SIZE,
+    DEFAULT_HEATING_BASE,
+    DEFAULT_INTERPOLATION_RESOLUTION,
+    DEFAULT_LOCAL_ICONS,
     DEFAULT_NAME,
+    DEFAULT_QUOTA_PRIORITY,
+    DEFAULT_QUOTA_WEIGHT,
+    DEFAULT_SCHEDULE_MODE,
     DEFAULT_UPDATES_PER_DAY,
     DOMAIN,
+    ENTRY_TYPE_AREA,
+    ENTRY_TYPE_POINT,
+    FETCH_OPTIONS,
+    SCHEDULE_MODES,
 )
-from .updater import WeatherUpdater
+from .updater import AreaUpdater, WeatherUpdater
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -57,6 +91,55 @@ class YandexWeatherConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def async_step_user(self, user_input=None):
         """Handle a flow initialized by the user."""
+        return self.async_show_menu(
+            step_id="user", menu_options=[ENTRY_TYPE_POINT, ENTRY_TYPE_AREA]
+        )
+
+    async def async_step_area(self, user_input=None):
+        """Set up weather over area."""
+        errors = {}
+
+        if user_input is not None:
+            try:
+                vertices = parse_area(user_input[CONF_AREA])
+            except ValueError:
+                errors[CONF_AREA] = "invalid_area"
+            else:
+                points = grid_points(vertices, user_input[CONF_GRID_SIZE])
+                area_id = hashlib.sha1(
+                    f"{vertices}-{user_input[CONF_GRID_SIZE]}".encode()
+                ).hexdigest()[:12]
+                await self.async_set_unique_id(f"area-{area_id}")
+                self._abort_if_unique_id_configured()
+
+                if await _is_area_online(user_input[CONF_API_KEY], points, self.hass):
+                    return self.async_create_entry(
+                        title=user_input[CONF_NAME],
+                        data={**user_input, CONF_ENTRY_TYPE: ENTRY_TYPE_AREA},
+                    )
+                errors["base"] = "could_not_get_data"
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_API_KEY): str,
+                vol.Optional(CONF_NAME, default=f"{DEFAULT_NAME} area"): str,
+                vol.Required(CONF_AREA): str,
+                vol.Optional(CONF_GRID_SIZE, default=DEFAULT_GRID_SIZE): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_GRID_SIZE)
+                ),
+                vol.Optional(
+                    CONF_UPDATES_PER_DAY, default=DEFAULT_UPDATES_PER_DAY
+                ): int,
+                vol.Required(
+                    CONF_LANGUAGE_KEY, default=get_supported_languages()[0]
+                ): vol.In(get_supported_languages()),
+            }
+        )
+
+        return self.async_show_form(step_id="area", data_schema=schema, errors=errors)
+
+    async def async_step_point(self, user_input=None):
+        """Set up weather at point."""
         errors = {}
 
         if user_input is not None:
@@ -97,7 +180,7 @@ class YandexWeatherConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             }
         )
 
-        return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
+        return self.async_show_form(step_id="point", data_schema=schema, errors=errors)
 
 
 class YandexWeatherOptionsFlow(config_entries.OptionsFlow):
@@ -111,12 +194,11 @@ class YandexWeatherOptionsFlow(config_entries.OptionsFlow):
         """Manage the options."""
         errors = {}
         if user_input is not None:
-            if await _is_online(
-                user_input[CONF_API_KEY],
-                get_value(self.config_entry, CONF_LATITUDE),
-                get_value(self.config_entry, CONF_LONGITUDE),
-                self.hass,
-            ):
+            fetch_changed = any(
+                user_input[k] != get_value(self.config_entry, k)
+                for k in FETCH_OPTIONS & user_input.keys()
+            )
+            if not fetch_changed or await self._is_online(user_input[CONF_API_KEY]):
                 return self.async_create_entry(title="", data=user_input)
             else:
                 errors["base"] = "could_not_get_data"
@@ -125,7 +207,56 @@ class YandexWeatherOptionsFlow(config_entries.OptionsFlow):
             step_id="init", data_schema=self._get_options_schema(), errors=errors
         )
 
+    @property
+    def _is_area(self) -> bool:
+        return (
+            get_value(self.config_entry, CONF_ENTRY_TYPE, ENTRY_TYPE_POINT)
+            == ENTRY_TYPE_AREA
+        )
+
+    async def _is_online(self, api_key: str) -> bool:
+        if self._is_area:
+            return await _is_area_online(
+                api_key,
+                grid_points(
+                    parse_area(get_value(self.config_entry, CONF_AREA)),
+                    get_value(self.config_entry, CONF_GRID_SIZE, DEFAULT_GRID_SIZE),
+                ),
+                self.hass,
+            )
+        return await _is_online(
+            api_key,
+            get_value(self.config_entry, CONF_LATITUDE),
+            get_value(self.config_entry, CONF_LONGITUDE),
+            self.hass,
+        )
+
     def _get_options_schema(self):
+        if self._is_area:
+            return vol.Schema(
+                {
+                    vol.Required(
+                        CONF_API_KEY, default=get_value(self.config_entry, CONF_API_KEY)
+                    ): str,
+                    vol.Optional(
+                        CONF_UPDATES_PER_DAY,
+                        default=get_value(
+                            self.config_entry,
+                            CONF_UPDATES_PER_DAY,
+                            DEFAULT_UPDATES_PER_DAY,
+                        ),
+                    ): int,
+                    vol.Optional(
+                        CONF_SCHEDULE_MODE,
+                        default=get_value(
+                            self.config_entry, CONF_SCHEDULE_MODE, DEFAULT_SCHEDULE_MODE
+                        ),
+                    ): vol.In(SCHEDULE_MODES),
+                    **self._cache_schema(),
+                    **self._key_pool_schema(),
+                    **self._quota_schema(),
+                }
+            )
         return vol.Schema(
             {
                 vol.Required(
@@ -145,11 +276,122 @@ class YandexWeatherOptionsFlow(config_entries.OptionsFlow):
                     CONF_IMAGE_SOURCE,
                     default=get_value(self.config_entry, CONF_IMAGE_SOURCE, "Yandex"),
                 ): vol.In(CONDITION_IMAGE.keys()),
+                vol.Optional(
+                    CONF_LOCAL_ICONS,
+                    default=get_value(
+                        self.config_entry, CONF_LOCAL_ICONS, DEFAULT_LOCAL_ICONS
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_SCHEDULE_MODE,
+                    default=get_value(
+                        self.config_entry, CONF_SCHEDULE_MODE, DEFAULT_SCHEDULE_MODE
+                    ),
+                ): vol.In(SCHEDULE_MODES),
+                vol.Optional(
+                    CONF_REFRESH_PHASE,
+                    description={
+                        "suggested_value": get_value(
+                            self.config_entry, CONF_REFRESH_PHASE
+                        )
+                    },
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=59)),
+                vol.Optional(
+                    CONF_ARCHIVE,
+                    default=get_value(self.config_entry, CONF_ARCHIVE, False),
+                ): bool,
+                vol.Optional(
+                    CONF_INTERPOLATE,
+                    default=get_value(self.config_entry, CONF_INTERPOLATE, False),
+                ): bool,
+                vol.Optional(
+                    CONF_INTERPOLATION_RESOLUTION,
+                    default=get_value(
+                        self.config_entry,
+                        CONF_INTERPOLATION_RESOLUTION,
+                        DEFAULT_INTERPOLATION_RESOLUTION,
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.01, max=10)),
+                vol.Optional(
+                    CONF_HEATING_BASE,
+                    default=get_value(
+                        self.config_entry, CONF_HEATING_BASE, DEFAULT_HEATING_BASE
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=-30, max=40)),
+                vol.Optional(
+                    CONF_COOLING_BASE,
+                    default=get_value(
+                        self.config_entry, CONF_COOLING_BASE, DEFAULT_COOLING_BASE
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=-30, max=40)),
+                **self._cache_schema(),
+                **self._key_pool_schema(),
+                **self._quota_schema(),
             }
         )
 
+    def _quota_schema(self) -> dict:
+        return {
+            vol.Optional(
+                CONF_FAIR_SHARE,
+                default=get_value(self.config_entry, CONF_FAIR_SHARE, False),
+            ): bool,
+            vol.Optional(
+                CONF_QUOTA_WEIGHT,
+                default=get_value(
+                    self.config_entry, CONF_QUOTA_WEIGHT, DEFAULT_QUOTA_WEIGHT
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=100)),
+            vol.Optional(
+                CONF_QUOTA_PRIORITY,
+                default=get_value(
+                    self.config_entry, CONF_QUOTA_PRIORITY, DEFAULT_QUOTA_PRIORITY
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10)),
+        }
+
+    def _key_pool_schema(self) -> dict:
+        return {
+            vol.Optional(
+                CONF_KEY_POOL,
+                default=get_value(self.config_entry, CONF_KEY_POOL, False),
+            ): bool,
+            vol.Optional(
+                CONF_POOL_API_KEYS,
+                description={
+                    "suggested_value": get_value(self.config_entry, CONF_POOL_API_KEYS)
+                },
+            ): str,
+        }
+
+    def _cache_schema(self) -> dict:
+        return {
+            vol.Optional(
+                CONF_CACHE_BACKEND,
+                default=get_value(
+                    self.config_entry, CONF_CACHE_BACKEND, DEFAULT_CACHE_BACKEND
+                ),
+            ): vol.In(CACHE_BACKENDS),
+            vol.Optional(
+                CONF_CACHE_URL,
+                description={
+                    "suggested_value": get_value(self.config_entry, CONF_CACHE_URL)
+                },
+            ): str,
+        }
+
 
 async def _is_online(api_key, lat, lon, hass: HomeAssistant) -> bool:
     weather = WeatherUpdater(lat, lon, api_key, hass, "config_flow_test_id")
     await weather.async_request_refresh()
     return weather.last_update_success
+
+
+async def _is_area_online(
+    api_key, points: list[tuple[float, float]], hass: HomeAssistant
+) -> bool:
+    weather = AreaUpdater(
+        points, api_key=api_key, hass=hass, device_id="config_flow_test_id"
+    )
+    await weather.async_request_refresh()
+    return weather.last_update_success
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import timedelta
 from enum import Enum
 from math import floor
 
@@ -18,12 +19,16 @@ from homeassistant.components.weather import (
     ATTR_CONDITION_SNOWY,
     ATTR_CONDITION_SUNNY,
 )
-from homeassistant.const import Platform
+from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE, Platform
 
 DOMAIN = "yandex_weather"
 DEFAULT_NAME = "Yandex Weather"
 API_LIMIT_PER_DAY = 30
 API_LIMIT_PER_MONTH = 1000  # 2.7 https://yandex.ru/legal/apib2c_weather_agreement/ru/
+API_REQUESTS_PER_SECOND = 1.0
+API_MAX_CONCURRENT_REQUESTS = 2
+API_AUTH_ERROR_CODES = frozenset({401, 403})
+API_QUOTA_ERROR_CODES = frozenset({429})
 DEFAULT_UPDATES_PER_DAY = min(24, API_LIMIT_PER_DAY, floor(API_LIMIT_PER_MONTH / 31))
 ATTRIBUTION = "Data provided by Yandex Weather"
 MANUFACTURER = "Yandex"
@@ -50,6 +55,38 @@ ATTR_API_YA_CONDITION = "yandex_condition"
 ATTR_API_ORIGINAL_CONDITION = "original_condition"
 ATTR_MIN_FORECAST_TEMPERATURE = "min_forecast_temperature"
 ATTR_API_FORECAST_ICONS = "forecast_icons"
+ATTR_FORECAST_INDEX = "forecast_index"
+ATTR_AREA_CONDITION = "area_condition"
+ATTR_AREA_TEMPERATURE_MIN = "area_temperature_min"
+ATTR_AREA_TEMPERATURE_MAX = "area_temperature_max"
+ATTR_AREA_WIND_SPEED_MAX = "area_wind_speed_max"
+ATTR_AREA_POINTS = "area_points"
+ATTR_HEATING_DEGREE_DAYS = "heating_degree_days"
+ATTR_COOLING_DEGREE_DAYS = "cooling_degree_days"
+ATTR_HEATING_DEGREE_DAYS_TODAY = "heating_degree_days_today"
+ATTR_COOLING_DEGREE_DAYS_TODAY = "cooling_degree_days_today"
+ATTR_HEATING_DEGREE_DAYS_TOMORROW = "heating_degree_days_tomorrow"
+ATTR_COOLING_DEGREE_DAYS_TOMORROW = "cooling_degree_days_tomorrow"
+
+ATTR_ACCURACY_TEMPERATURE_MAE = "forecast_temperature_mae"
+ATTR_ACCURACY_TEMPERATURE_BIAS = "forecast_temperature_bias"
+ATTR_ACCURACY_CONDITION_HIT_RATE = "forecast_condition_hit_rate"
+ATTR_ACCURACY_WIND_SPEED_MAE = "forecast_wind_speed_mae"
+ATTR_ACCURACY_SAMPLES = "forecast_accuracy_samples"
+
+FORECAST_STATISTICS_WINDOWS = (3, 6, 12, 24)
+"""Forecast statistics are calculated for next hours."""
+FORECAST_TEMPERATURE_MIN = "temperature_min"
+FORECAST_TEMPERATURE_MAX = "temperature_max"
+FORECAST_TEMPERATURE_MEAN = "temperature_mean"
+FORECAST_WIND_GUST_MAX = "wind_gust_max"
+FORECAST_PRECIPITATION_TOTAL = "precipitation_total"
+
+
+def forecast_statistic_key(statistic: str, hours: int) -> str:
+    """Weather data key for forecast statistic over next hours."""
+    return f"forecast_{statistic}_{hours}h"
+
 
 ATTR_FORECAST_DATA = "forecast"  # just to be able to load saved forecast after restart
 ATTR_FORECAST_HOURLY = "forecastHourly"
@@ -58,11 +95,145 @@ ATTR_FORECAST_DAILY = "forecastDaily"
 CONF_UPDATES_PER_DAY = "updates_per_day"
 CONF_IMAGE_SOURCE = "image_source"
 CONF_LANGUAGE_KEY = "language"
+CONF_ARCHIVE = "archive"
+CONF_SCHEDULE_MODE = "schedule_mode"
+CONF_REFRESH_PHASE = "refresh_phase"
+CONF_ENTRY_TYPE = "entry_type"
+ENTRY_TYPE_POINT = "point"
+ENTRY_TYPE_AREA = "area"
+CONF_AREA = "area"
+CONF_GRID_SIZE = "grid_size"
+DEFAULT_GRID_SIZE = 3
+CONF_INTERPOLATE = "interpolate"
+CONF_LOCAL_ICONS = "local_icons"
+DEFAULT_LOCAL_ICONS = False
+ICON_CACHE = f"{DOMAIN}_icons"
+"""hass.data key of icon cache shared by all entries."""
+ICON_CACHE_MAX_BYTES = 2 * 1024 * 1024
+ICON_CACHE_MAX_AGE = int(timedelta(days=7).total_seconds())
+CONF_INTERPOLATION_RESOLUTION = "interpolation_resolution"
+DEFAULT_INTERPOLATION_RESOLUTION = 0.1
+INTERPOLATION_INTERVAL = timedelta(minutes=5)
+"""How often interpolated values are recalculated from cached forecast."""
+CONF_CACHE_BACKEND = "cache_backend"
+CONF_CACHE_URL = "cache_url"
+CACHE_BACKEND_NONE = "none"
+CACHE_BACKEND_MEMORY = "memory"
+CACHE_BACKEND_FILE = "file"
+CACHE_BACKEND_REDIS = "redis"
+CACHE_BACKENDS = [
+    CACHE_BACKEND_NONE,
+    CACHE_BACKEND_MEMORY,
+    CACHE_BACKEND_FILE,
+    CACHE_BACKEND_REDIS,
+]
+DEFAULT_CACHE_BACKEND = CACHE_BACKEND_NONE
+DEFAULT_REDIS_PORT = 6379
+CACHE_LOCK_TTL = 30
+"""Lock of cached response fetch expires after this many seconds."""
+CACHE_POLL_INTERVAL = 0.5
+"""How often response fetched by another instance is checked, in seconds."""
+CONF_KEY_POOL = "key_pool"
+CONF_POOL_API_KEYS = "pool_api_keys"
+KEY_AUTH_COOLDOWN = timedelta(hours=1)
+"""Key rejected by API is retried after this time."""
+CONF_FAIR_SHARE = "fair_share"
+CONF_QUOTA_WEIGHT = "quota_weight"
+CONF_QUOTA_PRIORITY = "quota_priority"
+DEFAULT_QUOTA_WEIGHT = 1.0
+DEFAULT_QUOTA_PRIORITY = 0
+QUOTA_RETRY_UPDATES_PER_DAY = 4
+"""Failing entry gets budget for this many retries, the rest goes to others."""
+RAW_RESPONSES_SIZE = 5
+"""How many raw API responses are kept for diagnostics."""
+CONF_HEATING_BASE = "heating_base"
+CONF_COOLING_BASE = "cooling_base"
+DEFAULT_HEATING_BASE = 18.0
+DEFAULT_COOLING_BASE = 22.0
+DEGREE_DAYS_UNIT = "°C·d"
+DEGREE_DAYS_MAX_GAP = int(timedelta(hours=6).total_seconds())
+"""Observed temperature is not integrated over longer intervals."""
+SCHEDULE_MODE_INTERVAL = "interval"
+"""Refresh every update interval since last refresh."""
+SCHEDULE_MODE_ALIGNED = "aligned"
+"""Refresh on clock-aligned slots with per-entry phase."""
+SCHEDULE_MODES = [SCHEDULE_MODE_INTERVAL, SCHEDULE_MODE_ALIGNED]
+DEFAULT_SCHEDULE_MODE = SCHEDULE_MODE_INTERVAL
 UPDATE_LISTENER = "update_listener"
+SERVICE_REFRESH = "refresh"
+SERVICE_GET_ARCHIVE = "get_archive"
+SERVICE_GET_FORECAST_ACCURACY = "get_forecast_accuracy"
+SERVICE_GET_FORECASTS = "get_forecasts"
+SERVICE_FORECAST_AT = "forecast_at"
+SERVICE_GET_CONDITION_HISTORY = "get_condition_history"
+ATTR_HOURS = "hours"
+ATTR_CONDITION_SINCE = "condition_since"
+ATTR_CONDITION_TRANSITIONS = "condition_transitions"
+CONDITION_HISTORY_SIZE = 256
+CONDITION_TRANSITIONS_HOURS = 24
+"""Window of condition transitions sensor."""
+ATTR_PRECISION = "precision"
+DEFAULT_GEOHASH_PRECISION = 5
+"""Geohash cell of about 5x5 km."""
+POINT_CACHE_TTL = timedelta(hours=1)
+POINT_CACHE_SIZE = 64
+ATTR_FIELDS = "fields"
+ATTR_FORECAST_TYPE = "type"
+FORECAST_TYPES = {"hourly": ATTR_FORECAST_HOURLY, "daily": ATTR_FORECAST_DAILY}
+ATTR_ENTRY_ID = "entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ENTRY_OPTIONS = "options"
+
+FETCH_OPTIONS = frozenset(
+    {CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE, CONF_UPDATES_PER_DAY}
+)
+"""Options that change what or how often we request from API."""
+PRESENTATION_OPTIONS = frozenset(
+    {
+        CONF_IMAGE_SOURCE,
+        CONF_INTERPOLATION_RESOLUTION,
+        CONF_LOCAL_ICONS,
+    }
+)
+"""Options that may be applied to already fetched data without reload."""
+OPTION_DEFAULTS = {
+    CONF_UPDATES_PER_DAY: DEFAULT_UPDATES_PER_DAY,
+    CONF_IMAGE_SOURCE: "Yandex",
+    CONF_LOCAL_ICONS: DEFAULT_LOCAL_ICONS,
+    CONF_SCHEDULE_MODE: DEFAULT_SCHEDULE_MODE,
+    CONF_ARCHIVE: False,
+    CONF_INTERPOLATE: False,
+    CONF_INTERPOLATION_RESOLUTION: DEFAULT_INTERPOLATION_RESOLUTION,
+    CONF_HEATING_BASE: DEFAULT_HEATING_BASE,
+    CONF_COOLING_BASE: DEFAULT_COOLING_BASE,
+    CONF_FAIR_SHARE: False,
+    CONF_QUOTA_WEIGHT: DEFAULT_QUOTA_WEIGHT,
+    CONF_QUOTA_PRIORITY: DEFAULT_QUOTA_PRIORITY,
+    CONF_KEY_POOL: False,
+    CONF_CACHE_BACKEND: DEFAULT_CACHE_BACKEND,
+}
+"""Values used for options that entry has not saved yet."""
+
+
+def changed_options(old: dict, new: dict) -> set[str]:
+    """Get options with different effective values.
+
+    Options missing in entry saved before they were added are compared by
+    their defaults, so saving defaults in options form changes nothing.
+    """
+    return {
+        k
+        for k in old.keys() | new.keys()
+        if old.get(k, OPTION_DEFAULTS.get(k)) != new.get(k, OPTION_DEFAULTS.get(k))
+    }
+
+
 PLATFORMS = [Platform.SENSOR, Platform.WEATHER]
+AREA_PLATFORMS = [Platform.SENSOR]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ConditionMapper:
     HA: dict | str
     icons: dict | str
@@ -182,7 +353,7 @@ for _condition in Conditions:
     CUSTOM_WEATHER_CARD_MAPPING[_condition.name] = _condition.value.custom_weather_card
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ConditionImage:
     """Way to get image for weather condition."""
 
@@ -230,6 +401,34 @@ def map_state(src: str, is_day: bool = True, mapping: dict | None = None) -> str
     return result
 
 
+def compile_mapping(
+    mapping: dict[str, dict[str, str] | str], link: str = "{}"
+) -> dict[tuple[str, bool], str]:
+    """Compile day/night dependent mapping to flat table.
+
+    :param mapping: condition mapping, value may depend on day or night
+    :param link: format mapped value with this template
+    :return: table with (condition, is_day) keys
+    """
+    return {
+        (src, is_day): link.format(map_state(src, is_day, mapping))
+        for src in mapping
+        for is_day in (True, False)
+    }
+
+
+CONDITION_HA_STATE = compile_mapping(WEATHER_STATES_CONVERSION)
+"""HA state by (Yandex condition, is_day)."""
+CONDITION_MDI_ICON = compile_mapping(CONDITION_ICONS)
+"""State icon by (Yandex condition, is_day)."""
+CONDITION_IMAGE_URL: dict[str, dict[tuple[str, bool], str]] = {
+    source: compile_mapping(ci.mapping, ci.link)
+    for source, ci in CONDITION_IMAGE.items()
+    if ci is not None and ci.mapping is not None
+}
+"""Image URL by (Yandex condition, is_day) for each mapped image source."""
+
+
 def get_image(
     image_source: str, condition: str, image: str, is_day: bool = True
 ) -> str | None:
@@ -242,22 +441,16 @@ def get_image(
     :return: str|None: url for current condition image
     """
 
-    if image_source not in CONDITION_IMAGE.keys():
-        return None
-    if (ci := CONDITION_IMAGE[image_source]) is None:
+    if (ci := CONDITION_IMAGE.get(image_source)) is None:
         return None
 
-    if (mapping := ci.mapping) is not None:
-        # map condition to image_source-friendly
-        condition = map_state(
-            src=condition,
-            is_day=is_day,
-            mapping=mapping,
-        )
-    else:
-        condition = image
+    if (urls := CONDITION_IMAGE_URL.get(image_source)) is not None:
+        if (url := urls.get((condition, is_day))) is not None:
+            return url
+        # have no mapping for condition
+        return ci.link.format(condition)
 
-    return ci.link.format(condition)
+    return ci.link.format(image)
 
 
 # https://yandex.ru/dev/weather/doc/ru/concepts/parameters#pressure
@@ -284,6 +477,7 @@ QUERY = """
                         windSpeed
                         windAngle
                         windGust
+                        prec
                         icon(format: SVG)
                     }
                 }
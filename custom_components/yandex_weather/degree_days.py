@@ -0,0 +1,218 @@
+"""Heating and cooling degree-days accumulated between refreshes."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_COOLING_DEGREE_DAYS,
+    ATTR_COOLING_DEGREE_DAYS_TODAY,
+    ATTR_COOLING_DEGREE_DAYS_TOMORROW,
+    ATTR_HEATING_DEGREE_DAYS,
+    ATTR_HEATING_DEGREE_DAYS_TODAY,
+    ATTR_HEATING_DEGREE_DAYS_TOMORROW,
+    DEFAULT_COOLING_BASE,
+    DEFAULT_HEATING_BASE,
+    DEGREE_DAYS_MAX_GAP,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+DAY = 86400
+
+Point = tuple[float, float]
+"""Timestamp and temperature."""
+
+
+def _positive_area(f0: float, f1: float, duration: float) -> float:
+    """Integral of positive part of linear function over segment."""
+    if f0 >= 0 and f1 >= 0:
+        return (f0 + f1) / 2 * duration
+    if f0 <= 0 and f1 <= 0:
+        return 0.0
+    positive = max(f0, f1)
+    # triangle up to zero crossing
+    return positive * positive / (abs(f0) + abs(f1)) * duration / 2
+
+
+def integrate(
+    points: list[Point], heating_base: float, cooling_base: float
+) -> tuple[float, float]:
+    """Heating and cooling degree-days of linearly interpolated temperature.
+
+    :param points: temperature points sorted by time
+    :param heating_base: temperature below which heating is needed
+    :param cooling_base: temperature above which cooling is needed
+    """
+    heating = cooling = 0.0
+    for (t0, v0), (t1, v1) in zip(points, points[1:]):
+        heating += _positive_area(heating_base - v0, heating_base - v1, t1 - t0)
+        cooling += _positive_area(v0 - cooling_base, v1 - cooling_base, t1 - t0)
+    return heating / DAY, cooling / DAY
+
+
+def clip(points: list[Point], start: float, end: float) -> list[Point]:
+    """Points within [start, end] with interpolated boundary points."""
+
+    def at(moment: float) -> list[Point]:
+        for (t0, v0), (t1, v1) in zip(points, points[1:]):
+            if t0 < moment < t1:
+                return [(moment, v0 + (v1 - v0) * (moment - t0) / (t1 - t0))]
+        return []
+
+    inner = [(t, v) for t, v in points if start <= t <= end]
+    return at(start) + inner + at(end)
+
+
+def _midnight(day: date, tz) -> float:
+    return datetime.combine(day, time.min, tz).timestamp()
+
+
+class DegreeDays:
+    """Degree-day accumulators of device, kept between restarts.
+
+    Observed temperature is integrated on every refresh, so sensors need
+    neither recorder history nor periodic recalculation.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant | None,
+        device_id: str,
+        heating_base: float = DEFAULT_HEATING_BASE,
+        cooling_base: float = DEFAULT_COOLING_BASE,
+    ):
+        """Initialize accumulators.
+
+        :param hass: Home Assistant object, accumulators are not saved without it
+        :param device_id: ID of integration Device in Home Assistant
+        :param heating_base: temperature below which heating is needed
+        :param cooling_base: temperature above which cooling is needed
+        """
+        self.heating_base = heating_base
+        self.cooling_base = cooling_base
+        self.heating_total = 0.0
+        self.cooling_total = 0.0
+        self.heating_today = 0.0
+        self.cooling_today = 0.0
+        self._day: date | None = None
+        self._last: Point | None = None
+        self._store: Store | None = None
+        if hass is not None:
+            self._store = Store(
+                hass, STORAGE_VERSION, f"{DOMAIN}.degree_days.{device_id}"
+            )
+
+    async def async_load(self):
+        """Load saved accumulators."""
+        if self._store is None or (data := await self._store.async_load()) is None:
+            return
+        self.heating_total = data.get("heating_total", 0.0)
+        self.cooling_total = data.get("cooling_total", 0.0)
+        self.heating_today = data.get("heating_today", 0.0)
+        self.cooling_today = data.get("cooling_today", 0.0)
+        if (day := data.get("day")) is not None:
+            self._day = date.fromisoformat(day)
+        if (last := data.get("last")) is not None:
+            self._last = (float(last[0]), float(last[1]))
+
+    def _data_to_save(self) -> dict:
+        return {
+            "heating_total": self.heating_total,
+            "cooling_total": self.cooling_total,
+            "heating_today": self.heating_today,
+            "cooling_today": self.cooling_today,
+            "day": None if self._day is None else self._day.isoformat(),
+            "last": self._last,
+        }
+
+    def _add(self, points: list[Point]):
+        heating, cooling = integrate(points, self.heating_base, self.cooling_base)
+        self.heating_total += heating
+        self.cooling_total += cooling
+        self.heating_today += heating
+        self.cooling_today += cooling
+
+    def observe(self, temperature: float | None, when: datetime):
+        """Integrate observed temperature since previous observation.
+
+        Intervals longer than DEGREE_DAYS_MAX_GAP are skipped, temperature is
+        unknown there.
+
+        :param temperature: observed temperature
+        :param when: observation time with timezone, day is taken in HA timezone
+        """
+        if temperature is None:
+            return
+        when = dt_util.as_local(when)
+        point = (when.timestamp(), float(temperature))
+        last, self._last = self._last, point
+        gap_known = last is not None and 0 < point[0] - last[0] <= DEGREE_DAYS_MAX_GAP
+
+        today = when.date()
+        if self._day is not None and today != self._day:
+            if gap_known:
+                # part of interval before midnight belongs to previous day
+                self._add(clip([last, point], last[0], _midnight(today, when.tzinfo)))
+                last = clip([last, point], _midnight(today, when.tzinfo), point[0])[0]
+            self.heating_today = self.cooling_today = 0.0
+        self._day = today
+        if gap_known:
+            self._add([last, point])
+
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def estimate(self, now: datetime, forecast: list[Point]) -> dict[str, float]:
+        """Accumulated degree-days and estimates for today and tomorrow.
+
+        Today is observed part plus forecast for the rest of the day, so
+        observe should be called first.
+
+        :param now: refresh time with timezone, day is taken in HA timezone
+        :param forecast: forecast temperature points sorted by time
+        """
+        now = dt_util.as_local(now)
+        today = now.date()
+        tomorrow_start = _midnight(today + timedelta(days=1), now.tzinfo)
+        tomorrow_end = _midnight(today + timedelta(days=2), now.tzinfo)
+        rest = [self._last] if self._last is not None else []
+        rest += [p for p in forecast if p[0] > now.timestamp()]
+
+        heating_rest, cooling_rest = integrate(
+            clip(rest, now.timestamp(), tomorrow_start),
+            self.heating_base,
+            self.cooling_base,
+        )
+        tomorrow = clip(rest, tomorrow_start, tomorrow_end)
+        heating_tomorrow = cooling_tomorrow = None
+        if tomorrow and tomorrow[-1][0] >= tomorrow_end:
+            heating_tomorrow, cooling_tomorrow = integrate(
+                tomorrow, self.heating_base, self.cooling_base
+            )
+
+        observed = self._day == today
+        return {
+            ATTR_HEATING_DEGREE_DAYS: round(self.heating_total, 3),
+            ATTR_COOLING_DEGREE_DAYS: round(self.cooling_total, 3),
+            ATTR_HEATING_DEGREE_DAYS_TODAY: round(
+                (self.heating_today if observed else 0) + heating_rest, 2
+            ),
+            ATTR_COOLING_DEGREE_DAYS_TODAY: round(
+                (self.cooling_today if observed else 0) + cooling_rest, 2
+            ),
+            ATTR_HEATING_DEGREE_DAYS_TOMORROW: None
+            if heating_tomorrow is None
+            else round(heating_tomorrow, 2),
+            ATTR_COOLING_DEGREE_DAYS_TOMORROW: None
+            if cooling_tomorrow is None
+            else round(cooling_tomorrow, 2),
+        }
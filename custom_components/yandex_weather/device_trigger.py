@@ -1,73 +1,204 @@
 """Yandex.Weather triggers."""
 
+from collections.abc import Callable
+from functools import cache
 import logging
 
 from homeassistant.components.device_automation import (
     DEVICE_TRIGGER_BASE_SCHEMA as HA_TRIGGER_BASE_SCHEMA,
 )
-from homeassistant.components.homeassistant.triggers import event as event_trigger
-from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_ABOVE,
+    CONF_BELOW,
+    CONF_CONDITION,
+    CONF_DEVICE_ID,
+    CONF_DOMAIN,
+    CONF_PLATFORM,
+    CONF_TYPE,
+)
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 import voluptuous as vol
 
-from .const import DOMAIN, WEATHER_STATES_CONVERSION, map_state
+from .const import ATTR_FORECAST_INDEX, CONDITION_HA_STATE, DOMAIN, UPDATER
+from .forecast_index import ForecastIndex
 
 
 def generate_triggers() -> list:
     """Generate triggers list."""
-    result = []
-    for s in WEATHER_STATES_CONVERSION.keys():
-        for d in [True, False]:
-            result.append(map_state(src=s, is_day=d, mapping=WEATHER_STATES_CONVERSION))
-
-    return list(set(result))
+    return list(set(CONDITION_HA_STATE.values()))
 
 
 _LOGGER = logging.getLogger(__name__)
 
-TRIGGERS = generate_triggers()
+TRIGGERS: frozenset[str] = frozenset(generate_triggers())
+"""Condition change triggers."""
 
-TRIGGER_SCHEMA = HA_TRIGGER_BASE_SCHEMA.extend(
-    {
-        vol.Required(CONF_TYPE): vol.In(TRIGGERS),
-    }
+CONF_HOURS = "hours"
+DEFAULT_LOOKAHEAD_HOURS = 2
+TRIGGER_CONDITION_EXPECTED = "condition_expected"
+TRIGGER_TEMPERATURE_BELOW = "temperature_below"
+TRIGGER_TEMPERATURE_ABOVE = "temperature_above"
+LOOKAHEAD_TRIGGERS: dict[str, str] = {
+    TRIGGER_CONDITION_EXPECTED: CONF_CONDITION,
+    TRIGGER_TEMPERATURE_BELOW: CONF_BELOW,
+    TRIGGER_TEMPERATURE_ABOVE: CONF_ABOVE,
+}
+"""Forecast lookahead triggers and their required parameter."""
+
+HOURS_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=1, max=24))
+
+
+def _validate_lookahead(config: dict) -> dict:
+    """Check that lookahead trigger has its parameter."""
+    if (param := LOOKAHEAD_TRIGGERS.get(config[CONF_TYPE])) is not None:
+        if param not in config:
+            raise vol.Invalid(f"{param} is required for {config[CONF_TYPE]}")
+    return config
+
+
+TRIGGER_SCHEMA = vol.All(
+    HA_TRIGGER_BASE_SCHEMA.extend(
+        {
+            vol.Required(CONF_TYPE): vol.In(TRIGGERS | LOOKAHEAD_TRIGGERS.keys()),
+            vol.Optional(CONF_CONDITION): vol.In(TRIGGERS),
+            vol.Optional(CONF_BELOW): vol.Coerce(float),
+            vol.Optional(CONF_ABOVE): vol.Coerce(float),
+            vol.Optional(CONF_HOURS, default=DEFAULT_LOOKAHEAD_HOURS): HOURS_SCHEMA,
+        }
+    ),
+    _validate_lookahead,
 )
 
 
+def trigger_signal(device_id: str, trigger_type: str) -> str:
+    """Dispatcher signal for device trigger."""
+    return f"{DOMAIN}_trigger_{device_id}_{trigger_type}"
+
+
+def forecast_signal(device_id: str) -> str:
+    """Dispatcher signal for new forecast index of device."""
+    return f"{DOMAIN}_forecast_{device_id}"
+
+
+def _lookahead_predicate(config: dict) -> Callable[[ForecastIndex], bool]:
+    """Get function answering lookahead trigger question for index."""
+    hours = config[CONF_HOURS]
+    trigger_type = config[CONF_TYPE]
+    if trigger_type == TRIGGER_CONDITION_EXPECTED:
+        condition = config[CONF_CONDITION]
+        return lambda index: index.condition_within(condition, hours)
+    if trigger_type == TRIGGER_TEMPERATURE_BELOW:
+        below = config[CONF_BELOW]
+        return lambda index: index.temperature_below_within(below, hours)
+    above = config[CONF_ABOVE]
+    return lambda index: index.temperature_above_within(above, hours)
+
+
+def _current_index(hass: HomeAssistant, device_id: str) -> ForecastIndex | None:
+    """Get forecast index from already fetched data of device."""
+    if (device := dr.async_get(hass).async_get(device_id)) is None:
+        return None
+    for entry_id in device.config_entries:
+        if (domain_data := hass.data.get(DOMAIN, {}).get(entry_id)) is not None:
+            if (data := domain_data[UPDATER].data) is None:
+                return None
+            return data.get(ATTR_FORECAST_INDEX)
+    return None
+
+
+@cache
+def _device_triggers(device_id: str) -> tuple[dict, ...]:
+    """Triggers for device, built once."""
+    return tuple(
+        {
+            # Required fields of TRIGGER_BASE_SCHEMA
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            # Required fields of TRIGGER_SCHEMA
+            CONF_TYPE: t,
+        }
+        for t in [*sorted(TRIGGERS), *LOOKAHEAD_TRIGGERS.keys()]
+    )
+
+
 async def async_get_triggers(_hass: HomeAssistant, device_id):
     """Return a list of triggers."""
-    triggers = []
+    # caller may update returned dicts
+    return [dict(t) for t in _device_triggers(device_id)]
+
 
-    for t in TRIGGERS:
-        triggers.append(
+async def async_get_trigger_capabilities(_hass: HomeAssistant, config) -> dict:
+    """List trigger parameters."""
+    trigger_type = config[CONF_TYPE]
+    if trigger_type not in LOOKAHEAD_TRIGGERS:
+        return {}
+
+    param = LOOKAHEAD_TRIGGERS[trigger_type]
+    return {
+        "extra_fields": vol.Schema(
             {
-                # Required fields of TRIGGER_BASE_SCHEMA
-                CONF_PLATFORM: "device",
-                CONF_DOMAIN: DOMAIN,
-                CONF_DEVICE_ID: device_id,
-                # Required fields of TRIGGER_SCHEMA
-                CONF_TYPE: t,
+                vol.Required(param): vol.In(sorted(TRIGGERS))
+                if param == CONF_CONDITION
+                else vol.Coerce(float),
+                vol.Required(CONF_HOURS, default=DEFAULT_LOOKAHEAD_HOURS): HOURS_SCHEMA,
             }
         )
+    }
 
-    return triggers
 
+async def async_attach_trigger(
+    hass: HomeAssistant, config, action, trigger_info
+) -> CALLBACK_TYPE:
+    """Attach a trigger.
 
-async def async_attach_trigger(hass: HomeAssistant, config, action, automation_info):
-    """Attach a trigger."""
+    Lookahead trigger fires when its answer becomes true. Answer is false
+    until device has forecast, so trigger attached before the first refresh
+    fires on the first forecast that satisfies it.
+    """
     config = TRIGGER_SCHEMA(config)
     _LOGGER.debug("Got subscription to trigger: %s", config)
-    event_config = event_trigger.TRIGGER_SCHEMA(
-        {
-            event_trigger.CONF_PLATFORM: "event",
-            event_trigger.CONF_EVENT_TYPE: DOMAIN + "_event",
-            event_trigger.CONF_EVENT_DATA: {
-                CONF_DEVICE_ID: config[CONF_DEVICE_ID],
-                CONF_TYPE: config[CONF_TYPE],
+    device_id = config[CONF_DEVICE_ID]
+    trigger_type = config[CONF_TYPE]
+    job = HassJob(action, f"{DOMAIN} device trigger {trigger_type}")
+    trigger_data = trigger_info["trigger_data"]
+
+    @callback
+    def _fire(description: str) -> None:
+        hass.async_run_hass_job(
+            job,
+            {
+                "trigger": {
+                    **trigger_data,
+                    **config,
+                    CONF_PLATFORM: "device",
+                    "description": description,
+                }
             },
-        }
-    )
+        )
 
-    return await event_trigger.async_attach_trigger(
-        hass, event_config, action, automation_info, platform_type="device"
-    )
+    if trigger_type not in LOOKAHEAD_TRIGGERS:
+
+        @callback
+        def _handle_condition() -> None:
+            _fire(f"weather condition changed to {trigger_type}")
+
+        return async_dispatcher_connect(
+            hass, trigger_signal(device_id, trigger_type), _handle_condition
+        )
+
+    predicate = _lookahead_predicate(config)
+    index = _current_index(hass, device_id)
+    last_answer = index is not None and predicate(index)
+
+    @callback
+    def _handle_forecast(index: ForecastIndex) -> None:
+        nonlocal last_answer
+        answer = predicate(index)
+        previous, last_answer = last_answer, answer
+        if answer and not previous:
+            _fire(f"{trigger_type} within {config[CONF_HOURS]} hours")
+
+    return async_dispatcher_connect(hass, forecast_signal(device_id), _handle_forecast)
@@ -0,0 +1,89 @@
+"""Diagnostics support for Yandex.Weather."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    ATTR_FORECAST_INDEX,
+    CONF_AREA,
+    CONF_CACHE_URL,
+    CONF_POOL_API_KEYS,
+    DOMAIN,
+    ENTRY_OPTIONS,
+    UPDATER,
+)
+from .snapshot import WeatherSnapshot
+from .updater import WeatherUpdater
+
+TO_REDACT = {
+    CONF_API_KEY,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_AREA,
+    CONF_CACHE_URL,
+    CONF_POOL_API_KEYS,
+    "lat",
+    "lon",
+}
+
+
+def snapshot_diagnostics(snapshot: WeatherSnapshot | None) -> dict[str, Any] | None:
+    """Weather data snapshot ready for JSON.
+
+    :param snapshot: updater data, None before first successful refresh
+    """
+    if snapshot is None:
+        return None
+    result = dict(snapshot)
+    if (index := result.get(ATTR_FORECAST_INDEX)) is not None:
+        result[ATTR_FORECAST_INDEX] = asdict(index)
+    return {"version": snapshot.version, "data": result}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Raw responses are serialized here only, updater keeps references to them.
+    """
+    domain_data = hass.data[DOMAIN][entry.entry_id]
+    updater: WeatherUpdater = domain_data[UPDATER]
+    limiter = updater.limiter
+    return async_redact_data(
+        {
+            "entry": {
+                "title": entry.title,
+                "version": entry.version,
+                "options": domain_data[ENTRY_OPTIONS],
+            },
+            "updater": {
+                "last_update_success": updater.last_update_success,
+                "last_exception": repr(updater.last_exception)
+                if updater.last_exception is not None
+                else None,
+                "schedule": updater.schedule,
+                "performance": updater.performance,
+                "quota": {
+                    "calls_today": limiter.calls_today,
+                    "calls_total": limiter.calls_total,
+                },
+                "key_pool": None
+                if updater.key_pool is None
+                else updater.key_pool.usage(),
+            },
+            "snapshot": snapshot_diagnostics(updater.data),
+            "raw_responses": [
+                {"received": received.isoformat(), "response": response}
+                for received, response in updater.raw_responses
+            ],
+        },
+        TO_REDACT,
+    )
@@ -0,0 +1,76 @@
+"""Lookup index over hourly forecast."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import math
+
+from homeassistant.components.weather import (
+    ATTR_FORECAST_CONDITION,
+    ATTR_FORECAST_NATIVE_TEMP,
+    ATTR_FORECAST_TIME,
+    Forecast,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastIndex:
+    """Transition index built once per refresh from hourly forecast.
+
+    Index of all lists is number of hours from refresh time.
+    """
+
+    first_hour: dict[str, int]
+    """First hour when HA condition is expected."""
+    min_temperature: tuple[float | None, ...]
+    """Minimal temperature expected within hours."""
+    max_temperature: tuple[float | None, ...]
+    """Maximal temperature expected within hours."""
+
+    @classmethod
+    def build(cls, now: datetime, forecasts: list[Forecast]) -> ForecastIndex:
+        """Build index.
+
+        :param now: refresh time
+        :param forecasts: hourly forecast sorted by time
+        """
+        first_hour: dict[str, int] = {}
+        min_temperature: list[float | None] = [None]
+        max_temperature: list[float | None] = [None]
+
+        for f in forecasts:
+            hour = math.ceil(
+                (datetime.fromisoformat(f[ATTR_FORECAST_TIME]) - now).total_seconds()
+                / 3600
+            )
+            if hour < 0:
+                continue
+            # carry running values over hours without forecast
+            while len(min_temperature) <= hour:
+                min_temperature.append(min_temperature[-1])
+                max_temperature.append(max_temperature[-1])
+
+            if (condition := f.get(ATTR_FORECAST_CONDITION)) is not None:
+                first_hour.setdefault(condition, hour)
+            if (t := f.get(ATTR_FORECAST_NATIVE_TEMP)) is not None:
+                low, high = min_temperature[hour], max_temperature[hour]
+                min_temperature[hour] = t if low is None else min(low, t)
+                max_temperature[hour] = t if high is None else max(high, t)
+
+        return cls(first_hour, tuple(min_temperature), tuple(max_temperature))
+
+    def condition_within(self, condition: str, hours: int) -> bool:
+        """Is condition expected within hours?"""
+        hour = self.first_hour.get(condition)
+        return hour is not None and hour <= hours
+
+    def temperature_below_within(self, threshold: float, hours: int) -> bool:
+        """Is temperature below threshold expected within hours?"""
+        t = self.min_temperature[min(hours, len(self.min_temperature) - 1)]
+        return t is not None and t < threshold
+
+    def temperature_above_within(self, threshold: float, hours: int) -> bool:
+        """Is temperature above threshold expected within hours?"""
+        t = self.max_temperature[min(hours, len(self.max_temperature) - 1)]
+        return t is not None and t > threshold
@@ -0,0 +1,96 @@
+"""Condition history ring buffer."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import CONDITION_HISTORY_SIZE, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+
+class ConditionHistory:
+    """Last condition transitions of device, kept between restarts."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant | None,
+        device_id: str,
+        size: int = CONDITION_HISTORY_SIZE,
+    ):
+        """Initialize history.
+
+        :param hass: Home Assistant object, history is not saved without it
+        :param device_id: ID of integration Device in Home Assistant
+        :param size: how many transitions are kept
+        """
+        self._transitions: deque[tuple[float, str]] = deque(maxlen=size)
+        self._store: Store | None = None
+        if hass is not None:
+            self._store = Store(
+                hass, STORAGE_VERSION, f"{DOMAIN}.condition_history.{device_id}"
+            )
+
+    async def async_load(self):
+        """Load saved history."""
+        if self._store is None or (data := await self._store.async_load()) is None:
+            return
+        self._transitions.extend(
+            (float(t), str(c)) for t, c in data.get("transitions", [])
+        )
+        _LOGGER.debug(f"Loaded {len(self._transitions)} condition transitions")
+
+    def _data_to_save(self) -> dict:
+        return {"transitions": list(self._transitions)}
+
+    def record(self, condition: str | None, when: datetime) -> bool:
+        """Record condition, if it differs from current one.
+
+        :returns: whether transition was recorded
+        """
+        if condition is None or condition == self.current:
+            return False
+        self._transitions.append((when.timestamp(), condition))
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return True
+
+    @property
+    def current(self) -> str | None:
+        """Last recorded condition."""
+        return self._transitions[-1][1] if self._transitions else None
+
+    @property
+    def current_since(self) -> datetime | None:
+        """Time of transition to current condition."""
+        if not self._transitions:
+            return None
+        return dt_util.utc_from_timestamp(self._transitions[-1][0])
+
+    def transitions_since(self, since: datetime) -> int:
+        """Count transitions after time."""
+        since_ts = since.timestamp()
+        count = 0
+        for t, _ in reversed(self._transitions):
+            if t <= since_ts:
+                break
+            count += 1
+        return count
+
+    def as_list(self, since: datetime | None = None) -> list[dict[str, str]]:
+        """Transitions from oldest to newest."""
+        since_ts = float("-inf") if since is None else since.timestamp()
+        return [
+            {"time": dt_util.utc_from_timestamp(t).isoformat(), "condition": c}
+            for t, c in self._transitions
+            if t > since_ts
+        ]
@@ -0,0 +1,174 @@
+"""Local proxy and disk cache for condition images."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from http import HTTPStatus
+import logging
+import mimetypes
+import os
+import re
+
+from aiohttp import ClientError, web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import DOMAIN, ICON_CACHE_MAX_AGE
+
+_LOGGER = logging.getLogger(__name__)
+
+ICON_URL = f"/api/{DOMAIN}/icon/{{key}}"
+FETCH_TIMEOUT = 20
+_KEY_RE = re.compile(r"[0-9a-f]{20}(\.\w+)?")
+
+
+def icon_key(url: str) -> str:
+    """Cache key of remote icon, keeps file extension."""
+    _, ext = os.path.splitext(url.split("?", 1)[0])
+    return hashlib.sha1(url.encode()).hexdigest()[:20] + (ext if ext else "")
+
+
+class IconCache:
+    """Disk cache of remote icons with size limit.
+
+    Entities get local URL for remote one with `local_url`, missing icons are
+    fetched in background.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str, max_bytes: int):
+        """Initialize cache.
+
+        :param path: directory for cached icons
+        :param max_bytes: least recently used icons are removed over this size
+        """
+        self._hass = hass
+        self._path = path
+        self._max_bytes = max_bytes
+        self._urls: dict[str, str] = {}
+        """Remote URL by cache key."""
+        self._fetching: dict[str, asyncio.Task] = {}
+
+    def file(self, key: str) -> str:
+        """Cache file for key."""
+        return os.path.join(self._path, key)
+
+    @callback
+    def local_url(self, url: str | None) -> str | None:
+        """Get local URL for remote icon and fetch it in background if needed."""
+        if not url or not url.startswith(("http://", "https://")):
+            return url
+        key = icon_key(url)
+        if key not in self._urls:
+            self._urls[key] = url
+            self._hass.async_create_background_task(
+                self.async_get(key), name=f"{DOMAIN} icon {key}"
+            )
+        return ICON_URL.format(key=key)
+
+    async def async_get(self, key: str) -> bytes | None:
+        """Get icon from disk, fetch it if it is not cached yet.
+
+        :returns: None for unknown or unavailable icon
+        """
+        if not _KEY_RE.fullmatch(key):
+            return None
+        # icons cached before restart are served before entities ask for them
+        data = await self._hass.async_add_executor_job(self._read, key)
+        if data is None and (url := self._urls.get(key)) is not None:
+            if (task := self._fetching.get(key)) is None:
+                task = self._fetching[key] = asyncio.ensure_future(
+                    self._async_fetch(key, url)
+                )
+                task.add_done_callback(lambda _: self._fetching.pop(key, None))
+            data = await asyncio.shield(task)
+        return data
+
+    async def _async_fetch(self, key: str, url: str) -> bytes | None:
+        _LOGGER.debug(f"Fetching {url} to icon cache")
+        session = async_get_clientsession(self._hass)
+        try:
+            async with session.get(url, timeout=FETCH_TIMEOUT) as response:
+                response.raise_for_status()
+                data = await response.read()
+        except (ClientError, asyncio.TimeoutError) as e:
+            _LOGGER.warning(f"Could not fetch icon {url}: {e}")
+            return None
+        try:
+            await self._hass.async_add_executor_job(self._write, key, data)
+        except OSError as e:
+            _LOGGER.warning(f"Could not cache icon {url}: {e}")
+        return data
+
+    def _read(self, key: str) -> bytes | None:
+        try:
+            with open(self.file(key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        # access time is used for eviction and may be disabled for filesystem
+        os.utime(self.file(key))
+        return data
+
+    def _write(self, key: str, data: bytes):
+        os.makedirs(self._path, exist_ok=True)
+        tmp = f"{self.file(key)}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self.file(key))
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used icons over size limit."""
+        files = []
+        for entry in os.scandir(self._path):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self._max_bytes:
+                break
+            _LOGGER.debug(f"Evicting {path} from icon cache")
+            os.remove(path)
+            total -= size
+
+
+SECURITY_HEADERS = {
+    "Content-Security-Policy": "default-src 'none'; style-src 'unsafe-inline'; sandbox",
+    "X-Content-Type-Options": "nosniff",
+}
+"""Icons come from third-party repositories and are served from HA origin,
+so scripts in them must never run."""
+
+
+class IconView(HomeAssistantView):
+    """Serve cached condition icons.
+
+    Images are loaded by browser without auth headers, and only icons that
+    were requested by entities are served.
+    """
+
+    url = ICON_URL
+    name = f"api:{DOMAIN}:icon"
+    requires_auth = False
+
+    def __init__(self, cache: IconCache):
+        """Initialize view."""
+        self._cache = cache
+
+    async def get(self, request: web.Request, key: str) -> web.Response:
+        """Serve icon."""
+        etag = f'"{key}"'
+        headers = {
+            **SECURITY_HEADERS,
+            "Cache-Control": f"public, max-age={ICON_CACHE_MAX_AGE}, immutable",
+            "ETag": etag,
+        }
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+        if (data := await self._cache.async_get(key)) is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND, headers=SECURITY_HEADERS)
+        content_type, _ = mimetypes.guess_type(key)
+        return web.Response(body=data, content_type=content_type, headers=headers)
@@ -0,0 +1,57 @@
+"""Interpolation of current weather between API refreshes."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime
+
+from homeassistant.components.weather import (
+    ATTR_FORECAST_NATIVE_APPARENT_TEMP,
+    ATTR_FORECAST_NATIVE_TEMP,
+    ATTR_FORECAST_NATIVE_WIND_SPEED,
+    ATTR_FORECAST_TIME,
+)
+
+from .const import (
+    ATTR_API_FEELS_LIKE_TEMPERATURE,
+    ATTR_API_TEMPERATURE,
+    ATTR_API_WEATHER_TIME,
+    ATTR_API_WIND_SPEED,
+    ATTR_FORECAST_HOURLY,
+)
+
+INTERPOLATED_ATTRIBUTES: dict[str, str] = {
+    ATTR_API_TEMPERATURE: ATTR_FORECAST_NATIVE_TEMP,
+    ATTR_API_FEELS_LIKE_TEMPERATURE: ATTR_FORECAST_NATIVE_APPARENT_TEMP,
+    ATTR_API_WIND_SPEED: ATTR_FORECAST_NATIVE_WIND_SPEED,
+}
+"""Current weather attribute to hourly forecast attribute."""
+
+
+def interpolate(data: Mapping, key: str, now: datetime) -> float | None:
+    """Linear interpolation of current weather attribute.
+
+    Observation is used as first point and hourly forecast as next ones.
+    Outside of known points the nearest known value is used.
+
+    :param data: weather data snapshot
+    :param key: current weather attribute, see INTERPOLATED_ATTRIBUTES
+    :param now: time to get value for
+    """
+    if (value := data.get(key)) is None or ATTR_API_WEATHER_TIME not in data:
+        return value
+    t0 = data[ATTR_API_WEATHER_TIME]
+    if now <= t0:
+        return value
+
+    forecast_key = INTERPOLATED_ATTRIBUTES[key]
+    for f in data.get(ATTR_FORECAST_HOURLY, ()):
+        if (v1 := f.get(forecast_key)) is None:
+            continue
+        t1 = datetime.fromisoformat(f[ATTR_FORECAST_TIME])
+        if t1 <= t0:
+            continue
+        if now < t1:
+            return value + (v1 - value) * (now - t0) / (t1 - t0)
+        t0, value = t1, v1
+    return value
@@ -0,0 +1,216 @@
+"""Pool of API keys shared by entries."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import date, datetime, timedelta
+import hashlib
+import logging
+import re
+import time
+from typing import TypeVar
+
+from gql.transport.exceptions import TransportServerError
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    API_AUTH_ERROR_CODES,
+    API_LIMIT_PER_DAY,
+    API_QUOTA_ERROR_CODES,
+    DOMAIN,
+    KEY_AUTH_COOLDOWN,
+)
+from .limiter import RequestLimiter
+
+_LOGGER = logging.getLogger(__name__)
+_T = TypeVar("_T")
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+
+class NoApiKeyError(Exception):
+    """All keys of pool are disabled."""
+
+
+def parse_api_keys(value: str | None) -> list[str]:
+    """Split keys separated by commas, spaces or new lines."""
+    return [k for k in re.split(r"[\s,;]+", value or "") if k]
+
+
+def mask_key(key: str) -> str:
+    """Key representation safe for logs and attributes."""
+    return f"…{key[-4:]}"
+
+
+def key_id(key: str) -> str:
+    """Key representation safe for storage."""
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def _next_midnight(now: float) -> float:
+    tomorrow = datetime.fromtimestamp(now).date() + timedelta(days=1)
+    return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+
+class ApiKeyPool:
+    """Keys of all pooled entries, selected by remaining daily budget.
+
+    Keys are counted by entries using them, so key stays in pool until the
+    last entry is unloaded. Usage of keys is kept between restarts.
+    """
+
+    def __init__(self, limit_per_day: int = API_LIMIT_PER_DAY):
+        """Initialize pool.
+
+        :param limit_per_day: how many requests are allowed for key per day
+        """
+        self._limit = limit_per_day
+        self._keys: Counter[str] = Counter()
+        self._disabled: dict[str, tuple[float, str]] = {}
+        """Disable deadline and reason by key."""
+        self._saved: dict[str, dict] = {}
+        """Saved usage by key_id, kept for keys that are not in pool yet."""
+        self._store: Store | None = None
+
+    async def async_load(self, hass: HomeAssistant):
+        """Load saved usage of keys once per process."""
+        if self._store is not None:
+            return
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.key_usage")
+        if (data := await self._store.async_load()) is not None:
+            self.restore(data)
+
+    def restore(self, data: dict):
+        """Restore saved usage of keys."""
+        self._saved = dict(data.get("keys", {}))
+        for key in self._keys:
+            self._restore(key)
+
+    def _restore(self, key: str):
+        if (saved := self._saved.get(key_id(key))) is None:
+            return
+        RequestLimiter.for_key(key).restore(
+            date.fromisoformat(saved["day"]),
+            saved["calls_today"],
+            saved["calls_total"],
+        )
+
+    def as_dict(self) -> dict:
+        """Usage of keys ready for JSON."""
+        today = date.today().isoformat()
+        for key in self._keys:
+            limiter = RequestLimiter.for_key(key)
+            self._saved[key_id(key)] = {
+                "day": today,
+                "calls_today": limiter.calls_today,
+                "calls_total": limiter.calls_total,
+            }
+        return {"keys": dict(self._saved)}
+
+    def add(self, keys: Iterable[str]):
+        """Add keys of entry."""
+        keys = list(keys)
+        new = [k for k in keys if k not in self._keys]
+        self._keys.update(keys)
+        for key in new:
+            self._restore(key)
+
+    def remove(self, keys: Iterable[str]):
+        """Remove keys of unloaded entry."""
+        self._keys.subtract(keys)
+        for key in [k for k, count in self._keys.items() if count <= 0]:
+            del self._keys[key]
+            self._disabled.pop(key, None)
+
+    def daily_budget(self) -> int:
+        """Requests allowed per day for all keys."""
+        return self._limit * len(self._keys)
+
+    def calls_today(self) -> int:
+        """Requests done today with all keys."""
+        return sum(RequestLimiter.for_key(k).calls_today for k in self._keys)
+
+    def remaining(self, key: str) -> int:
+        """Requests left for key today."""
+        return self._limit - RequestLimiter.for_key(key).calls_today
+
+    def is_disabled(self, key: str, now: float | None = None) -> bool:
+        """Is key skipped after error?"""
+        if (disabled := self._disabled.get(key)) is None:
+            return False
+        if disabled[0] <= (time.time() if now is None else now):
+            del self._disabled[key]
+            return False
+        return True
+
+    def disable(self, key: str, until: float, reason: str):
+        """Skip key until timestamp."""
+        _LOGGER.warning(f"API key {mask_key(key)} is disabled: {reason}")
+        self._disabled[key] = (until, reason)
+
+    def select(self, exclude: Iterable[str] = ()) -> str:
+        """Key with the biggest remaining budget.
+
+        :param exclude: keys that were already tried
+        :raises NoApiKeyError: if no key may be used
+        """
+        exclude = set(exclude)
+        candidates = [
+            k for k in self._keys if k not in exclude and not self.is_disabled(k)
+        ]
+        if not candidates:
+            raise NoApiKeyError("No enabled API key in pool")
+        return max(
+            candidates,
+            key=lambda k: (self.remaining(k), -RequestLimiter.for_key(k).calls_total),
+        )
+
+    async def async_call(self, func: Callable[[str], Awaitable[_T]]) -> _T:
+        """Call func with selected key, failing over to other keys.
+
+        Keys rejected by API are disabled: after quota errors till next day,
+        after authorization errors for KEY_AUTH_COOLDOWN.
+        """
+        tried: list[str] = []
+        while True:
+            key = self.select(tried)
+            try:
+                return await func(key)
+            except TransportServerError as e:
+                now = time.time()
+                if e.code in API_QUOTA_ERROR_CODES:
+                    self.disable(key, _next_midnight(now), f"quota exceeded ({e})")
+                elif e.code in API_AUTH_ERROR_CODES:
+                    self.disable(
+                        key,
+                        now + KEY_AUTH_COOLDOWN.total_seconds(),
+                        f"not authorized ({e})",
+                    )
+                else:
+                    raise
+            finally:
+                # request was counted by limiter whatever the result
+                if self._store is not None:
+                    self._store.async_delay_save(self.as_dict, SAVE_DELAY)
+            tried.append(key)
+
+    def usage(self) -> dict[str, dict]:
+        """Usage by masked key."""
+        result = {}
+        for key in self._keys:
+            limiter = RequestLimiter.for_key(key)
+            disabled = self._disabled.get(key) if self.is_disabled(key) else None
+            result[mask_key(key)] = {
+                "calls_today": limiter.calls_today,
+                "calls_total": limiter.calls_total,
+                "remaining_today": self.remaining(key),
+                "disabled": None if disabled is None else disabled[1],
+            }
+        return result
+
+
+KEY_POOL = ApiKeyPool()
+"""Keys of all entries with enabled key pool."""
@@ -0,0 +1,122 @@
+"""Requests limiting for Yandex.Weather API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from contextlib import asynccontextmanager
+from datetime import date
+import logging
+import time
+from typing import ClassVar, TypeVar
+
+from .const import API_MAX_CONCURRENT_REQUESTS, API_REQUESTS_PER_SECOND
+
+_LOGGER = logging.getLogger(__name__)
+_T = TypeVar("_T")
+
+
+class RequestLimiter:
+    """Token bucket and concurrency limiter for one API key.
+
+    Limiters are shared by all updaters in process, use `for_key` to get one.
+    """
+
+    _limiters: ClassVar[dict[str, RequestLimiter]] = {}
+
+    def __init__(
+        self,
+        rate: float = API_REQUESTS_PER_SECOND,
+        concurrency: int = API_MAX_CONCURRENT_REQUESTS,
+    ):
+        """Initialize limiter.
+
+        :param rate: how many requests per second are allowed
+        :param concurrency: how many requests may be in flight at the same time
+        """
+        self._rate = rate
+        self._capacity = max(1.0, rate)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._day = date.today()
+        self._calls_today = 0
+        self.calls_total = 0
+
+    @classmethod
+    def for_key(cls, api_key: str) -> RequestLimiter:
+        """Get limiter for API key."""
+        if (limiter := cls._limiters.get(api_key)) is None:
+            limiter = cls._limiters[api_key] = cls()
+        return limiter
+
+    async def _take_token(self):
+        """Wait until bucket has token and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    @property
+    def calls_today(self) -> int:
+        """Calls since local midnight."""
+        if (today := date.today()) != self._day:
+            self._day = today
+            self._calls_today = 0
+        return self._calls_today
+
+    def restore(self, day: date, calls_today: int, calls_total: int):
+        """Continue counting calls saved before restart.
+
+        :param day: local day of saved calls_today
+        """
+        if day == date.today():
+            self._calls_today = max(self.calls_today, calls_today)
+        self.calls_total = max(self.calls_total, calls_total)
+
+    def _count(self):
+        self._calls_today = self.calls_today + 1
+        self.calls_total += 1
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Wait for permission to do request."""
+        async with self._semaphore:
+            await self._take_token()
+            self._count()
+            yield
+
+
+class SingleFlight:
+    """Merge concurrent calls with the same key into one call."""
+
+    def __init__(self):
+        """Initialize."""
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[_T]]) -> _T:
+        """Call `func` or wait for result of already running call with same key."""
+        if (future := self._calls.get(key)) is None:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+        else:
+            _LOGGER.debug("Joining already running request")
+        # other callers should get result even if this one is cancelled
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+
+REFRESH_FLIGHTS = SingleFlight()
+"""Refresh requests in flight for all points."""
@@ -3,10 +3,11 @@
   "name": "Yandex Weather",
   "codeowners": ["@IATkachenko"],
   "config_flow": true,
+  "dependencies": ["http", "websocket_api"],
   "documentation": "https://github.com/IATkachenko/HA-YandexWeather/wiki",
   "iot_class": "cloud_polling",
   "issue_tracker": "https://github.com/IATkachenko/HA-YandexWeather/issues",
   "quality_scale": "silver",
-  "requirements": ["gql>=3.0.0"],
+  "requirements": ["gql>=3.0.0", "numpy"],
   "version": "%%%VERSION%%%"
 }
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""Geohash keyed cache of weather for arbitrary points."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+import time
+from typing import Generic, TypeVar
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {c: i for i, c in enumerate(_BASE32)}
+
+T = TypeVar("T")
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int) -> str:
+    """Get geohash cell of point.
+
+    :param precision: number of geohash characters, 5 is about 5x5 km cell
+    """
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    result = []
+    bits = 0
+    value = 0
+    even = True
+    while len(result) < precision:
+        rng, point = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if point >= middle:
+            value |= 1
+            rng[0] = middle
+        else:
+            rng[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            result.append(_BASE32[value])
+            bits = value = 0
+    return "".join(result)
+
+
+def geohash_center(geohash: str) -> tuple[float, float]:
+    """Get latitude and longitude of geohash cell center."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for c in geohash:
+        value = _DECODE[c]
+        for bit in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            middle = (rng[0] + rng[1]) / 2
+            rng[0 if value >> bit & 1 else 1] = middle
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+class PointCache(Generic[T]):
+    """LRU cache with TTL and size limit."""
+
+    def __init__(self, ttl: float, max_size: int):
+        """Initialize cache.
+
+        :param ttl: seconds while value is served from cache
+        :param max_size: least recently used values are evicted over this size
+        """
+        self._ttl = ttl
+        self._max_size = max_size
+        self._values: OrderedDict[str, tuple[float, T]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> T | None:
+        """Get not expired value."""
+        if (item := self._values.get(key)) is None:
+            return None
+        expires, value = item
+        if expires <= time.monotonic():
+            del self._values[key]
+            return None
+        self._values.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: T):
+        """Put value to cache."""
+        self._values[key] = (time.monotonic() + self._ttl, value)
+        self._values.move_to_end(key)
+        while len(self._values) > self._max_size:
+            self._values.popitem(last=False)
+
+    async def async_get_or_fetch(
+        self, key: str, fetch: Callable[[], Awaitable[T]]
+    ) -> tuple[T, bool]:
+        """Get value from cache or fetch it on miss.
+
+        :returns: value and whether it was served from cache
+        """
+        if (value := self.get(key)) is not None:
+            self.hits += 1
+            return value, True
+        self.misses += 1
+        value = await fetch()
+        self.put(key, value)
+        return value, False
+
+    def __len__(self) -> int:
+        return len(self._values)
@@ -0,0 +1,175 @@
+"""Fair sharing of daily API budget between entries."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import ClassVar
+
+from .const import API_LIMIT_PER_DAY, QUOTA_RETRY_UPDATES_PER_DAY
+from .keys import ApiKeyPool
+from .limiter import RequestLimiter
+
+_LOGGER = logging.getLogger(__name__)
+
+DAY = 86400
+
+STATUS_ACTIVE = "active"
+STATUS_PAUSED = "paused"
+"""Nobody listens for updates, so entry needs no budget."""
+STATUS_FAILING = "failing"
+"""Last refresh failed, entry gets budget for retries only."""
+
+
+@dataclass(slots=True)
+class QuotaShare:
+    """Claim of entry for budget."""
+
+    weight: float
+    priority: int
+    demand: float
+    """Updates per day entry wants at most."""
+    status: Callable[[], str]
+
+
+def allocate(
+    budget: float, shares: dict[str, tuple[float, int, float]]
+) -> dict[str, float]:
+    """Split budget by priority levels and weights.
+
+    Higher priority levels are served first. Inside a level budget is split by
+    weight, entries that need less than their part are capped and the rest is
+    split between others again. Budget left after all demands is not used.
+
+    :param budget: updates per day
+    :param shares: weight, priority and demand by entry
+    :returns: updates per day by entry
+    """
+    result = {k: 0.0 for k in shares}
+    left = float(budget)
+    for priority in sorted({p for _, p, _ in shares.values()}, reverse=True):
+        level = {k for k, (w, p, d) in shares.items() if p == priority and d > 0}
+        while level and left > 0:
+            total = sum(shares[k][0] for k in level)
+            capped = {
+                k
+                for k in level
+                if left * shares[k][0] / total >= shares[k][2] - result[k]
+            }
+            if not capped:
+                for k in level:
+                    result[k] += left * shares[k][0] / total
+                left = 0
+                break
+            for k in capped:
+                left -= shares[k][2] - result[k]
+                result[k] = shares[k][2]
+            level -= capped
+    return result
+
+
+def _seconds_to_midnight(now: float) -> float:
+    tomorrow = datetime.fromtimestamp(now).date() + timedelta(days=1)
+    return datetime.combine(tomorrow, datetime.min.time()).timestamp() - now
+
+
+class QuotaScheduler:
+    """Weighted fair share of daily budget of one key or key pool.
+
+    Use `for_key` or `for_pool` to get scheduler shared by entries.
+    """
+
+    _schedulers: ClassVar[dict[str, QuotaScheduler]] = {}
+
+    def __init__(self, budget: Callable[[], int], used_today: Callable[[], int]):
+        """Initialize scheduler.
+
+        :param budget: how many requests are allowed per day
+        :param used_today: how many requests were done since local midnight
+        """
+        self._budget = budget
+        self._used_today = used_today
+        self._shares: dict[str, QuotaShare] = {}
+
+    @classmethod
+    def for_key(cls, api_key: str) -> QuotaScheduler:
+        """Get scheduler for API key."""
+        if (scheduler := cls._schedulers.get(api_key)) is None:
+            scheduler = cls._schedulers[api_key] = cls(
+                lambda: API_LIMIT_PER_DAY,
+                lambda: RequestLimiter.for_key(api_key).calls_today,
+            )
+        return scheduler
+
+    @classmethod
+    def for_pool(cls, pool: ApiKeyPool) -> QuotaScheduler:
+        """Get scheduler for key pool."""
+        key = f"pool-{id(pool)}"
+        if (scheduler := cls._schedulers.get(key)) is None:
+            scheduler = cls._schedulers[key] = cls(pool.daily_budget, pool.calls_today)
+        return scheduler
+
+    def register(self, entry_id: str, share: QuotaShare):
+        """Add entry to scheduler."""
+        self._shares[entry_id] = share
+
+    def unregister(self, entry_id: str):
+        """Remove unloaded entry, its budget goes to others."""
+        self._shares.pop(entry_id, None)
+
+    def _demand(self, share: QuotaShare) -> float:
+        status = share.status()
+        if status == STATUS_PAUSED:
+            return 0
+        if status == STATUS_FAILING:
+            return min(share.demand, QUOTA_RETRY_UPDATES_PER_DAY)
+        return share.demand
+
+    def allocation(self) -> dict[str, float]:
+        """Updates per day by entry."""
+        return allocate(
+            self._budget(),
+            {
+                k: (s.weight, s.priority, self._demand(s))
+                for k, s in self._shares.items()
+            },
+        )
+
+    def interval(self, entry_id: str, now: float | None = None) -> timedelta:
+        """Time to next refresh of entry.
+
+        Allocated rate is never exceeded. If part of budget was already used
+        today, requests left are split by allocation over the rest of the day.
+        """
+        now = time.time() if now is None else now
+        allocation = self.allocation()
+        rate = allocation.get(entry_id, 0)
+        to_midnight = _seconds_to_midnight(now)
+        if rate <= 0:
+            return timedelta(seconds=max(to_midnight, 60))
+        left = max(0, self._budget() - self._used_today())
+        left_for_entry = left * rate / sum(allocation.values())
+        seconds = DAY / rate
+        if left_for_entry < 1:
+            seconds = max(seconds, to_midnight)
+        else:
+            seconds = max(seconds, to_midnight / left_for_entry)
+        return timedelta(seconds=seconds)
+
+    def describe(self, entry_id: str) -> dict:
+        """Allocation of entry for attributes and diagnostics."""
+        if (share := self._shares.get(entry_id)) is None:
+            return {}
+        return {
+            "weight": share.weight,
+            "priority": share.priority,
+            "demand": share.demand,
+            "status": share.status(),
+            "allocation": round(self.allocation().get(entry_id, 0), 2),
+            "budget": self._budget(),
+            "used_today": self._used_today(),
+            "entries": len(self._shares),
+        }
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 
 from homeassistant.components.sensor import (
@@ -14,18 +14,26 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     DEGREE,
+    PERCENTAGE,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
+    UnitOfPrecipitationDepth,
     UnitOfSpeed,
     UnitOfTemperature,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    ATTR_ACCURACY_CONDITION_HIT_RATE,
+    ATTR_ACCURACY_TEMPERATURE_BIAS,
+    ATTR_ACCURACY_TEMPERATURE_MAE,
+    ATTR_ACCURACY_WIND_SPEED_MAE,
     ATTR_API_CONDITION,
     ATTR_API_FEELS_LIKE_TEMPERATURE,
     ATTR_API_TEMPERATURE,
@@ -33,13 +41,36 @@ from .const import (
     ATTR_API_WIND_BEARING,
     ATTR_API_WIND_SPEED,
     ATTR_API_YA_CONDITION,
+    ATTR_AREA_CONDITION,
+    ATTR_AREA_POINTS,
+    ATTR_AREA_TEMPERATURE_MAX,
+    ATTR_AREA_TEMPERATURE_MIN,
+    ATTR_AREA_WIND_SPEED_MAX,
+    ATTR_CONDITION_SINCE,
+    ATTR_CONDITION_TRANSITIONS,
+    ATTR_COOLING_DEGREE_DAYS,
+    ATTR_COOLING_DEGREE_DAYS_TODAY,
+    ATTR_COOLING_DEGREE_DAYS_TOMORROW,
+    ATTR_HEATING_DEGREE_DAYS,
+    ATTR_HEATING_DEGREE_DAYS_TODAY,
+    ATTR_HEATING_DEGREE_DAYS_TOMORROW,
     ATTR_MIN_FORECAST_TEMPERATURE,
     ATTRIBUTION,
+    CONDITION_TRANSITIONS_HOURS,
+    DEGREE_DAYS_UNIT,
     DOMAIN,
     ENTRY_NAME,
+    FORECAST_PRECIPITATION_TOTAL,
+    FORECAST_STATISTICS_WINDOWS,
+    FORECAST_TEMPERATURE_MAX,
+    FORECAST_TEMPERATURE_MEAN,
+    FORECAST_TEMPERATURE_MIN,
+    FORECAST_WIND_GUST_MAX,
     UPDATER,
+    forecast_statistic_key,
 )
-from .updater import WeatherUpdater
+from .interpolation import INTERPOLATED_ATTRIBUTES
+from .updater import AreaUpdater, WeatherUpdater
 
 WEATHER_SENSORS: tuple[SensorEntityDescription, ...] = (
     SensorEntityDescription(
@@ -132,6 +163,195 @@ WEATHER_SENSORS: tuple[SensorEntityDescription, ...] = (
     ),
 )
 
+FORECAST_STATISTICS_SENSORS: tuple[SensorEntityDescription, ...] = tuple(
+    SensorEntityDescription(
+        key=forecast_statistic_key(statistic, hours),
+        name=f"{name} {hours}h",
+        native_unit_of_measurement=unit,
+        device_class=device_class,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        icon=icon,
+    )
+    for hours in FORECAST_STATISTICS_WINDOWS
+    for statistic, name, unit, device_class, icon in [
+        (
+            FORECAST_TEMPERATURE_MIN,
+            "Forecast minimal temperature",
+            UnitOfTemperature.CELSIUS,
+            SensorDeviceClass.TEMPERATURE,
+            "mdi:thermometer-chevron-down",
+        ),
+        (
+            FORECAST_TEMPERATURE_MAX,
+            "Forecast maximal temperature",
+            UnitOfTemperature.CELSIUS,
+            SensorDeviceClass.TEMPERATURE,
+            "mdi:thermometer-chevron-up",
+        ),
+        (
+            FORECAST_TEMPERATURE_MEAN,
+            "Forecast mean temperature",
+            UnitOfTemperature.CELSIUS,
+            SensorDeviceClass.TEMPERATURE,
+            "mdi:thermometer",
+        ),
+        (
+            FORECAST_WIND_GUST_MAX,
+            "Forecast maximal wind gust",
+            UnitOfSpeed.METERS_PER_SECOND,
+            SensorDeviceClass.WIND_SPEED,
+            "mdi:weather-windy",
+        ),
+        (
+            FORECAST_PRECIPITATION_TOTAL,
+            "Forecast precipitation",
+            UnitOfPrecipitationDepth.MILLIMETERS,
+            SensorDeviceClass.PRECIPITATION,
+            "mdi:weather-pouring",
+        ),
+    ]
+)
+"""Statistics over hourly forecast for next hours."""
+
+ACCURACY_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key=ATTR_ACCURACY_TEMPERATURE_MAE,
+        name="Forecast temperature mean absolute error",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:thermometer-alert",
+    ),
+    SensorEntityDescription(
+        key=ATTR_ACCURACY_TEMPERATURE_BIAS,
+        name="Forecast temperature bias",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:thermometer-alert",
+    ),
+    SensorEntityDescription(
+        key=ATTR_ACCURACY_CONDITION_HIT_RATE,
+        name="Forecast condition hit rate",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:bullseye-arrow",
+    ),
+    SensorEntityDescription(
+        key=ATTR_ACCURACY_WIND_SPEED_MAE,
+        name="Forecast wind speed mean absolute error",
+        native_unit_of_measurement=UnitOfSpeed.METERS_PER_SECOND,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:weather-windy",
+    ),
+)
+"""Forecast accuracy, available with forecast archive only."""
+
+AREA_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key=ATTR_AREA_CONDITION,
+        name="Worst condition",
+        translation_key=ATTR_API_CONDITION,
+    ),
+    SensorEntityDescription(
+        key=ATTR_AREA_TEMPERATURE_MIN,
+        name="Minimal temperature",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:thermometer-chevron-down",
+    ),
+    SensorEntityDescription(
+        key=ATTR_AREA_TEMPERATURE_MAX,
+        name="Maximal temperature",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:thermometer-chevron-up",
+    ),
+    SensorEntityDescription(
+        key=ATTR_AREA_WIND_SPEED_MAX,
+        name="Maximal wind speed",
+        native_unit_of_measurement=UnitOfSpeed.METERS_PER_SECOND,
+        device_class=SensorDeviceClass.WIND_SPEED,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:weather-windy",
+    ),
+    SensorEntityDescription(
+        key=ATTR_AREA_POINTS,
+        name="Grid points",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:grid",
+    ),
+)
+"""Aggregated weather over area entry points."""
+
+DEGREE_DAYS_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key=ATTR_HEATING_DEGREE_DAYS,
+        name="Heating degree days",
+        native_unit_of_measurement=DEGREE_DAYS_UNIT,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:radiator",
+    ),
+    SensorEntityDescription(
+        key=ATTR_COOLING_DEGREE_DAYS,
+        name="Cooling degree days",
+        native_unit_of_measurement=DEGREE_DAYS_UNIT,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:snowflake-thermometer",
+    ),
+    SensorEntityDescription(
+        key=ATTR_HEATING_DEGREE_DAYS_TODAY,
+        name="Heating degree days today",
+        native_unit_of_measurement=DEGREE_DAYS_UNIT,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:radiator",
+    ),
+    SensorEntityDescription(
+        key=ATTR_COOLING_DEGREE_DAYS_TODAY,
+        name="Cooling degree days today",
+        native_unit_of_measurement=DEGREE_DAYS_UNIT,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:snowflake-thermometer",
+    ),
+    SensorEntityDescription(
+        key=ATTR_HEATING_DEGREE_DAYS_TOMORROW,
+        name="Heating degree days tomorrow",
+        native_unit_of_measurement=DEGREE_DAYS_UNIT,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:radiator",
+    ),
+    SensorEntityDescription(
+        key=ATTR_COOLING_DEGREE_DAYS_TOMORROW,
+        name="Cooling degree days tomorrow",
+        native_unit_of_measurement=DEGREE_DAYS_UNIT,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:snowflake-thermometer",
+    ),
+)
+"""Degree-days accumulated from observed temperature, and estimates of
+today (observed part and forecast) and tomorrow (forecast)."""
+
+CONDITION_HISTORY_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key=ATTR_CONDITION_SINCE,
+        name="Current condition since",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        icon="mdi:timer-outline",
+    ),
+    SensorEntityDescription(
+        key=ATTR_CONDITION_TRANSITIONS,
+        name=f"Condition transitions {CONDITION_TRANSITIONS_HOURS}h",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:swap-horizontal",
+    ),
+)
+"""Sensors answered from condition history, without recorder queries."""
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -145,15 +365,37 @@ async def async_setup_entry(
     name = domain_data[ENTRY_NAME]
     updater = domain_data[UPDATER]
 
-    entities: list[YandexWeatherSensor] = [
+    if isinstance(updater, AreaUpdater):
+        descriptions = [
+            *AREA_SENSORS,
+            *(d for d in WEATHER_SENSORS if d.key == ATTR_API_WEATHER_TIME),
+        ]
+    else:
+        descriptions = [*WEATHER_SENSORS, *FORECAST_STATISTICS_SENSORS]
+    if updater.archive is not None:
+        descriptions.extend(ACCURACY_SENSORS)
+    if updater.degree_days is not None:
+        descriptions.extend(DEGREE_DAYS_SENSORS)
+
+    entities: list[SensorEntity] = [
         YandexWeatherSensor(
             name,
             f"{config_entry.unique_id}-{description.key}",
             description,
             updater,
         )
-        for description in WEATHER_SENSORS
+        for description in descriptions
     ]
+    if updater.condition_history is not None:
+        entities.extend(
+            ConditionHistorySensor(
+                name,
+                f"{config_entry.unique_id}-{description.key}",
+                description,
+                updater,
+            )
+            for description in CONDITION_HISTORY_SENSORS
+        )
     async_add_entities(entities)
 
 
@@ -183,6 +425,14 @@ class YandexWeatherSensor(SensorEntity, CoordinatorEntity, RestoreEntity):
         """When entity is added to hass."""
         await RestoreEntity.async_added_to_hass(self)
         await CoordinatorEntity.async_added_to_hass(self)
+        if self.entity_description.key in INTERPOLATED_ATTRIBUTES:
+            self.async_on_remove(
+                async_dispatcher_connect(
+                    self.hass,
+                    self.coordinator.interpolation_signal,
+                    self._handle_interpolation,
+                )
+            )
 
         state = await self.async_get_last_state()
         if not state:
@@ -206,5 +456,85 @@ class YandexWeatherSensor(SensorEntity, CoordinatorEntity, RestoreEntity):
         )
         if self.entity_description.key == ATTR_API_YA_CONDITION:
             self._attr_icon = self.coordinator.data.get(f"{ATTR_API_YA_CONDITION}_icon")
+        if self.entity_description.key == ATTR_API_WEATHER_TIME:
+            self._attr_extra_state_attributes = {
+                **self.coordinator.schedule,
+                **self.coordinator.performance,
+            }
+            if self.coordinator.key_pool is not None:
+                self._attr_extra_state_attributes[
+                    "key_usage"
+                ] = self.coordinator.key_pool.usage()
+
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_interpolation(self) -> None:
+        """Write interpolated value if it changed more than resolution."""
+        resolution = self.coordinator.interpolation_resolution
+        value = self.coordinator.interpolated.get(self.entity_description.key)
+        if resolution is None or value is None:
+            return
+        try:
+            current = float(self._attr_native_value)
+        except (TypeError, ValueError):
+            current = None
+        if current is not None and abs(value - current) < resolution:
+            return
+        self._attr_available = True
+        self._attr_native_value = round(value, 2)
+        self.async_write_ha_state()
 
+
+class ConditionHistorySensor(SensorEntity, CoordinatorEntity):
+    """Sensor answered from condition history of device."""
+
+    _attr_attribution = ATTRIBUTION
+    coordinator: WeatherUpdater
+
+    def __init__(
+        self,
+        name: str,
+        unique_id: str,
+        description: SensorEntityDescription,
+        updater: WeatherUpdater,
+    ) -> None:
+        """Initialize sensor."""
+        CoordinatorEntity.__init__(self, coordinator=updater)
+        self.entity_description = description
+
+        self._attr_name = f"{name} {description.name}"
+        self._attr_unique_id = unique_id
+        self._attr_device_info = self.coordinator.device_info
+
+    @property
+    def available(self) -> bool:
+        """History is restored, so it is available before first refresh."""
+        return True
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self.coordinator.condition_history_signal,
+                self._handle_coordinator_update,
+            )
+        )
+        self._update_value()
+
+    def _update_value(self) -> None:
+        history = self.coordinator.condition_history
+        if self.entity_description.key == ATTR_CONDITION_SINCE:
+            self._attr_native_value = history.current_since
+            self._attr_extra_state_attributes = {"condition": history.current}
+        else:
+            self._attr_native_value = history.transitions_since(
+                dt_util.utcnow() - timedelta(hours=CONDITION_TRANSITIONS_HOURS)
+            )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_value()
         self.async_write_ha_state()
@@ -0,0 +1,345 @@
+"""Yandex.Weather services."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+import logging
+
+from aiohttp import ClientError
+from gql.transport.exceptions import TransportError
+from homeassistant.components.weather import ATTR_FORECAST_TIME, Forecast
+from homeassistant.const import (
+    ATTR_DEVICE_ID,
+    ATTR_LATITUDE,
+    ATTR_LONGITUDE,
+    CONF_API_KEY,
+)
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+import voluptuous as vol
+
+from .const import (
+    ATTR_API_CONDITION,
+    ATTR_API_FEELS_LIKE_TEMPERATURE,
+    ATTR_API_HUMIDITY,
+    ATTR_API_PRESSURE,
+    ATTR_API_TEMPERATURE,
+    ATTR_API_WEATHER_TIME,
+    ATTR_API_WIND_BEARING,
+    ATTR_API_WIND_SPEED,
+    ATTR_END,
+    ATTR_ENTRY_ID,
+    ATTR_FIELDS,
+    ATTR_FORECAST_HOURLY,
+    ATTR_FORECAST_TYPE,
+    ATTR_HOURS,
+    ATTR_PRECISION,
+    ATTR_START,
+    DEFAULT_GEOHASH_PRECISION,
+    DOMAIN,
+    ENTRY_OPTIONS,
+    FORECAST_TYPES,
+    POINT_CACHE_SIZE,
+    POINT_CACHE_TTL,
+    SERVICE_FORECAST_AT,
+    SERVICE_GET_ARCHIVE,
+    SERVICE_GET_CONDITION_HISTORY,
+    SERVICE_GET_FORECAST_ACCURACY,
+    SERVICE_GET_FORECASTS,
+    SERVICE_REFRESH,
+    UPDATER,
+)
+from .keys import NoApiKeyError
+from .point_cache import PointCache, geohash_center, geohash_encode
+from .snapshot import WeatherSnapshot
+from .updater import WeatherUpdater
+
+_LOGGER = logging.getLogger(__name__)
+
+TARGET_SCHEMA = {
+    vol.Optional(ATTR_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+}
+REFRESH_SCHEMA = vol.Schema(TARGET_SCHEMA)
+GET_FORECAST_ACCURACY_SCHEMA = vol.Schema(TARGET_SCHEMA)
+GET_ARCHIVE_SCHEMA = vol.Schema(
+    {
+        **TARGET_SCHEMA,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+    }
+)
+
+GET_FORECASTS_SCHEMA = vol.Schema(
+    {
+        **TARGET_SCHEMA,
+        vol.Optional(ATTR_FORECAST_TYPE, default="hourly"): vol.In(FORECAST_TYPES),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_FIELDS): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+FORECAST_AT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_LATITUDE): cv.latitude,
+        vol.Required(ATTR_LONGITUDE): cv.longitude,
+        vol.Optional(ATTR_PRECISION, default=DEFAULT_GEOHASH_PRECISION): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=9)
+        ),
+    }
+)
+GET_CONDITION_HISTORY_SCHEMA = vol.Schema(
+    {
+        **TARGET_SCHEMA,
+        vol.Optional(ATTR_HOURS): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+POINT_ATTRIBUTES = (
+    ATTR_API_CONDITION,
+    ATTR_API_TEMPERATURE,
+    ATTR_API_FEELS_LIKE_TEMPERATURE,
+    ATTR_API_HUMIDITY,
+    ATTR_API_PRESSURE,
+    ATTR_API_WIND_SPEED,
+    ATTR_API_WIND_BEARING,
+)
+"""Current weather attributes returned for arbitrary point."""
+
+
+def select_forecasts(
+    forecasts: Iterable[Forecast],
+    start: datetime | None = None,
+    end: datetime | None = None,
+    fields: list[str] | None = None,
+) -> list[dict]:
+    """Select forecasts for time range with requested fields only.
+
+    :param forecasts: cached forecasts sorted by time
+    :param start: skip forecasts before this time
+    :param end: stop at forecasts after this time
+    :param fields: forecast fields to return, time is always returned
+    """
+    keys = None if fields is None else [ATTR_FORECAST_TIME, *fields]
+    result = []
+    for f in forecasts:
+        if start is not None or end is not None:
+            time = datetime.fromisoformat(f[ATTR_FORECAST_TIME])
+            if start is not None and time < start:
+                continue
+            if end is not None and time > end:
+                break
+        result.append(dict(f) if keys is None else {k: f.get(k) for k in keys})
+    return result
+
+
+def get_updaters(hass: HomeAssistant, call: ServiceCall) -> dict[str, WeatherUpdater]:
+    """Get updaters for entries and devices from service call.
+
+    :returns: updaters by entry_id, all loaded updaters if no target was set
+    """
+    loaded: dict = hass.data.get(DOMAIN, {})
+    entry_ids: set[str] = set(call.data.get(ATTR_ENTRY_ID, []))
+
+    device_registry = dr.async_get(hass)
+    for device_id in call.data.get(ATTR_DEVICE_ID, []):
+        if (device := device_registry.async_get(device_id)) is not None:
+            entry_ids.update(device.config_entries)
+
+    if ATTR_ENTRY_ID not in call.data and ATTR_DEVICE_ID not in call.data:
+        entry_ids = set(loaded.keys())
+
+    return {
+        entry_id: loaded[entry_id][UPDATER]
+        for entry_id in entry_ids
+        if entry_id in loaded
+    }
+
+
+async def async_setup_services(hass: HomeAssistant):
+    """Register integration services."""
+
+    point_cache: PointCache[WeatherSnapshot] = PointCache(
+        POINT_CACHE_TTL.total_seconds(), POINT_CACHE_SIZE
+    )
+
+    async def async_refresh(call: ServiceCall):
+        """Request refresh for selected entries."""
+        updaters = get_updaters(hass, call)
+        _LOGGER.debug(f"Refresh requested for {list(updaters.keys())}")
+        await asyncio.gather(
+            *(updater.async_request_refresh() for updater in updaters.values())
+        )
+
+    async def async_get_archive(call: ServiceCall) -> ServiceResponse:
+        """Read archived forecasts and observations for time range."""
+        start = dt_util.as_utc(call.data[ATTR_START]).timestamp()
+        end = dt_util.as_utc(call.data.get(ATTR_END, dt_util.utcnow())).timestamp()
+        result = {}
+        for entry_id, updater in get_updaters(hass, call).items():
+            if updater.archive is None:
+                continue
+            result[entry_id] = await hass.async_add_executor_job(
+                updater.archive.read, start, end
+            )
+        return result
+
+    async def async_get_forecast_accuracy(call: ServiceCall) -> ServiceResponse:
+        """Get forecast accuracy by lead time."""
+        return {
+            entry_id: {
+                "verified_until": dt_util.utc_from_timestamp(
+                    updater.accuracy.verified_until
+                ).isoformat(),
+                "overall": updater.accuracy.summary(),
+                "by_lead": updater.accuracy.by_lead(),
+            }
+            for entry_id, updater in get_updaters(hass, call).items()
+            if updater.archive is not None
+        }
+
+    async def async_get_forecasts(call: ServiceCall) -> ServiceResponse:
+        """Get cached forecasts for selected entries without API requests."""
+        forecast_key = FORECAST_TYPES[call.data[ATTR_FORECAST_TYPE]]
+        start = call.data.get(ATTR_START)
+        end = call.data.get(ATTR_END)
+        fields = call.data.get(ATTR_FIELDS)
+        result = {}
+        for entry_id, updater in get_updaters(hass, call).items():
+            data = updater.data
+            if not data:
+                continue
+            result[entry_id] = {
+                "updated": data[ATTR_API_WEATHER_TIME].isoformat(),
+                "forecast": select_forecasts(
+                    data.get(forecast_key) or (),
+                    None if start is None else dt_util.as_utc(start),
+                    None if end is None else dt_util.as_utc(end),
+                    fields,
+                ),
+            }
+        return result
+
+    async def async_forecast_at(call: ServiceCall) -> ServiceResponse:
+        """Get weather for arbitrary point, cached by geohash cell."""
+        loaded: dict = hass.data.get(DOMAIN, {})
+        entry_ids = call.data.get(ATTR_ENTRY_ID) or list(loaded.keys())
+        entry_id = next((e for e in entry_ids if e in loaded), None)
+        if entry_id is None:
+            raise HomeAssistantError("No loaded entry to take API key from")
+        options = loaded[entry_id][ENTRY_OPTIONS]
+        entry_updater: WeatherUpdater = loaded[entry_id][UPDATER]
+
+        cell = geohash_encode(
+            call.data[ATTR_LATITUDE],
+            call.data[ATTR_LONGITUDE],
+            call.data[ATTR_PRECISION],
+        )
+        latitude, longitude = geohash_center(cell)
+
+        async def fetch() -> WeatherSnapshot:
+            # request goes through keys, limiter and quota of entry
+            weather = await entry_updater.request_point(latitude, longitude)
+            builder = WeatherUpdater(
+                latitude=latitude,
+                longitude=longitude,
+                api_key=options[CONF_API_KEY],
+                hass=None,
+                device_id=f"point_{cell}",
+                name=f"Point {cell}",
+            )
+            data, _ = await hass.async_add_executor_job(
+                builder.build, weather, dt_util.now(), {}
+            )
+            return WeatherSnapshot(data, 1)
+
+        try:
+            data, cached = await point_cache.async_get_or_fetch(
+                f"{options[CONF_API_KEY]}_{cell}", fetch
+            )
+        except (
+            TransportError,
+            ClientError,
+            asyncio.TimeoutError,
+            NoApiKeyError,
+        ) as e:
+            raise HomeAssistantError(f"Could not get weather for {cell}: {e}") from e
+        _LOGGER.debug(
+            f"Weather for {cell} {cached=}, "
+            f"{point_cache.hits=} {point_cache.misses=}"
+        )
+        return {
+            "geohash": cell,
+            ATTR_LATITUDE: latitude,
+            ATTR_LONGITUDE: longitude,
+            "cached": cached,
+            "updated": data[ATTR_API_WEATHER_TIME].isoformat(),
+            **{k: data.get(k) for k in POINT_ATTRIBUTES},
+            "forecast": select_forecasts(data.get(ATTR_FORECAST_HOURLY) or ()),
+        }
+
+    async def async_get_condition_history(call: ServiceCall) -> ServiceResponse:
+        """Get condition transitions from memory."""
+        since = None
+        if (hours := call.data.get(ATTR_HOURS)) is not None:
+            since = dt_util.utcnow() - timedelta(hours=hours)
+        result = {}
+        for entry_id, updater in get_updaters(hass, call).items():
+            if (history := updater.condition_history) is None:
+                continue
+            current_since = history.current_since
+            result[entry_id] = {
+                "condition": history.current,
+                "since": None if current_since is None else current_since.isoformat(),
+                "transitions": history.as_list(since),
+            }
+        return result
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, async_refresh, schema=REFRESH_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_FORECAST_ACCURACY,
+        async_get_forecast_accuracy,
+        schema=GET_FORECAST_ACCURACY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_ARCHIVE,
+        async_get_archive,
+        schema=GET_ARCHIVE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_FORECASTS,
+        async_get_forecasts,
+        schema=GET_FORECASTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FORECAST_AT,
+        async_forecast_at,
+        schema=FORECAST_AT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_CONDITION_HISTORY,
+        async_get_condition_history,
+        schema=GET_CONDITION_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
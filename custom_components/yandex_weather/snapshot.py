@@ -0,0 +1,41 @@
+"""Weather data snapshot."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+
+class WeatherSnapshot(Mapping[str, Any]):
+    """Read-only weather data published by updater.
+
+    One snapshot is shared by all entities of updater, so nobody should copy
+    or change it. Lists are published as tuples for the same reason.
+    """
+
+    __slots__ = ("_data", "version")
+
+    def __init__(self, data: dict[str, Any] | None = None, version: int = 0):
+        """Initialize snapshot.
+
+        :param data: weather data, snapshot takes ownership of it
+        :param version: increasing number of snapshot for the same updater
+        """
+        self._data = {} if data is None else data
+        self.version = version
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"WeatherSnapshot(version={self.version}, keys={list(self._data)})"
+
+    def json_ready(self) -> dict[str, Any]:
+        """Underlying data for serialization. Must not be changed."""
+        return self._data
@@ -0,0 +1,68 @@
+"""Day and night classification by cached sunrise and sunset table."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+from astral import Observer
+from astral.sun import elevation, noon, sunrise, sunset
+
+SOLAR_TABLE_DAYS = 4
+"""Days in table starting from day before requested one."""
+
+
+@dataclass(frozen=True, slots=True)
+class SolarTable:
+    """Sunrise and sunset times for location around some day."""
+
+    times: tuple[float, ...]
+    """Event timestamps, sorted."""
+    is_day: tuple[bool, ...]
+    """Is it day after event?"""
+
+    def is_day_at(self, moment: datetime) -> bool:
+        """Is it day at moment?"""
+        i = bisect_right(self.times, moment.timestamp())
+        if i == 0:
+            return not self.is_day[0] if self.is_day else True
+        return self.is_day[i - 1]
+
+
+def _events(observer: Observer, day: date) -> list[tuple[datetime, bool]]:
+    events = []
+    for event, is_day in ((sunrise, True), (sunset, False)):
+        try:
+            events.append((event(observer, day, tzinfo=timezone.utc), is_day))
+        except ValueError:
+            pass
+    if len(events) < 2:
+        # polar day or night: state of whole day is state at solar noon
+        midday = noon(observer, day, tzinfo=timezone.utc)
+        events = [(midday, elevation(observer, midday) > 0)]
+    return events
+
+
+@lru_cache(maxsize=16)
+def _solar_table(latitude: float, longitude: float, day: date) -> SolarTable:
+    observer = Observer(latitude, longitude)
+    events = sorted(
+        e
+        for d in range(-1, SOLAR_TABLE_DAYS - 1)
+        for e in _events(observer, day + timedelta(days=d))
+    )
+    return SolarTable(
+        tuple(t.timestamp() for t, _ in events), tuple(d for _, d in events)
+    )
+
+
+def solar_table(latitude: float, longitude: float, moment: datetime) -> SolarTable:
+    """Get table for location covering day of moment and next two days.
+
+    Table is calculated locally once per location and UTC day.
+    """
+    return _solar_table(
+        round(latitude, 2), round(longitude, 2), moment.astimezone(timezone.utc).date()
+    )
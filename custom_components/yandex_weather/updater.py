@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections import Counter, deque
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+import hashlib
 import json
 import logging
 import math
 import os
+import time
+from typing import Any, TypeVar
+import zlib
 
 from gql import Client, gql
 from gql.transport.aiohttp import AIOHTTPTransport
@@ -23,15 +30,23 @@ from homeassistant.components.weather import (
     ATTR_FORECAST_NATIVE_WIND_GUST_SPEED,
     ATTR_FORECAST_NATIVE_WIND_SPEED,
     ATTR_FORECAST_PRECIPITATION_PROBABILITY,
+    ATTR_FORECAST_TIME,
     ATTR_FORECAST_UV_INDEX,
     ATTR_FORECAST_WIND_BEARING,
     Forecast,
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .analytics import ForecastAccuracy
+from .archive import ForecastArchive
+from .area import aggregate, area_variables, build_area_query
+from .cache import CacheBackend, CacheError, cache_key
 from .const import (
     ATTR_API_CONDITION,
     ATTR_API_FEELS_LIKE_TEMPERATURE,
@@ -47,19 +62,44 @@ from .const import (
     ATTR_API_YA_CONDITION,
     ATTR_FORECAST_DAILY,
     ATTR_FORECAST_HOURLY,
+    ATTR_FORECAST_INDEX,
     ATTR_MIN_FORECAST_TEMPERATURE,
-    CONDITION_ICONS,
+    CACHE_LOCK_TTL,
+    CACHE_POLL_INTERVAL,
+    CONDITION_HA_STATE,
+    CONDITION_MDI_ICON,
     DOMAIN,
+    FORECAST_PRECIPITATION_TOTAL,
+    FORECAST_STATISTICS_WINDOWS,
+    FORECAST_TEMPERATURE_MAX,
+    FORECAST_TEMPERATURE_MEAN,
+    FORECAST_TEMPERATURE_MIN,
+    FORECAST_WIND_GUST_MAX,
+    INTERPOLATION_INTERVAL,
     MANUFACTURER,
     QUERY,
-    WEATHER_STATES_CONVERSION,
-    map_state,
+    RAW_RESPONSES_SIZE,
+    SCHEDULE_MODE_ALIGNED,
+    SCHEDULE_MODE_INTERVAL,
+    forecast_statistic_key,
 )
+from .degree_days import DegreeDays
+from .forecast_index import ForecastIndex
+from .history import ConditionHistory
+from .interpolation import INTERPOLATED_ATTRIBUTES, interpolate
+from .keys import ApiKeyPool, NoApiKeyError
+from .limiter import REFRESH_FLIGHTS, RequestLimiter
+from .quota import STATUS_ACTIVE, STATUS_FAILING, STATUS_PAUSED, QuotaScheduler
+from .snapshot import WeatherSnapshot
+from .solar import solar_table
 
 API_URL = "https://api.weather.yandex.ru/graphql/query"
 API_VERSION = "3"
 _LOGGER = logging.getLogger(__name__)
 
+T = TypeVar("T")
+ProcessedHour = tuple[datetime, Forecast, str]
+"""Forecast time, forecast and icon."""
 
 WIND_DIRECTION_MAPPING: dict[str, int | None] = {
     "CALM": 0,
@@ -84,7 +124,7 @@ CLOUDINESS_MAPPING: dict[str, int] = {
 """https://yandex.ru/dev/weather/doc/ru/concepts/spectaql#definition-Cloudiness"""
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AttributeMapper:
     """Attribute mapper."""
 
@@ -93,6 +133,8 @@ class AttributeMapper:
     mapping: dict | None = None
     default: str | float | None = None
     should_translate: bool = False
+    by_daytime: bool = False
+    """mapping is keyed by (value, is_day), see const.compile_mapping"""
 
     @property
     def dst(self) -> str:
@@ -102,7 +144,10 @@ class AttributeMapper:
 
 FORECAST_DATA_ATTRIBUTE_TRANSLATION: list[AttributeMapper] = [
     AttributeMapper(
-        src="condition", _dst=ATTR_FORECAST_CONDITION, mapping=WEATHER_STATES_CONVERSION
+        src="condition",
+        _dst=ATTR_FORECAST_CONDITION,
+        mapping=CONDITION_HA_STATE,
+        by_daytime=True,
     ),
     AttributeMapper(src="time", _dst="datetime"),
     AttributeMapper(src="humidity", _dst=ATTR_FORECAST_HUMIDITY),
@@ -126,10 +171,13 @@ CURRENT_WEATHER_ATTRIBUTE_TRANSLATION: list[AttributeMapper] = [
     AttributeMapper(ATTR_API_WIND_BEARING, mapping=WIND_DIRECTION_MAPPING),
     AttributeMapper(ATTR_API_CONDITION, ATTR_API_ORIGINAL_CONDITION),
     AttributeMapper(
-        ATTR_API_CONDITION, f"{ATTR_API_YA_CONDITION}_icon", CONDITION_ICONS
+        ATTR_API_CONDITION,
+        f"{ATTR_API_YA_CONDITION}_icon",
+        CONDITION_MDI_ICON,
+        by_daytime=True,
     ),
     AttributeMapper(ATTR_API_CONDITION, ATTR_API_YA_CONDITION, should_translate=True),
-    AttributeMapper(ATTR_API_CONDITION, mapping=WEATHER_STATES_CONVERSION),
+    AttributeMapper(ATTR_API_CONDITION, mapping=CONDITION_HA_STATE, by_daytime=True),
     AttributeMapper(ATTR_API_FEELS_LIKE_TEMPERATURE),
     AttributeMapper(ATTR_API_HUMIDITY),
     AttributeMapper(ATTR_API_IMAGE),
@@ -162,6 +210,13 @@ def translate_condition(value: str, _language: str) -> str:
     return value
 
 
+def _json_default(o):
+    """Serialize snapshot without copying it."""
+    if isinstance(o, WeatherSnapshot):
+        return o.json_ready()
+    return str(o)
+
+
 class WeatherUpdater(DataUpdateCoordinator):
     """Weather data updater for interaction with Yandex.Weather API."""
 
@@ -175,6 +230,16 @@ class WeatherUpdater(DataUpdateCoordinator):
         language: str = "EN",
         updates_per_day: int = 50,
         name="Yandex Weather",
+        schedule_mode: str = SCHEDULE_MODE_INTERVAL,
+        refresh_phase: int | None = None,
+        archive: ForecastArchive | None = None,
+        accuracy: ForecastAccuracy | None = None,
+        interpolation_resolution: float | None = None,
+        condition_history: ConditionHistory | None = None,
+        degree_days: DegreeDays | None = None,
+        cache: CacheBackend | None = None,
+        key_pool: ApiKeyPool | None = None,
+        quota: QuotaScheduler | None = None,
     ):
         """Initialize updater.
 
@@ -185,6 +250,19 @@ class WeatherUpdater(DataUpdateCoordinator):
         :param language: Language for yandex_condition
         :param updates_per_day: int: how many updates per day we should do?
         :param device_id: ID of integration Device in Home Assistant
+        :param schedule_mode: how refreshes are scheduled, see SCHEDULE_MODES
+        :param refresh_phase: minutes after the hour for aligned refreshes
+        :param archive: append every refresh to this archive
+        :param accuracy: verify archived forecasts with these accumulators
+        :param interpolation_resolution: interpolate current weather between
+            refreshes and update sensors when value changes by this step,
+            None disables interpolation
+        :param condition_history: record condition transitions to this history
+        :param degree_days: integrate observed temperature to these accumulators
+        :param cache: share API responses via this cache backend
+        :param key_pool: take API key from this pool instead of api_key
+        :param quota: take update interval from this scheduler, updates_per_day
+            is used as maximal demand then
         """
 
         self.__api_key = api_key
@@ -193,6 +271,25 @@ class WeatherUpdater(DataUpdateCoordinator):
         self._device_id = device_id
         self._name = name
         self._language = language
+        self._schedule_mode = schedule_mode
+        self._refresh_phase = refresh_phase
+        self._next_refresh: datetime | None = None
+        self._archive = archive
+        self._accuracy = accuracy if accuracy is not None else ForecastAccuracy()
+        self._condition_history = condition_history
+        self._degree_days = degree_days
+        self._cache = cache
+        self._key_pool = key_pool
+        self._quota = quota
+        self.interpolation_resolution = interpolation_resolution
+        self.interpolated: dict[str, float | None] = {}
+        self._performance: dict = {}
+        self._sections: dict[str, tuple[bytes, Any]] = {}
+        """Fingerprint and processed result by response section."""
+        self._reused: Counter[str] = Counter()
+        """How many times processing of section was skipped."""
+        self._responses: deque[tuple[datetime, dict]] = deque(maxlen=RAW_RESPONSES_SIZE)
+        """Last raw API responses for diagnostics, kept by reference."""
         # Site tariff have 50 free requests per day, but it may be changed
         self.update_interval = timedelta(
             seconds=math.ceil((24 * 60 * 60) / updates_per_day)
@@ -206,24 +303,31 @@ class WeatherUpdater(DataUpdateCoordinator):
                 update_interval=self.update_interval,
                 update_method=self.update,
             )
-        self.data = {}
+        self._version = 0
+        self.data: WeatherSnapshot = WeatherSnapshot()
 
     @staticmethod
-    async def process_data(dst: dict, src: dict, attributes: list[AttributeMapper]):
+    def process_data(
+        dst: dict,
+        src: dict,
+        attributes: list[AttributeMapper],
+        is_day: bool | None = None,
+    ):
         """Convert Yandex API weather state to HA friendly.
 
         :param dst: weather data for HomeAssistant
         :param src: weather data form Yandex
         :param attributes: how to translate src to dst
+        :param is_day: is it day for src, by default it is taken from src daytime
         """
 
+        if is_day is None:
+            is_day = src.get("daytime", "DAY") == "DAY"
         for attribute in attributes:
             value = src.get(attribute.src, attribute.default)
             if attribute.mapping is not None and value is not None:
-                value = map_state(
-                    src=value,
-                    mapping=attribute.mapping,
-                    is_day=(src.get("daytime", "DAY") == "DAY"),
+                value = attribute.mapping.get(
+                    (value, is_day) if attribute.by_daytime else value, value
                 )
             # if attribute.should_translate and value is not None:
             #     value = await translate_condition(
@@ -236,84 +340,469 @@ class WeatherUpdater(DataUpdateCoordinator):
     @staticmethod
     async def get_min_forecast_temperature(forecasts: list[dict]) -> float | None:
         """Get minimum temperature from forecast data."""
-        low_fc_temperatures: list[float] = []
+        return WeatherUpdater.min_forecast_temperature(forecasts)
 
-        for f in forecasts:
-            f_low_temperature: float = f.get(ATTR_FORECAST_NATIVE_TEMP, None)
-            if f_low_temperature is not None:
-                low_fc_temperatures.append(f_low_temperature)
+    @staticmethod
+    def min_forecast_temperature(forecasts: list[dict]) -> float | None:
+        """Get minimum temperature from forecast data."""
+        return min(
+            (
+                t
+                for f in forecasts
+                if (t := f.get(ATTR_FORECAST_NATIVE_TEMP, None)) is not None
+            ),
+            default=None,
+        )
 
-        return min(low_fc_temperatures) if len(low_fc_temperatures) > 0 else None
+    @staticmethod
+    def get_forecast_statistics(
+        now: datetime,
+        forecasts: list[Forecast],
+        windows: tuple[int, ...] = FORECAST_STATISTICS_WINDOWS,
+    ) -> dict[str, float | None]:
+        """Calculate forecast statistics for next hours in one pass.
+
+        :param now: hours are counted from this time
+        :param forecasts: hourly forecast sorted by time
+        :param windows: calculate statistics for this numbers of next hours
+        :returns: statistics by `forecast_statistic_key`
+        """
+        result: dict[str, float | None] = {}
+        t_min = t_max = gust = None
+        t_sum = 0.0
+        t_count = 0
+        prec = 0.0
+        windows = tuple(sorted(windows))
+        w = 0
+
+        def emit(hours: int):
+            for statistic, value in [
+                (FORECAST_TEMPERATURE_MIN, t_min),
+                (FORECAST_TEMPERATURE_MAX, t_max),
+                (
+                    FORECAST_TEMPERATURE_MEAN,
+                    round(t_sum / t_count, 1) if t_count else None,
+                ),
+                (FORECAST_WIND_GUST_MAX, gust),
+                (FORECAST_PRECIPITATION_TOTAL, round(prec, 2)),
+            ]:
+                result[forecast_statistic_key(statistic, hours)] = value
+
+        for f in forecasts:
+            hour = math.ceil(
+                (datetime.fromisoformat(f[ATTR_FORECAST_TIME]) - now).total_seconds()
+                / 3600
+            )
+            while w < len(windows) and hour > windows[w]:
+                emit(windows[w])
+                w += 1
+            if w == len(windows):
+                break
+
+            if (t := f.get(ATTR_FORECAST_NATIVE_TEMP)) is not None:
+                t_min = t if t_min is None else min(t_min, t)
+                t_max = t if t_max is None else max(t_max, t)
+                t_sum += t
+                t_count += 1
+            if (g := f.get(ATTR_FORECAST_NATIVE_WIND_GUST_SPEED)) is not None:
+                gust = g if gust is None else max(gust, g)
+            if (p := f.get(ATTR_FORECAST_NATIVE_PRECIPITATION)) is not None:
+                prec += p
+
+        for hours in windows[w:]:
+            emit(hours)
+
+        return result
 
     @property
     def geo(self) -> dict[str, float]:
         return {"lat": self._lat, "lon": self._lon}
 
+    @property
+    def query(self) -> str:
+        """GraphQL query for refresh."""
+        return QUERY
+
+    @property
+    def variables(self) -> dict[str, float]:
+        """Variables for GraphQL query."""
+        return self.geo
+
+    async def request(
+        self, query: str | None = None, variables: dict | None = None
+    ) -> dict:
+        """Request weather data from API.
+
+        :param query: GraphQL query, refresh query by default
+        :param variables: query variables, refresh variables by default
+        :returns: raw API response
+        """
+        if self._key_pool is not None:
+            return await self._key_pool.async_call(
+                lambda api_key: self.request_with_key(api_key, query, variables)
+            )
+        return await self.request_with_key(self.__api_key, query, variables)
+
+    async def request_with_key(
+        self, api_key: str, query: str | None = None, variables: dict | None = None
+    ) -> dict:
+        """Request weather data from API with key.
+
+        :returns: raw API response
+        """
+        async with RequestLimiter.for_key(api_key).acquire():
+            transport = AIOHTTPTransport(
+                url=API_URL,
+                headers={"X-Yandex-Weather-Key": api_key},
+                timeout=20,
+            )
+            async with Client(
+                transport=transport, fetch_schema_from_transport=False
+            ) as client:
+                return await client.execute(
+                    gql(self.query if query is None else query),
+                    variable_values=self.variables if variables is None else variables,
+                )
+
+    async def request_point(self, latitude: float, longitude: float) -> dict:
+        """Request weather for another point with keys and limits of updater.
+
+        Requests are counted by the same limiter and key pool, so quota
+        scheduler sees them as used budget.
+
+        :returns: weatherByPoint part of API response
+        """
+        r = await self.request(QUERY, {"lat": latitude, "lon": longitude})
+        return r.get("weatherByPoint", {})
+
+    async def fetch(self) -> dict:
+        """Get API response from cache or request it.
+
+        Only one updater sharing cache backend requests API for the same query
+        while response is fresh, others wait for its response.
+
+        :returns: raw API response
+        """
+        if self._cache is None:
+            return await self.request()
+
+        key = cache_key(self.query, json.dumps(self.variables, sort_keys=True))
+        ttl = self.update_interval.total_seconds()
+        try:
+            if (cached := await self._cache.async_get(key)) is not None:
+                _LOGGER.debug(f"{self} response was taken from cache")
+                return json.loads(cached)
+            deadline = time.monotonic() + CACHE_LOCK_TTL
+            while (token := await self._cache.async_lock(key, CACHE_LOCK_TTL)) is None:
+                if time.monotonic() > deadline:
+                    raise CacheError("Timeout while waiting for another fetch")
+                await asyncio.sleep(CACHE_POLL_INTERVAL)
+                if (cached := await self._cache.async_get(key)) is not None:
+                    _LOGGER.debug(f"{self} response was fetched by another updater")
+                    return json.loads(cached)
+        except CacheError as e:
+            _LOGGER.warning(f"Could not use response cache: {e}")
+            return await self.request()
+
+        try:
+            r = await self.request()
+            await self._cache.async_set(key, json.dumps(r).encode(), ttl)
+        except CacheError as e:
+            _LOGGER.warning(f"Could not save response to cache: {e}")
+        finally:
+            try:
+                await self._cache.async_unlock(key, token)
+            except CacheError as e:
+                _LOGGER.debug(f"Could not unlock response cache: {e}")
+        return r
+
     async def update(self):
         """Update weather information.
 
-        :returns: dict with weather data.
+        :returns: weather data snapshot.
         """
 
-        transport = AIOHTTPTransport(
-            url=API_URL, headers={"X-Yandex-Weather-Key": self.__api_key}, timeout=20
-        )
-        async with Client(
-            transport=transport, fetch_schema_from_transport=False
-        ) as client:
-            r = await client.execute(gql(QUERY), variable_values=self.geo)
+        try:
+            r = await REFRESH_FLIGHTS.do(
+                (self.__api_key, self._lat, self._lon), self.fetch
+            )
+        except NoApiKeyError as e:
+            raise UpdateFailed(str(e)) from e
+        started = time.perf_counter()
+        if _LOGGER.isEnabledFor(logging.DEBUG):
             _LOGGER.debug(f"Raw data is {r=}")
-            now = datetime.now().astimezone()
-            weather = r.get("weatherByPoint", {})
-            result = {
-                ATTR_API_WEATHER_TIME: now,
-                ATTR_API_FORECAST_ICONS: [],
-                ATTR_FORECAST_HOURLY: [],
-                ATTR_FORECAST_DAILY: [],
-            }
-            await self.process_data(
-                result, weather.get("now", {}), CURRENT_WEATHER_ATTRIBUTE_TRANSLATION
+        now = dt_util.now()
+        self._responses.append((now, r))
+        weather = r.get("weatherByPoint", {})
+        hours = sum(
+            len(d.get("hours", ())) for d in weather.get("forecast", {}).get("days", ())
+        )
+
+        if self._degree_days is not None:
+            self._degree_days.observe(
+                weather.get("now", {}).get(ATTR_API_TEMPERATURE), now
+            )
+
+        # build works on its own copy, section cache is replaced on the loop
+        sections = dict(self._sections)
+        loop_blocking = time.perf_counter() - started
+        result, reused = await self.hass.async_add_executor_job(
+            self.build, weather, now, sections
+        )
+        resumed = time.perf_counter()
+        build_seconds = resumed - started - loop_blocking
+        self._sections = sections
+        self._reused.update(reused)
+
+        if self._archive is not None:
+            loop_blocking += time.perf_counter() - resumed
+            archived = await self.async_archive(result)
+            resumed = time.perf_counter()
+            if archived:
+                result.update(self._accuracy.summary())
+
+        self._version += 1
+        snapshot = WeatherSnapshot(result, self._version)
+        loop_blocking += time.perf_counter() - resumed
+        self._performance = {
+            "forecast_hours": hours,
+            "build_seconds": round(build_seconds, 6),
+            "loop_blocking_seconds": round(loop_blocking, 6),
+        }
+        _LOGGER.debug(f"Snapshot was built: {self._performance}")
+        return snapshot
+
+    def build(
+        self, weather: dict, now: datetime, sections: dict[str, tuple[bytes, Any]]
+    ) -> tuple[dict, Counter[str]]:
+        """Build weather data from API response.
+
+        Only CPU work is done here, so it is called in executor. Updater state
+        is not changed, so it is safe to read it on the loop meanwhile.
+
+        :param weather: weatherByPoint part of API response
+        :param now: refresh time
+        :param sections: fingerprint and processed result by response section
+            from previous build, updated in place
+        :returns: weather data and how many times sections were reused
+        """
+        reused: Counter[str] = Counter()
+        result = {
+            ATTR_API_WEATHER_TIME: now,
+            ATTR_API_FORECAST_ICONS: [],
+            ATTR_FORECAST_HOURLY: [],
+            ATTR_FORECAST_DAILY: [],
+        }
+        current = weather.get("now", {})
+        result.update(
+            self._reuse(
+                sections, reused, "now", current, lambda: self.process_now(current)
             )
+        )
 
-            await self.fill_hourly_forecast(now, result, weather["forecast"]["days"])
+        days = weather["forecast"]["days"]
+        hours = self._reuse(
+            sections, reused, "forecast", days, lambda: self.process_hours(days)
+        )
+        # window depends on refresh time, so it is selected every time
+        self.fill_hourly_forecast(now, result, hours)
 
-            result[
-                ATTR_MIN_FORECAST_TEMPERATURE
-            ] = await self.get_min_forecast_temperature(result[ATTR_FORECAST_HOURLY])
+        result[ATTR_MIN_FORECAST_TEMPERATURE] = self.min_forecast_temperature(
+            result[ATTR_FORECAST_HOURLY]
+        )
+        result.update(self.get_forecast_statistics(now, result[ATTR_FORECAST_HOURLY]))
+        result[ATTR_FORECAST_INDEX] = ForecastIndex.build(
+            now, result[ATTR_FORECAST_HOURLY]
+        )
+        if self._degree_days is not None:
+            result.update(
+                self._degree_days.estimate(
+                    now,
+                    [
+                        (t.timestamp(), f[ATTR_FORECAST_NATIVE_TEMP])
+                        for t, f, _ in hours
+                        if f.get(ATTR_FORECAST_NATIVE_TEMP) is not None
+                    ],
+                )
+            )
+        for key in [ATTR_API_FORECAST_ICONS, ATTR_FORECAST_HOURLY, ATTR_FORECAST_DAILY]:
+            result[key] = tuple(result[key])
+        return result, reused
 
-            return result
+    async def async_archive(self, data: dict) -> bool:
+        """Append weather data to archive and verify archived forecasts.
 
-    async def fill_hourly_forecast(
-        self, now: datetime, weather_data, forecast_data: list[dict]
-    ):
+        :returns: whether archive could be used
         """
-        Fill weather_data ATTR_FORECAST_HOURLY and ATTR_API_FORECAST_ICONS fields
+        try:
+            await self.hass.async_add_executor_job(self._append_to_archive, data)
+            verified = await self.hass.async_add_executor_job(
+                self._accuracy.update, self._archive, time.time()
+            )
+        except OSError as e:
+            _LOGGER.warning(f"Could not use forecast archive: {e}")
+            return False
+        _LOGGER.debug(f"{verified} forecasts were verified")
+        if verified:
+            self._accuracy.schedule_save()
+        return True
+
+    @property
+    def condition_history(self) -> ConditionHistory | None:
+        """Condition transitions history."""
+        return self._condition_history
+
+    @property
+    def degree_days(self) -> DegreeDays | None:
+        """Heating and cooling degree-day accumulators."""
+        return self._degree_days
+
+    @property
+    def condition_history_signal(self) -> str:
+        """Dispatcher signal for new condition transition."""
+        return f"{DOMAIN}_condition_history_{self.device_id}"
+
+    @property
+    def interpolation_signal(self) -> str:
+        """Dispatcher signal for new interpolated values."""
+        return f"{DOMAIN}_interpolated_{self.device_id}"
+
+    @callback
+    def async_start_interpolation(self):
+        """Start local timer for interpolation, if it is enabled.
+
+        :returns: function to stop timer
+        """
+        if self.interpolation_resolution is None:
+            return lambda: None
+        return async_track_time_interval(
+            self.hass, self._async_interpolate, INTERPOLATION_INTERVAL
+        )
+
+    @callback
+    def _async_interpolate(self, now: datetime):
+        """Interpolate current weather from cached data, no API call is made."""
+        if not self.data:
+            return
+        self.interpolated = {
+            key: interpolate(self.data, key, now) for key in INTERPOLATED_ATTRIBUTES
+        }
+        async_dispatcher_send(self.hass, self.interpolation_signal)
+
+    def _append_to_archive(self, data: dict):
+        self._archive.append(ForecastArchive.records(data))
+
+    @property
+    def performance(self) -> dict:
+        """Timings of last snapshot build and skipped work counters."""
+        return {
+            **self._performance,
+            "refreshes": self._version,
+            "reused_sections": dict(self._reused),
+        }
+
+    @property
+    def raw_responses(self) -> list[tuple[datetime, dict]]:
+        """Last raw API responses with receive time, oldest first."""
+        return list(self._responses)
+
+    @property
+    def key_pool(self) -> ApiKeyPool | None:
+        """Pool of API keys, if entry uses it."""
+        return self._key_pool
+
+    @property
+    def limiter(self) -> RequestLimiter:
+        """Requests limiter of API key."""
+        return RequestLimiter.for_key(self.__api_key)
+
+    @property
+    def accuracy(self) -> ForecastAccuracy:
+        """Forecast accuracy by archived data."""
+        return self._accuracy
+
+    @property
+    def archive(self) -> ForecastArchive | None:
+        """Forecast archive."""
+        return self._archive
+
+    @staticmethod
+    def _reuse(
+        sections: dict[str, tuple[bytes, Any]],
+        reused: Counter[str],
+        section: str,
+        src,
+        process: Callable[[], T],
+    ) -> T:
+        """Process section of response or reuse result for the same content.
+
+        :param sections: fingerprint and processed result by section
+        :param reused: count of reused sections
+        :param section: name of response section
+        :param src: section of response
+        :param process: how to process section
+        """
+        fingerprint = hashlib.blake2b(
+            json.dumps(src, sort_keys=True, default=str).encode(), digest_size=16
+        ).digest()
+        cached = sections.get(section)
+        if cached is not None and cached[0] == fingerprint:
+            reused[section] += 1
+            return cached[1]
+        value = process()
+        sections[section] = (fingerprint, value)
+        return value
+
+    @staticmethod
+    def process_now(src: dict) -> dict:
+        """Convert Yandex current weather to HA friendly."""
+        result = {}
+        WeatherUpdater.process_data(result, src, CURRENT_WEATHER_ATTRIBUTE_TRANSLATION)
+        return result
+
+    def process_hours(self, forecast_data: list[dict]) -> list[ProcessedHour]:
+        """Convert all hours of Yandex forecast days to HA friendly.
 
-        :param now: current datetime
-        :param weather_data: this integration weather result
         :param forecast_data: Yandex forecast days data
+        :returns: processed hours sorted by time
         """
+        result = []
+        solar = None
         for d in forecast_data:
             for f in d["hours"]:
-                if len(weather_data[ATTR_FORECAST_HOURLY]) > 24:
-                    return
-
                 f_time = datetime.fromisoformat(f["time"])
-                if f_time > now:
-                    forecast = Forecast(datetime=datetime.isoformat(f_time))
-                    await self.process_data(
-                        forecast, f, FORECAST_DATA_ATTRIBUTE_TRANSLATION
-                    )
-                    weather_data[ATTR_FORECAST_HOURLY].append(forecast)
-                    weather_data[ATTR_API_FORECAST_ICONS].append(
-                        f.get("icon", "no_image")
-                    )
+                # forecast hours have no daytime
+                if solar is None:
+                    solar = solar_table(self._lat, self._lon, f_time)
+                forecast = Forecast(datetime=datetime.isoformat(f_time))
+                self.process_data(
+                    forecast,
+                    f,
+                    FORECAST_DATA_ATTRIBUTE_TRANSLATION,
+                    is_day=solar.is_day_at(f_time),
+                )
+                result.append((f_time, forecast, f.get("icon", "no_image")))
+        return result
+
+    @staticmethod
+    def fill_hourly_forecast(now: datetime, weather_data, hours: list[ProcessedHour]):
+        """
+        Fill weather_data ATTR_FORECAST_HOURLY and ATTR_API_FORECAST_ICONS fields
+
+        :param now: current datetime
+        :param weather_data: this integration weather result
+        :param hours: processed forecast hours, see process_hours
+        """
+        for f_time, forecast, icon in hours:
+            if len(weather_data[ATTR_FORECAST_HOURLY]) > 24:
+                return
+            if f_time > now:
+                weather_data[ATTR_FORECAST_HOURLY].append(forecast)
+                weather_data[ATTR_API_FORECAST_ICONS].append(icon)
 
     def __str__(self):
         """Show as pretty look data json."""
-        _d = dict(self.data)
-        _d[ATTR_API_WEATHER_TIME] = str(_d[ATTR_API_WEATHER_TIME])
-        return json.dumps(_d, indent=4, sort_keys=True)
+        return json.dumps(self.data, indent=4, sort_keys=True, default=_json_default)
 
     @property
     def url(self) -> str:
@@ -331,13 +820,95 @@ class WeatherUpdater(DataUpdateCoordinator):
             configuration_url=self.url,
         )
 
+    @property
+    def refresh_phase(self) -> float:
+        """Deterministic offset of aligned refresh slots for this entry, in seconds."""
+        seed = zlib.crc32(str(self.device_id).encode())
+        if self._refresh_phase is None:
+            return float(seed % max(1, int(self.refresh_period)))
+        hours = max(1, int(self.refresh_period // 3600))
+        return float((seed % hours) * 3600 + self._refresh_phase * 60)
+
+    @property
+    def refresh_period(self) -> float:
+        """Distance between aligned refresh slots, in seconds.
+
+        Slots snapped to the hour are rounded up to whole hours to stay in quota.
+        """
+        seconds = self.update_interval.total_seconds()
+        if self._refresh_phase is None:
+            return seconds
+        return math.ceil(seconds / 3600) * 3600
+
+    def next_aligned_refresh(self, now: float | None = None) -> float:
+        """Get timestamp of the next aligned refresh slot.
+
+        Slots are counted from the epoch, so they do not depend on startup time.
+
+        :param now: timestamp to search slot after, defaults to current time
+        """
+        now = time.time() if now is None else now
+        period = self.refresh_period
+        phase = self.refresh_phase
+        return (math.floor((now - phase) / period) + 1) * period + phase
+
+    @property
+    def schedule(self) -> dict:
+        """Refresh schedule state for debugging."""
+        result = {
+            "mode": self._schedule_mode,
+            "update_interval": self.update_interval.total_seconds(),
+            "period": self.refresh_period,
+            "phase": self.refresh_phase,
+            "next_refresh": self._next_refresh,
+        }
+        if self._quota is not None:
+            result["quota"] = self._quota.describe(self.device_id)
+        return result
+
+    def quota_status(self) -> str:
+        """Status of entry for quota scheduler."""
+        if not self._listeners or (
+            self.config_entry and self.config_entry.pref_disable_polling
+        ):
+            return STATUS_PAUSED
+        if not self.last_update_success:
+            return STATUS_FAILING
+        return STATUS_ACTIVE
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule next regular refresh."""
+        if self._quota is not None:
+            self.update_interval = self._quota.interval(self.device_id)
+        if self._schedule_mode != SCHEDULE_MODE_ALIGNED:
+            super()._schedule_refresh()
+            self._next_refresh = dt_util.utcnow() + self.update_interval
+            return
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+
+        now = time.time()
+        self.schedule_refresh(timedelta(seconds=self.next_aligned_refresh(now) - now))
+
     def schedule_refresh(self, offset: timedelta):
-        """Schedule refresh."""
+        """Schedule refresh.
+
+        In aligned mode refresh is moved to the nearest slot after offset.
+        """
         if self._unsub_refresh:
             self._unsub_refresh()
             self._unsub_refresh = None
 
+        if self._schedule_mode == SCHEDULE_MODE_ALIGNED:
+            now = time.time()
+            offset = timedelta(
+                seconds=self.next_aligned_refresh(now + offset.total_seconds() - 1)
+                - now
+            )
+
         _LOGGER.debug(f"scheduling next refresh after {offset=}")
+        self._next_refresh = dt_util.utcnow() + offset
         next_refresh = (
             int(self.hass.loop.time()) + self._microsecond + offset.total_seconds()
         )
@@ -367,3 +938,62 @@ class WeatherUpdater(DataUpdateCoordinator):
     def device_id(self) -> str:
         """Device ID."""
         return self._device_id
+
+
+class AreaUpdater(WeatherUpdater):
+    """Weather updater for grid of points fetched in one aliased request."""
+
+    def __init__(self, points: list[tuple[float, float]], **kwargs):
+        """Initialize updater.
+
+        :param points: grid points, see area.grid_points
+        :param kwargs: WeatherUpdater arguments, latitude and longitude are
+            taken from area center
+        """
+        self._points = points
+        self._query = build_area_query(len(points))
+        super().__init__(
+            latitude=round(sum(p[0] for p in points) / len(points), 4),
+            longitude=round(sum(p[1] for p in points) / len(points), 4),
+            **kwargs,
+        )
+
+    @property
+    def points(self) -> list[tuple[float, float]]:
+        """Grid points."""
+        return self._points
+
+    @property
+    def query(self) -> str:
+        """Aliased query for all points."""
+        return self._query
+
+    @property
+    def variables(self) -> dict[str, float]:
+        """Coordinates of all points."""
+        return area_variables(self._points)
+
+    async def update(self):
+        """Update weather for all points.
+
+        :returns: aggregated weather data snapshot.
+        """
+        try:
+            r = await self.fetch()
+        except NoApiKeyError as e:
+            raise UpdateFailed(str(e)) from e
+        _LOGGER.debug(f"Raw data is {r=}")
+        now = dt_util.now()
+        self._responses.append((now, r))
+        points = []
+        for i in range(len(self._points)):
+            point = {}
+            self.process_data(
+                point,
+                (r.get(f"p{i}") or {}).get("now", {}),
+                CURRENT_WEATHER_ATTRIBUTE_TRANSLATION,
+            )
+            points.append(point)
+        result = {ATTR_API_WEATHER_TIME: now, **aggregate(points)}
+        self._version += 1
+        return WeatherSnapshot(result, self._version)
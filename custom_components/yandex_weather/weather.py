@@ -23,9 +23,11 @@ from homeassistant.const import (
     UnitOfTemperature,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .config_flow import get_value
 from .const import (  # ATTR_API_TEMP_WATER,; ATTR_API_WIND_GUST,
@@ -37,19 +39,24 @@ from .const import (  # ATTR_API_TEMP_WATER,; ATTR_API_WIND_GUST,
     ATTR_API_ORIGINAL_CONDITION,
     ATTR_API_PRESSURE,
     ATTR_API_TEMPERATURE,
+    ATTR_API_WEATHER_TIME,
     ATTR_API_WIND_BEARING,
     ATTR_API_WIND_SPEED,
     ATTR_API_YA_CONDITION,
     ATTR_FORECAST_DAILY,
     ATTR_FORECAST_HOURLY,
+    ATTR_FORECAST_INDEX,
     ATTRIBUTION,
     CONF_IMAGE_SOURCE,
+    CONF_LOCAL_ICONS,
+    DEFAULT_LOCAL_ICONS,
     DOMAIN,
     ENTRY_NAME,
+    ICON_CACHE,
     UPDATER,
     get_image,
 )
-from .device_trigger import TRIGGERS
+from .device_trigger import TRIGGERS, forecast_signal, trigger_signal
 from .updater import WeatherUpdater
 
 _LOGGER = logging.getLogger(__name__)
@@ -98,7 +105,20 @@ class YandexWeather(WeatherEntity, CoordinatorEntity, RestoreEntity):
         self._attr_unique_id = config_entry.unique_id
         self._attr_device_info = self.coordinator.device_info
         self._attr_supported_features = WeatherEntityFeature.FORECAST_HOURLY
-        self._image_source = get_value(config_entry, CONF_IMAGE_SOURCE, "Yandex")
+        self._config_entry = config_entry
+
+    @property
+    def _image_source(self) -> str:
+        """Image source from current entry options."""
+        return get_value(self._config_entry, CONF_IMAGE_SOURCE, "Yandex")
+
+    def _icon_url(self, url: str | None) -> str | None:
+        """Local icon proxy URL if it is enabled."""
+        if not get_value(self._config_entry, CONF_LOCAL_ICONS, DEFAULT_LOCAL_ICONS):
+            return url
+        if (cache := self.hass.data.get(ICON_CACHE)) is None:
+            return url
+        return cache.local_url(url)
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
@@ -175,11 +195,7 @@ class YandexWeather(WeatherEntity, CoordinatorEntity, RestoreEntity):
                 self.coordinator.schedule_refresh(
                     offset=self.coordinator.update_interval - since_last_update
                 )
-                # write data to coordinator
                 for forecast_type in [ATTR_FORECAST_HOURLY, ATTR_FORECAST_DAILY]:
-                    self.coordinator.data[forecast_type] = self.__getattribute__(
-                        forecast_type
-                    )
                     self._attr_extra_state_attributes[
                         forecast_type
                     ] = self.__getattribute__(forecast_type)
@@ -191,11 +207,14 @@ class YandexWeather(WeatherEntity, CoordinatorEntity, RestoreEntity):
         self.update_condition_and_fire_event(
             new_condition=self.coordinator.data.get(ATTR_API_CONDITION)
         )
-        self._attr_entity_picture = get_image(
-            image_source=self._image_source,
-            condition=self.coordinator.data.get(ATTR_API_ORIGINAL_CONDITION),
-            is_day=self.coordinator.data.get("daytime") == "d",
-            image=self.coordinator.data.get(ATTR_API_IMAGE),
+        self.send_forecast_index()
+        self._attr_entity_picture = self._icon_url(
+            get_image(
+                image_source=self._image_source,
+                condition=self.coordinator.data.get(ATTR_API_ORIGINAL_CONDITION),
+                is_day=self.coordinator.data.get("daytime", "DAY") == "DAY",
+                image=self.coordinator.data.get(ATTR_API_IMAGE),
+            )
         )
         self._attr_humidity = self.coordinator.data.get(ATTR_API_HUMIDITY)
         self._attr_native_pressure = self.coordinator.data.get(ATTR_API_PRESSURE)
@@ -206,7 +225,10 @@ class YandexWeather(WeatherEntity, CoordinatorEntity, RestoreEntity):
             "feels_like": self.coordinator.data.get(ATTR_API_FEELS_LIKE_TEMPERATURE),
             # "wind_gust": self.coordinator.data.get(ATTR_API_WIND_GUST),
             "yandex_condition": self.coordinator.data.get(ATTR_API_YA_CONDITION),
-            "forecast_icons": self.coordinator.data.get(ATTR_API_FORECAST_ICONS),
+            "forecast_icons": [
+                self._icon_url(icon)
+                for icon in self.coordinator.data.get(ATTR_API_FORECAST_ICONS, ())
+            ],
             ATTR_FORECAST_HOURLY: self.coordinator.data.get(ATTR_FORECAST_HOURLY),
             ATTR_FORECAST_DAILY: self.coordinator.data.get(ATTR_FORECAST_DAILY),
         }
@@ -216,7 +238,18 @@ class YandexWeather(WeatherEntity, CoordinatorEntity, RestoreEntity):
         self.async_write_ha_state()
 
     def update_condition_and_fire_event(self, new_condition: str):
-        """Set new condition and fire event on change."""
+        """Set new condition, record it to history and fire event on change."""
+        history = self.coordinator.condition_history
+        if (
+            history is not None
+            and self.hass is not None
+            and history.record(
+                new_condition,
+                self.coordinator.data.get(ATTR_API_WEATHER_TIME, dt_util.utcnow()),
+            )
+        ):
+            async_dispatcher_send(self.hass, self.coordinator.condition_history_signal)
+
         if (
             new_condition != self._attr_condition
             and self.hass is not None
@@ -229,11 +262,35 @@ class YandexWeather(WeatherEntity, CoordinatorEntity, RestoreEntity):
                     "type": new_condition,
                 },
             )
+            # device triggers are subscribed by device registry ID
+            if self.registry_entry is not None and self.registry_entry.device_id:
+                async_dispatcher_send(
+                    self.hass,
+                    trigger_signal(self.registry_entry.device_id, new_condition),
+                )
 
         self._attr_condition = new_condition
 
+    def send_forecast_index(self):
+        """Send forecast index to lookahead device triggers."""
+        index = self.coordinator.data.get(ATTR_FORECAST_INDEX)
+        if (
+            index is not None
+            and self.registry_entry is not None
+            and self.registry_entry.device_id
+        ):
+            async_dispatcher_send(
+                self.hass, forecast_signal(self.registry_entry.device_id), index
+            )
+
+    def _get_forecast(self, forecast_type: str) -> list[Forecast] | None:
+        """Get forecast from coordinator or restored one before first refresh."""
+        if (forecast := self.coordinator.data.get(forecast_type)) is not None:
+            return forecast
+        return getattr(self, forecast_type, None)
+
     async def async_forecast_hourly(self) -> list[Forecast] | None:
-        return self.coordinator.data.get(ATTR_FORECAST_HOURLY)
+        return self._get_forecast(ATTR_FORECAST_HOURLY)
 
     async def async_forecast_twice_daily(self) -> list[Forecast] | None:
-        return self.coordinator.data.get(ATTR_FORECAST_DAILY)
+        return self._get_forecast(ATTR_FORECAST_DAILY)
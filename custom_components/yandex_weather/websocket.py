@@ -0,0 +1,109 @@
+"""Websocket API with delta forecast subscription."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+import logging
+from typing import Any
+
+from homeassistant.components import websocket_api
+from homeassistant.components.weather import ATTR_FORECAST_TIME, Forecast
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.json import json_bytes
+import voluptuous as vol
+
+from .const import ATTR_ENTRY_ID, ATTR_FORECAST_TYPE, DOMAIN, FORECAST_TYPES, UPDATER
+from .snapshot import WeatherSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def forecast_delta(old: Iterable[Forecast], new: Iterable[Forecast]) -> dict[str, list]:
+    """Get per-hour difference between forecasts keyed by forecast time.
+
+    :returns: added forecasts, removed forecast times and changed forecasts,
+        changed forecasts have time and changed fields only, removed field is
+        sent as None
+    """
+    previous = {f[ATTR_FORECAST_TIME]: f for f in old}
+    added, changed = [], []
+    for f in new:
+        time = f[ATTR_FORECAST_TIME]
+        if (p := previous.pop(time, None)) is None:
+            added.append(f)
+        elif p != f:
+            changed.append(
+                {
+                    ATTR_FORECAST_TIME: time,
+                    **{
+                        k: f.get(k) for k in p.keys() | f.keys() if p.get(k) != f.get(k)
+                    },
+                }
+            )
+    return {"added": added, "removed": list(previous), "changed": changed}
+
+
+def full_event(forecast: Iterable[Forecast]) -> dict[str, Any]:
+    """Event with whole forecast, sent on subscription."""
+    return {"type": "full", "forecast": list(forecast)}
+
+
+def is_empty_delta(delta: Mapping[str, list]) -> bool:
+    """Is there no changes in delta?"""
+    return not any(delta.values())
+
+
+async def async_setup_websocket(hass: HomeAssistant):
+    """Register websocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe_forecast)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_forecast",
+        vol.Required(ATTR_ENTRY_ID): str,
+        vol.Optional(ATTR_FORECAST_TYPE, default="hourly"): vol.In(FORECAST_TYPES),
+    }
+)
+@callback
+def ws_subscribe_forecast(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to forecast: full forecast first, then deltas on refresh."""
+    msg_id = msg["id"]
+    if (entry_data := hass.data.get(DOMAIN, {}).get(msg[ATTR_ENTRY_ID])) is None:
+        connection.send_error(
+            msg_id, websocket_api.ERR_NOT_FOUND, "Entry is not loaded"
+        )
+        return
+    updater = entry_data[UPDATER]
+    forecast_key = FORECAST_TYPES[msg[ATTR_FORECAST_TYPE]]
+    snapshot: WeatherSnapshot = updater.data
+    forecast = snapshot.get(forecast_key) or ()
+
+    @callback
+    def _handle_update() -> None:
+        nonlocal snapshot, forecast
+        if updater.data.version == snapshot.version:
+            # listeners are also called to re-render cached data
+            return
+        snapshot = updater.data
+        new_forecast = snapshot.get(forecast_key) or ()
+        delta = forecast_delta(forecast, new_forecast)
+        forecast = new_forecast
+        if is_empty_delta(delta):
+            return
+        message = websocket_api.event_message(msg_id, {"type": "delta", **delta})
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            full_message = websocket_api.event_message(msg_id, full_event(forecast))
+            _LOGGER.debug(
+                f"Sent {len(json_bytes(message))} bytes of forecast delta instead of "
+                f"{len(json_bytes(full_message))} bytes of full forecast"
+            )
+        connection.send_message(message)
+
+    connection.subscriptions[msg_id] = updater.async_add_listener(_handle_update)
+    connection.send_result(msg_id)
+    connection.send_message(websocket_api.event_message(msg_id, full_event(forecast)))
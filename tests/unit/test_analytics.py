@@ -0,0 +1,79 @@
+"""Tests for forecast accuracy analytics."""
+from datetime import datetime, timedelta, timezone
+import json
+
+from custom_components.yandex_weather.analytics import ForecastAccuracy
+from custom_components.yandex_weather.archive import ForecastArchive
+from custom_components.yandex_weather.const import (
+    ATTR_ACCURACY_CONDITION_HIT_RATE,
+    ATTR_ACCURACY_SAMPLES,
+    ATTR_ACCURACY_TEMPERATURE_BIAS,
+    ATTR_ACCURACY_TEMPERATURE_MAE,
+    ATTR_API_CONDITION,
+    ATTR_API_TEMPERATURE,
+    ATTR_API_WEATHER_TIME,
+    ATTR_FORECAST_HOURLY,
+)
+
+START = datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def _snapshot(hour: int) -> dict:
+    """Observation is 0 degree, forecast is 1 degree warmer every lead hour."""
+    issued = START + timedelta(hours=hour, minutes=5)
+    return {
+        ATTR_API_WEATHER_TIME: issued,
+        ATTR_API_CONDITION: "cloudy",
+        ATTR_API_TEMPERATURE: 0.0,
+        ATTR_FORECAST_HOURLY: [
+            {
+                "datetime": (START + timedelta(hours=hour + lead)).isoformat(),
+                "condition": "cloudy" if lead == 1 else "rainy",
+                "native_temperature": float(lead),
+            }
+            for lead in (1, 2)
+        ],
+    }
+
+
+def test_accuracy_by_lead(tmp_path):
+    """Test errors are grouped by lead time and updated incrementally."""
+    archive = ForecastArchive(str(tmp_path / "archive.bin"))
+    accuracy = ForecastAccuracy()
+    for hour in range(6):
+        archive.append(ForecastArchive.records(_snapshot(hour)))
+    now = (START + timedelta(hours=6)).timestamp()
+
+    verified = accuracy.update(archive, now)
+    # hours 11..5 are observed, forecasts are for hours after issue
+    assert verified == 5 + 4
+    assert accuracy.update(archive, now) == 0
+
+    by_lead = {r["lead_hours"]: r for r in accuracy.by_lead()}
+    assert by_lead[1][ATTR_ACCURACY_TEMPERATURE_MAE] == 1
+    assert by_lead[1][ATTR_ACCURACY_CONDITION_HIT_RATE] == 100
+    assert by_lead[2][ATTR_ACCURACY_TEMPERATURE_BIAS] == 2
+    assert by_lead[2][ATTR_ACCURACY_CONDITION_HIT_RATE] == 0
+    assert accuracy.summary()[ATTR_ACCURACY_SAMPLES] == 9
+
+    archive.append(ForecastArchive.records(_snapshot(6)))
+    assert accuracy.update(archive, now + 3600) == 2
+
+
+def test_accuracy_is_restored(tmp_path):
+    """Test saved accumulators continue after restart."""
+    archive = ForecastArchive(str(tmp_path / "archive.bin"))
+    accuracy = ForecastAccuracy()
+    for hour in range(6):
+        archive.append(ForecastArchive.records(_snapshot(hour)))
+    now = (START + timedelta(hours=6)).timestamp()
+    accuracy.update(archive, now)
+
+    restored = ForecastAccuracy()
+    restored.restore(json.loads(json.dumps(accuracy.as_dict())))
+    assert restored.verified_until == accuracy.verified_until
+    assert restored.by_lead() == accuracy.by_lead()
+    assert restored.update(archive, now) == 0
+
+    restored.restore({"accumulators": {"samples": [1]}, "verified_until": 1})
+    assert restored.verified_until == accuracy.verified_until
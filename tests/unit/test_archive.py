@@ -0,0 +1,74 @@
+"""Tests for forecast archive."""
+from datetime import datetime, timedelta, timezone
+
+from custom_components.yandex_weather.archive import RECORD, ForecastArchive
+from custom_components.yandex_weather.const import (
+    ATTR_API_CONDITION,
+    ATTR_API_TEMPERATURE,
+    ATTR_API_WEATHER_TIME,
+    ATTR_FORECAST_HOURLY,
+)
+
+START = datetime(2024, 1, 1, 10, 5, tzinfo=timezone.utc)
+
+
+def _snapshot(issued: datetime, hours: int = 3) -> dict:
+    return {
+        ATTR_API_WEATHER_TIME: issued,
+        ATTR_API_CONDITION: "cloudy",
+        ATTR_API_TEMPERATURE: 1.5,
+        ATTR_FORECAST_HOURLY: [
+            {
+                "datetime": (
+                    issued.replace(minute=0) + timedelta(hours=h + 1)
+                ).isoformat(),
+                "condition": "rainy",
+                "native_temperature": float(h),
+            }
+            for h in range(hours)
+        ],
+    }
+
+
+def test_append_and_read(tmp_path):
+    """Test records may be read by time range."""
+    archive = ForecastArchive(str(tmp_path / "archive.bin"))
+    for h in range(5):
+        s = _snapshot(START + timedelta(hours=h))
+        archive.append(ForecastArchive.records(s))
+
+    assert (tmp_path / "archive.bin").stat().st_size == 5 * 4 * RECORD.size
+
+    start = START.replace(minute=0) + timedelta(hours=2)
+    records = archive.read(start.timestamp(), start.timestamp())
+    assert len(records) == 2  # forecasts from first two refreshes
+    assert {r["kind"] for r in records} == {"forecast"}
+    assert records[0]["condition"] == "rainy"
+
+    observations = [
+        r
+        for r in archive.read(
+            START.timestamp(), (START + timedelta(hours=5)).timestamp()
+        )
+        if r["kind"] == "observation"
+    ]
+    assert len(observations) == 5
+    assert observations[0]["temperature"] == 1.5
+    assert observations[0]["wind_speed"] is None
+
+
+def test_rotation(tmp_path):
+    """Test archive is rotated and old files are removed."""
+    archive = ForecastArchive(
+        str(tmp_path / "archive.bin"), max_bytes=4 * RECORD.size, retention=2
+    )
+    for h in range(5):
+        archive.append(ForecastArchive.records(_snapshot(START + timedelta(hours=h))))
+
+    assert [p.rsplit("/", 1)[-1] for p in archive.files()] == [
+        "archive.bin.2",
+        "archive.bin.1",
+        "archive.bin",
+    ]
+    records = archive.read(START.timestamp(), (START + timedelta(days=1)).timestamp())
+    assert len(records) == 3 * 4
@@ -0,0 +1,69 @@
+"""Tests for weather over area."""
+import pytest
+
+from custom_components.yandex_weather.area import (
+    aggregate,
+    area_variables,
+    build_area_query,
+    grid_points,
+    parse_area,
+)
+
+
+def test_bounding_box_grid():
+    """Test grid is placed inside bounding box."""
+    points = grid_points(parse_area("55.7,37.5; 55.8,37.7"), 3)
+    assert len(points) == 9
+    assert points[0] == (55.725, 37.55)
+    assert points[-1] == (55.775, 37.65)
+
+
+def test_polygon_grid():
+    """Test points outside of polygon are skipped."""
+    points = grid_points(parse_area("0,0; 1,0; 0,1"), 4)
+    assert points == [
+        (0.2, 0.2),
+        (0.2, 0.4),
+        (0.2, 0.6),
+        (0.4, 0.2),
+        (0.4, 0.4),
+        (0.6, 0.2),
+    ]
+
+
+@pytest.mark.parametrize("area", ["", "55.7,37.5", "95,37.5; 55.8,37.7", "a,b; c,d"])
+def test_invalid_area(area):
+    """Test invalid area is rejected."""
+    with pytest.raises(ValueError):
+        parse_area(area)
+
+
+def test_aliased_query():
+    """Test every point has own alias and variables."""
+    points = [(1.0, 2.0), (3.0, 4.0)]
+    query = build_area_query(len(points))
+    assert "p0: weatherByPoint(request: { lat: $lat0, lon: $lon0 }" in query
+    assert "p1: weatherByPoint(request: { lat: $lat1, lon: $lon1 }" in query
+    assert area_variables(points) == {
+        "lat0": 1.0,
+        "lon0": 2.0,
+        "lat1": 3.0,
+        "lon1": 4.0,
+    }
+
+
+def test_aggregate():
+    """Test worst condition and extremes over points."""
+    assert aggregate(
+        [
+            {"condition": "rainy", "temperature": 1, "windSpeed": None},
+            {"condition": "sunny", "temperature": -2, "windSpeed": 3},
+            {},
+        ]
+    ) == {
+        "area_condition": "rainy",
+        "area_temperature_min": -2,
+        "area_temperature_max": 1,
+        "area_wind_speed_max": 3,
+        "area_points": 3,
+    }
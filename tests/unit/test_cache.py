@@ -0,0 +1,79 @@
+"""Tests for response cache backends."""
+import asyncio
+
+import pytest
+
+from custom_components.yandex_weather.cache import (
+    MemoryBackend,
+    RedisBackend,
+    encode_command,
+    read_reply,
+)
+
+
+async def _serve_redis(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Minimal server for GET, SET [NX] [PX] and DEL."""
+    values = {}
+    while not reader.at_eof():
+        try:
+            command = await read_reply(reader)
+        except Exception:  # noqa: BLE001
+            break
+        name, *args = command
+        if name == b"GET":
+            value = values.get(args[0])
+            writer.write(
+                b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+            )
+        elif name == b"SET":
+            if b"NX" in args[2:] and args[0] in values:
+                writer.write(b"$-1\r\n")
+            else:
+                values[args[0]] = args[1]
+                writer.write(b"+OK\r\n")
+        elif name == b"DEL":
+            writer.write(b":%d\r\n" % int(values.pop(args[0], None) is not None))
+        await writer.drain()
+    writer.close()
+
+
+def test_encode_command():
+    """Test commands are encoded as arrays of bulk strings."""
+    assert encode_command("GET", b"key") == b"*2\r\n$3\r\nGET\r\n$3\r\nkey\r\n"
+
+
+@pytest.mark.asyncio
+async def test_memory_lock_is_exclusive():
+    """Test only one lock holder until unlock."""
+    backend = MemoryBackend()
+    token = await backend.async_lock("point", 10)
+    assert token is not None
+    assert await backend.async_lock("point", 10) is None
+
+    await backend.async_unlock("point", "other")
+    assert await backend.async_lock("point", 10) is None
+
+    await backend.async_unlock("point", token)
+    assert await backend.async_lock("point", 10) is not None
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_with_local_server():
+    """Test backend works with any server speaking Redis protocol."""
+    server = await asyncio.start_server(_serve_redis, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    backend = RedisBackend(f"redis://127.0.0.1:{port}")
+    try:
+        assert await backend.async_get("point") is None
+        await backend.async_set("point", b'{"now": {}}', 60)
+        assert await backend.async_get("point") == b'{"now": {}}'
+
+        token = await backend.async_lock("point", 30)
+        assert token is not None
+        assert await backend.async_lock("point", 30) is None
+        await backend.async_unlock("point", token)
+        assert await backend.async_lock("point", 30) is not None
+    finally:
+        await backend.async_close()
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,51 @@
+"""Tests for precomputed condition tables."""
+import pytest
+
+from custom_components.yandex_weather.const import (
+    CONDITION_HA_STATE,
+    CONDITION_ICONS,
+    CONDITION_IMAGE,
+    CONDITION_IMAGE_URL,
+    CONDITION_MDI_ICON,
+    WEATHER_STATES_CONVERSION,
+    Conditions,
+    get_image,
+    map_state,
+)
+
+
+@pytest.mark.parametrize("condition", [c.name for c in Conditions])
+@pytest.mark.parametrize("is_day", [True, False])
+def test_tables_match_mapping(condition, is_day):
+    """Test tables give same result as mapping."""
+    assert CONDITION_HA_STATE[(condition, is_day)] == map_state(
+        condition, is_day, WEATHER_STATES_CONVERSION
+    )
+    assert CONDITION_MDI_ICON[(condition, is_day)] == map_state(
+        condition, is_day, CONDITION_ICONS
+    )
+    for source, ci in CONDITION_IMAGE.items():
+        if ci is not None and ci.mapping is not None:
+            assert get_image(source, condition, "", is_day) == ci.link.format(
+                map_state(condition, is_day, ci.mapping)
+            )
+
+
+def test_unknown_condition_image():
+    """Test unknown condition is used as image name."""
+    assert get_image("Custom weather card static", "FOO", "").endswith("/FOO.svg")
+
+
+def test_no_compilation_per_call(monkeypatch):
+    """Test tables are built at import and lookups do not compile mappings."""
+    from custom_components.yandex_weather import const
+
+    def fail(*args, **kwargs):
+        raise AssertionError("mapping compiled per call")
+
+    monkeypatch.setattr(const, "compile_mapping", fail)
+    monkeypatch.setattr(const, "map_state", fail)
+    for source in CONDITION_IMAGE_URL:
+        for condition in Conditions:
+            assert get_image(source, condition.name, "", False) is not None
+    assert CONDITION_HA_STATE is const.CONDITION_HA_STATE
@@ -0,0 +1,78 @@
+"""Tests for degree-day accumulators."""
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from homeassistant.util import dt as dt_util
+import pytest
+
+from custom_components.yandex_weather.const import (
+    ATTR_COOLING_DEGREE_DAYS_TODAY,
+    ATTR_HEATING_DEGREE_DAYS,
+    ATTR_HEATING_DEGREE_DAYS_TODAY,
+    ATTR_HEATING_DEGREE_DAYS_TOMORROW,
+)
+from custom_components.yandex_weather.degree_days import DegreeDays, integrate
+
+START = datetime(2024, 1, 1, 18, 0, tzinfo=timezone.utc)
+
+
+def test_integrate_clips_at_base():
+    """Test only temperature beyond base is integrated."""
+    day = 86400
+    assert integrate([(0, 8), (day, 8)], 18, 22) == (10, 0)
+    # crosses heating base in the middle: triangle of 2 degrees over half a day
+    heating, cooling = integrate([(0, 16), (day, 20)], 18, 22)
+    assert heating == pytest.approx(0.5)
+    assert cooling == 0
+
+
+def test_observe_splits_day_and_skips_gaps():
+    """Test observations are integrated incrementally by local day."""
+    degree_days = DegreeDays(None, "test", heating_base=18)
+    for hours in range(0, 13):
+        degree_days.observe(8, START + timedelta(hours=hours))
+
+    # 18:00 to 06:00 at 10 degrees below base
+    assert degree_days.heating_total == pytest.approx(5)
+    assert degree_days.heating_today == pytest.approx(2.5)
+
+    # restart gap is not integrated
+    degree_days.observe(8, START + timedelta(hours=24))
+    assert degree_days.heating_total == pytest.approx(5)
+
+
+def test_estimate_adds_forecast():
+    """Test today estimate is observed part and forecast rest of day."""
+    degree_days = DegreeDays(None, "test", heating_base=18, cooling_base=22)
+    degree_days.observe(8, START)
+    degree_days.observe(8, START + timedelta(hours=3))
+    now = START + timedelta(hours=3)
+    forecast = [((now + timedelta(hours=h)).timestamp(), 8) for h in range(1, 30 + 1)]
+
+    values = degree_days.estimate(now, forecast)
+
+    assert values[ATTR_HEATING_DEGREE_DAYS] == pytest.approx(1.25)
+    assert values[ATTR_HEATING_DEGREE_DAYS_TODAY] == pytest.approx(2.5)
+    assert values[ATTR_COOLING_DEGREE_DAYS_TODAY] == 0
+    assert values[ATTR_HEATING_DEGREE_DAYS_TOMORROW] == pytest.approx(10)
+
+    assert (
+        degree_days.estimate(now, forecast[:5])[ATTR_HEATING_DEGREE_DAYS_TOMORROW]
+        is None
+    )
+
+
+def test_day_is_taken_in_ha_timezone():
+    """Test day boundary is midnight of HA timezone, not of OS timezone."""
+    dt_util.set_default_time_zone(ZoneInfo("Europe/Moscow"))
+    try:
+        degree_days = DegreeDays(None, "test", heating_base=18)
+        # 23:00 till 02:00 in Moscow
+        for hours in range(2, 6):
+            degree_days.observe(8, START + timedelta(hours=hours))
+
+        # 3 hours at 10 degrees below base, 2 of them after Moscow midnight
+        assert degree_days.heating_total == pytest.approx(30 / 24)
+        assert degree_days.heating_today == pytest.approx(20 / 24)
+    finally:
+        dt_util.set_default_time_zone(timezone.utc)
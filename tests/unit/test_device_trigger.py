@@ -0,0 +1,63 @@
+"""Tests for device triggers."""
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+import pytest
+
+from custom_components.yandex_weather.const import DOMAIN
+from custom_components.yandex_weather.device_trigger import (
+    TRIGGER_CONDITION_EXPECTED,
+    async_attach_trigger,
+    forecast_signal,
+    trigger_signal,
+)
+from custom_components.yandex_weather.forecast_index import ForecastIndex
+
+
+async def _attach(hass, fired: list, device_id: str, trigger_type: str, **extra):
+    @callback
+    def action(run_variables, context=None):
+        fired.append((device_id, trigger_type))
+
+    return await async_attach_trigger(
+        hass,
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: trigger_type,
+            **extra,
+        },
+        action,
+        {"trigger_data": {}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_condition_change_wakes_matching_triggers_only(hass):
+    """Test condition change of device wakes triggers for that device and condition."""
+    fired = []
+    for device_id in ("device_a", "device_b"):
+        for condition in ("sunny", "rainy"):
+            await _attach(hass, fired, device_id, condition)
+
+    async_dispatcher_send(hass, trigger_signal("device_a", "sunny"))
+    await hass.async_block_till_done()
+
+    assert fired == [("device_a", "sunny")]
+
+
+@pytest.mark.asyncio
+async def test_lookahead_attached_before_first_forecast(hass):
+    """Test first forecast satisfying lookahead trigger fires it once."""
+    fired = []
+    await _attach(
+        hass, fired, "device_a", TRIGGER_CONDITION_EXPECTED, condition="rainy"
+    )
+    index = ForecastIndex({"rainy": 1}, (None, 5), (None, 5))
+
+    for _ in range(2):
+        async_dispatcher_send(hass, forecast_signal("device_a"), index)
+        await hass.async_block_till_done()
+
+    assert fired == [("device_a", TRIGGER_CONDITION_EXPECTED)]
@@ -0,0 +1,54 @@
+"""Tests for diagnostics."""
+import json
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from custom_components.yandex_weather.const import (
+    ATTR_API_TEMPERATURE,
+    ATTR_FORECAST_INDEX,
+)
+from custom_components.yandex_weather.diagnostics import TO_REDACT, snapshot_diagnostics
+from custom_components.yandex_weather.forecast_index import ForecastIndex
+from custom_components.yandex_weather.snapshot import WeatherSnapshot
+
+
+def test_snapshot_is_json_ready():
+    """Test forecast index is converted to plain data."""
+    snapshot = WeatherSnapshot(
+        {
+            ATTR_API_TEMPERATURE: 1,
+            ATTR_FORECAST_INDEX: ForecastIndex({"rainy": 2}, (None, 1), (None, 1)),
+        },
+        3,
+    )
+
+    data = snapshot_diagnostics(snapshot)
+
+    assert data["version"] == 3
+    assert json.loads(json.dumps(data))["data"][ATTR_FORECAST_INDEX]["first_hour"] == {
+        "rainy": 2
+    }
+
+
+def test_no_snapshot_before_first_refresh():
+    """Test diagnostics work before updater has data."""
+    assert snapshot_diagnostics(None) is None
+
+
+def test_raw_response_is_redacted():
+    """Test API keys and coordinates are not exposed."""
+    data = async_redact_data(
+        {
+            "options": {
+                "api_key": "secret",
+                "latitude": 55.7,
+                "pool_api_keys": "pooled-secret, other-secret",
+            },
+            "raw_responses": [{"response": {"lat": 55.7, "now": {"temperature": 1}}}],
+        },
+        TO_REDACT,
+    )
+
+    assert "secret" not in json.dumps(data)
+    assert data["options"]["pool_api_keys"] == "**REDACTED**"
+    assert "55.7" not in json.dumps(data)
@@ -0,0 +1,68 @@
+"""Tests for forecast index."""
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.components.weather import (
+    ATTR_FORECAST_CONDITION,
+    ATTR_FORECAST_NATIVE_TEMP,
+    ATTR_FORECAST_TIME,
+)
+import pytest
+
+from custom_components.yandex_weather.forecast_index import ForecastIndex
+
+NOW = datetime(2024, 1, 1, 10, 20, tzinfo=timezone.utc)
+FORECAST = [
+    {
+        ATTR_FORECAST_TIME: (NOW.replace(minute=0) + timedelta(hours=h)).isoformat(),
+        ATTR_FORECAST_CONDITION: condition,
+        ATTR_FORECAST_NATIVE_TEMP: temperature,
+    }
+    for h, condition, temperature in [
+        (1, "cloudy", 2),
+        (2, "cloudy", 1),
+        (3, "rainy", -1),
+        (4, "cloudy", 3),
+        (5, "snowy", -4),
+    ]
+]
+
+
+@pytest.mark.parametrize(
+    "condition, hours, expected",
+    [
+        ("cloudy", 1, True),
+        ("rainy", 2, False),
+        ("rainy", 3, True),
+        ("snowy", 24, True),
+        ("sunny", 24, False),
+    ],
+)
+def test_condition_within(condition, hours, expected):
+    """Test condition lookahead."""
+    index = ForecastIndex.build(NOW, FORECAST)
+    assert index.condition_within(condition, hours) is expected
+
+
+@pytest.mark.parametrize(
+    "threshold, hours, expected",
+    [
+        (1, 1, False),
+        (2, 2, True),
+        (0, 2, False),
+        (0, 3, True),
+        (-3, 4, False),
+        (-3, 24, True),
+    ],
+)
+def test_temperature_below_within(threshold, hours, expected):
+    """Test temperature lookahead."""
+    index = ForecastIndex.build(NOW, FORECAST)
+    assert index.temperature_below_within(threshold, hours) is expected
+
+
+def test_empty_forecast():
+    """Test index without forecast answers no."""
+    index = ForecastIndex.build(NOW, [])
+    assert not index.condition_within("rainy", 24)
+    assert not index.temperature_below_within(100, 24)
+    assert not index.temperature_above_within(-100, 24)
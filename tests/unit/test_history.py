@@ -0,0 +1,27 @@
+"""Tests for condition history."""
+from datetime import datetime, timedelta, timezone
+
+from custom_components.yandex_weather.history import ConditionHistory
+
+START = datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+
+
+def test_condition_history():
+    """Test only transitions are recorded in ring buffer."""
+    history = ConditionHistory(None, "device", size=3)
+    assert history.current is None
+    assert history.current_since is None
+
+    for hours, condition in enumerate(["sunny", "sunny", "cloudy", "rainy", "rainy"]):
+        history.record(condition, START + timedelta(hours=hours))
+
+    assert history.current == "rainy"
+    assert history.current_since == START + timedelta(hours=3)
+    assert history.transitions_since(START + timedelta(hours=1)) == 2
+    assert not history.record("rainy", START + timedelta(hours=5))
+
+    history.record("snowy", START + timedelta(hours=6))
+    assert [t["condition"] for t in history.as_list()] == ["cloudy", "rainy", "snowy"]
+    assert history.as_list(START + timedelta(hours=3)) == [
+        {"time": (START + timedelta(hours=6)).isoformat(), "condition": "snowy"}
+    ]
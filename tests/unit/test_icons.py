@@ -0,0 +1,48 @@
+"""Tests for local icon cache."""
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.yandex_weather.icons import (
+    SECURITY_HEADERS,
+    IconCache,
+    IconView,
+    icon_key,
+)
+
+
+def test_icon_key():
+    """Test key is stable and keeps extension."""
+    url = "https://yastatic.net/weather/i/icons/funky/dark/ovc.svg"
+    assert icon_key(url) == icon_key(url)
+    assert icon_key(url).endswith(".svg")
+    assert icon_key(url) != icon_key(url.replace("ovc", "skc_d"))
+
+
+def test_icon_cache_size_limit(tmp_path):
+    """Test least recently used icons are evicted over size limit."""
+    cache = IconCache(None, str(tmp_path), max_bytes=250)
+    for i, key in enumerate(["a.svg", "b.svg", "c.svg"]):
+        cache._write(key, b"x" * 100)
+        os.utime(cache.file(key), (i, i))
+
+    assert sorted(os.listdir(tmp_path)) == ["b.svg", "c.svg"]
+    assert cache._read("b.svg") == b"x" * 100
+    assert cache._read("a.svg") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("if_none_match", [None, '"a.svg"'])
+async def test_icon_view_headers(if_none_match):
+    """Test icons can not run scripts in Home Assistant origin."""
+    cache = MagicMock(async_get=AsyncMock(return_value=b"<svg/>"))
+    request = MagicMock(
+        headers={} if if_none_match is None else {"If-None-Match": if_none_match}
+    )
+
+    response = await IconView(cache).get(request, "a.svg")
+
+    for header, value in SECURITY_HEADERS.items():
+        assert response.headers[header] == value
+    assert "sandbox" in response.headers["Content-Security-Policy"]
@@ -0,0 +1,47 @@
+"""Tests for interpolation between refreshes."""
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.components.weather import (
+    ATTR_FORECAST_NATIVE_TEMP,
+    ATTR_FORECAST_TIME,
+)
+import pytest
+
+from custom_components.yandex_weather.const import (
+    ATTR_API_TEMPERATURE,
+    ATTR_API_WEATHER_TIME,
+    ATTR_FORECAST_HOURLY,
+)
+from custom_components.yandex_weather.interpolation import interpolate
+
+NOW = datetime(2024, 1, 1, 10, 30, tzinfo=timezone.utc)
+DATA = {
+    ATTR_API_WEATHER_TIME: NOW,
+    ATTR_API_TEMPERATURE: 0,
+    ATTR_FORECAST_HOURLY: (
+        {ATTR_FORECAST_TIME: "2024-01-01T11:00:00+00:00", ATTR_FORECAST_NATIVE_TEMP: 3},
+        {
+            ATTR_FORECAST_TIME: "2024-01-01T12:00:00+00:00",
+            ATTR_FORECAST_NATIVE_TEMP: None,
+        },
+        {ATTR_FORECAST_TIME: "2024-01-01T13:00:00+00:00", ATTR_FORECAST_NATIVE_TEMP: 1},
+    ),
+}
+
+
+@pytest.mark.parametrize(
+    "minutes,expected",
+    [
+        (-10, 0),
+        (0, 0),
+        (10, 1),
+        (30, 3),
+        (90, 2),
+        (150, 1),
+        (600, 1),
+    ],
+)
+def test_interpolate(minutes, expected):
+    """Test values between observation and hourly forecast."""
+    value = interpolate(DATA, ATTR_API_TEMPERATURE, NOW + timedelta(minutes=minutes))
+    assert value == pytest.approx(expected)
@@ -0,0 +1,79 @@
+"""Tests for API key pool."""
+import json
+
+from gql.transport.exceptions import TransportServerError
+import pytest
+
+from custom_components.yandex_weather.keys import (
+    ApiKeyPool,
+    NoApiKeyError,
+    parse_api_keys,
+)
+from custom_components.yandex_weather.limiter import RequestLimiter
+
+
+def test_parse_api_keys():
+    """Test keys may be separated by commas and spaces."""
+    assert parse_api_keys("a, b\nc,,") == ["a", "b", "c"]
+    assert parse_api_keys(None) == []
+
+
+@pytest.mark.asyncio
+async def test_select_by_remaining_budget():
+    """Test key with more requests left is used."""
+    pool = ApiKeyPool(limit_per_day=10)
+    pool.add(["test_pool_busy", "test_pool_idle"])
+    async with RequestLimiter.for_key("test_pool_busy").acquire():
+        pass
+
+    assert pool.select() == "test_pool_idle"
+    assert pool.usage()["…busy"]["remaining_today"] == 9
+
+
+@pytest.mark.asyncio
+async def test_failover_disables_rejected_keys():
+    """Test keys rejected by API are skipped."""
+    pool = ApiKeyPool()
+    pool.add(["test_pool_quota", "test_pool_auth", "test_pool_good"])
+    errors = {"test_pool_quota": 429, "test_pool_auth": 401}
+    used = []
+
+    async def request(key: str) -> dict:
+        used.append(key)
+        if key in errors:
+            raise TransportServerError("rejected", errors[key])
+        return {"key": key}
+
+    for key in ["test_pool_good", "test_pool_quota", "test_pool_auth"]:
+        RequestLimiter.for_key(key).calls_total = 0
+    # good key is used last, when other keys are already disabled
+    RequestLimiter.for_key("test_pool_good").calls_total = 100
+
+    assert await pool.async_call(request) == {"key": "test_pool_good"}
+    assert used[-1] == "test_pool_good"
+    assert set(used[:-1]) == set(errors)
+    assert pool.is_disabled("test_pool_quota")
+    assert pool.is_disabled("test_pool_auth")
+
+    pool.remove(["test_pool_good"])
+    with pytest.raises(NoApiKeyError):
+        await pool.async_call(request)
+
+
+@pytest.mark.asyncio
+async def test_usage_is_restored():
+    """Test daily usage of keys survives restart."""
+    pool = ApiKeyPool(limit_per_day=10)
+    pool.add(["test_pool_restored"])
+    async with RequestLimiter.for_key("test_pool_restored").acquire():
+        pass
+    data = json.loads(json.dumps(pool.as_dict()))
+    assert "test_pool_restored" not in json.dumps(data)
+
+    # restart
+    del RequestLimiter._limiters["test_pool_restored"]
+    restored = ApiKeyPool(limit_per_day=10)
+    restored.restore(data)
+    restored.add(["test_pool_restored"])
+
+    assert restored.remaining("test_pool_restored") == 9
@@ -0,0 +1,41 @@
+"""Tests for requests limiting."""
+import asyncio
+
+import pytest
+
+from custom_components.yandex_weather.limiter import RequestLimiter, SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_merges_calls():
+    """Test concurrent calls with same key share one call."""
+    calls = 0
+
+    async def request():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"calls": calls}
+
+    flights = SingleFlight()
+    results = await asyncio.gather(*(flights.do("point", request) for _ in range(5)))
+
+    assert calls == 1
+    assert all(r is results[0] for r in results)
+
+    await flights.do("point", request)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_limiter_counts_calls():
+    """Test limiter is shared by key and counts calls."""
+    limiter = RequestLimiter.for_key("test_limiter_key")
+    assert RequestLimiter.for_key("test_limiter_key") is limiter
+
+    for _ in range(2):
+        async with limiter.acquire():
+            pass
+
+    assert limiter.calls_today == 2
+    assert limiter.calls_total == 2
@@ -0,0 +1,40 @@
+"""Tests for options update decision."""
+from custom_components.yandex_weather.const import (
+    CONF_ARCHIVE,
+    CONF_IMAGE_SOURCE,
+    CONF_INTERPOLATION_RESOLUTION,
+    CONF_LOCAL_ICONS,
+    CONF_UPDATES_PER_DAY,
+    OPTION_DEFAULTS,
+    PRESENTATION_OPTIONS,
+    changed_options,
+)
+
+OLD_ENTRY = {"api_key": "key", CONF_IMAGE_SOURCE: "Yandex", CONF_UPDATES_PER_DAY: 24}
+
+
+def test_saved_defaults_are_not_changes():
+    """Test first save after upgrade changes only edited options."""
+    new = {
+        **OPTION_DEFAULTS,
+        **OLD_ENTRY,
+        CONF_IMAGE_SOURCE: "Custom weather card",
+    }
+
+    changed = changed_options(OLD_ENTRY, new)
+
+    assert changed == {CONF_IMAGE_SOURCE}
+    assert changed <= PRESENTATION_OPTIONS
+
+
+def test_presentation_and_reload_options():
+    """Test only presentation options are applied without reload."""
+    old = {**OLD_ENTRY, CONF_LOCAL_ICONS: True}
+    presentation = {**old, CONF_LOCAL_ICONS: False, CONF_INTERPOLATION_RESOLUTION: 1}
+    assert changed_options(old, presentation) <= PRESENTATION_OPTIONS
+
+    reload = {**presentation, CONF_ARCHIVE: True, "api_key": "other"}
+    assert changed_options(old, reload) - PRESENTATION_OPTIONS == {
+        CONF_ARCHIVE,
+        "api_key",
+    }
@@ -0,0 +1,48 @@
+"""Tests for point weather cache."""
+import pytest
+
+from custom_components.yandex_weather.point_cache import (
+    PointCache,
+    geohash_center,
+    geohash_encode,
+)
+
+
+def test_geohash():
+    """Test nearby points share cell and cell center is inside cell."""
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    cell = geohash_encode(55.7558, 37.6173, 5)
+    assert cell == geohash_encode(55.757, 37.618, 5)
+    latitude, longitude = geohash_center(cell)
+    assert geohash_encode(latitude, longitude, 5) == cell
+    assert latitude == pytest.approx(55.7558, abs=0.05)
+    assert longitude == pytest.approx(37.6173, abs=0.05)
+
+
+@pytest.mark.asyncio
+async def test_point_cache(monkeypatch):
+    """Test cache is evicted by size and expired by TTL."""
+    now = 1000.0
+    monkeypatch.setattr(
+        "custom_components.yandex_weather.point_cache.time.monotonic", lambda: now
+    )
+    calls = []
+
+    def fetcher(value):
+        async def fetch():
+            calls.append(value)
+            return value
+
+        return fetch
+
+    cache = PointCache(ttl=60, max_size=2)
+    assert await cache.async_get_or_fetch("a", fetcher(1)) == (1, False)
+    assert await cache.async_get_or_fetch("a", fetcher(2)) == (1, True)
+    await cache.async_get_or_fetch("b", fetcher(3))
+    await cache.async_get_or_fetch("c", fetcher(4))
+    assert cache.get("a") is None
+    assert len(cache) == 2
+
+    now += 60
+    assert await cache.async_get_or_fetch("c", fetcher(5)) == (5, False)
+    assert calls == [1, 3, 4, 5]
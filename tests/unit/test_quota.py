@@ -0,0 +1,70 @@
+"""Tests for quota scheduler."""
+from datetime import datetime
+
+import pytest
+
+from custom_components.yandex_weather.quota import (
+    STATUS_ACTIVE,
+    STATUS_FAILING,
+    STATUS_PAUSED,
+    QuotaScheduler,
+    QuotaShare,
+    allocate,
+)
+
+
+def test_allocate_by_weight():
+    """Test budget is split by weight."""
+    assert allocate(32, {"home": (3, 0, 50), "cabin": (1, 0, 50)}) == {
+        "home": 24,
+        "cabin": 8,
+    }
+
+
+def test_allocate_caps_demand_and_priority():
+    """Test unused part of capped entry goes to others, priority is served first."""
+    result = allocate(
+        30,
+        {
+            "home": (1, 1, 20),
+            "cabin": (3, 0, 4),
+            "garage": (1, 0, 24),
+        },
+    )
+    assert result == {"home": 20, "cabin": 4, "garage": 6}
+
+
+def test_paused_and_failing_entries_give_budget_away():
+    """Test budget of paused and failing entries goes to active ones."""
+    status = {"home": STATUS_ACTIVE, "cabin": STATUS_ACTIVE, "garage": STATUS_ACTIVE}
+    scheduler = QuotaScheduler(lambda: 30, lambda: 0)
+    for entry_id in status:
+        scheduler.register(
+            entry_id, QuotaShare(1, 0, 30, lambda entry_id=entry_id: status[entry_id])
+        )
+    assert scheduler.allocation()["home"] == pytest.approx(10)
+
+    status["cabin"] = STATUS_PAUSED
+    status["garage"] = STATUS_FAILING
+    allocation = scheduler.allocation()
+    assert allocation == {"home": 26, "cabin": 0, "garage": 4}
+    assert scheduler.describe("home")["allocation"] == 26
+
+    scheduler.unregister("garage")
+    assert scheduler.allocation() == {"home": 30, "cabin": 0}
+
+
+def test_interval_spreads_rest_of_budget():
+    """Test used budget stretches interval till the end of day."""
+    noon = datetime(2024, 1, 1, 12).timestamp()
+    used = 0
+    scheduler = QuotaScheduler(lambda: 24, lambda: used)
+    scheduler.register("home", QuotaShare(1, 0, 24, lambda: STATUS_ACTIVE))
+    assert scheduler.interval("home", now=noon).total_seconds() == 3600
+
+    # 4 requests left for 12 hours
+    used = 20
+    assert scheduler.interval("home", now=noon).total_seconds() == 3 * 3600
+
+    used = 24
+    assert scheduler.interval("home", now=noon).total_seconds() == 12 * 3600
@@ -0,0 +1,48 @@
+"""Tests for aligned refresh scheduling."""
+import pytest
+
+from custom_components.yandex_weather.const import SCHEDULE_MODE_ALIGNED
+from custom_components.yandex_weather.updater import WeatherUpdater
+
+NOW = 1_700_000_000.0
+
+
+def _updater(device_id: str, updates_per_day: int = 24, refresh_phase=None):
+    return WeatherUpdater(
+        0,
+        0,
+        "",
+        None,
+        device_id,
+        updates_per_day=updates_per_day,
+        schedule_mode=SCHEDULE_MODE_ALIGNED,
+        refresh_phase=refresh_phase,
+    )
+
+
+@pytest.mark.parametrize("device_id", ["1.0-2.0", "55.75-37.62", "test_device"])
+def test_next_slot_is_in_next_period(device_id):
+    """Test next slot is after now and no later than one period."""
+    w = _updater(device_id)
+    next_refresh = w.next_aligned_refresh(NOW)
+
+    assert NOW < next_refresh <= NOW + w.refresh_period
+    assert w.next_aligned_refresh(next_refresh) == next_refresh + w.refresh_period
+
+
+def test_entries_are_spread():
+    """Test different entries get different deterministic phases."""
+    phases = {_updater(f"{i}-{i}").refresh_phase for i in range(10)}
+
+    assert len(phases) > 1
+    assert _updater("1-1").refresh_phase == _updater("1-1").refresh_phase
+
+
+@pytest.mark.parametrize("updates_per_day", [24, 12, 7])
+def test_snap_to_hour_phase(updates_per_day):
+    """Test slots are snapped to configured minute after the hour."""
+    w = _updater("55.75-37.62", updates_per_day=updates_per_day, refresh_phase=15)
+    next_refresh = w.next_aligned_refresh(NOW)
+
+    assert next_refresh % 3600 == 15 * 60
+    assert w.refresh_period >= w.update_interval.total_seconds()
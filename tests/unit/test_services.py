@@ -0,0 +1,24 @@
+"""Tests for integration services."""
+from datetime import datetime, timezone
+
+from custom_components.yandex_weather.services import select_forecasts
+
+FORECASTS = (
+    {"datetime": "2024-01-01T11:00:00+00:00", "condition": "cloudy", "humidity": 80},
+    {"datetime": "2024-01-01T12:00:00+00:00", "condition": "rainy", "humidity": 90},
+    {"datetime": "2024-01-01T13:00:00+00:00", "condition": "rainy", "humidity": 95},
+)
+
+
+def test_select_forecasts():
+    """Test forecasts are filtered by time range and fields."""
+    assert select_forecasts(FORECASTS) == list(FORECASTS)
+    assert select_forecasts(
+        FORECASTS,
+        start=datetime(2024, 1, 1, 11, 30, tzinfo=timezone.utc),
+        end=datetime(2024, 1, 1, 13, tzinfo=timezone.utc),
+        fields=["humidity", "pressure"],
+    ) == [
+        {"datetime": "2024-01-01T12:00:00+00:00", "humidity": 90, "pressure": None},
+        {"datetime": "2024-01-01T13:00:00+00:00", "humidity": 95, "pressure": None},
+    ]
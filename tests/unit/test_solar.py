@@ -0,0 +1,35 @@
+"""Tests for day and night classification."""
+from datetime import datetime, timezone
+
+import pytest
+
+from custom_components.yandex_weather.solar import solar_table
+
+MOSCOW = (55.75, 37.62)
+SYDNEY = (-33.87, 151.21)
+SVALBARD = (78.22, 15.65)
+
+
+@pytest.mark.parametrize(
+    "location,moment,expected",
+    [
+        (MOSCOW, datetime(2024, 6, 1, 0, tzinfo=timezone.utc), False),
+        (MOSCOW, datetime(2024, 6, 1, 12, tzinfo=timezone.utc), True),
+        (MOSCOW, datetime(2024, 6, 1, 20, tzinfo=timezone.utc), False),
+        (MOSCOW, datetime(2024, 6, 2, 23, tzinfo=timezone.utc), False),
+        (SYDNEY, datetime(2024, 6, 1, 0, tzinfo=timezone.utc), True),
+        (SYDNEY, datetime(2024, 6, 1, 12, tzinfo=timezone.utc), False),
+        (SVALBARD, datetime(2024, 6, 2, 0, tzinfo=timezone.utc), True),
+        (SVALBARD, datetime(2024, 12, 2, 12, tzinfo=timezone.utc), False),
+    ],
+)
+def test_is_day(location, moment, expected):
+    """Test forecast hour is classified by sunrise and sunset."""
+    table = solar_table(*location, moment.replace(hour=6))
+    assert table.is_day_at(moment) is expected
+
+
+def test_table_is_cached():
+    """Test table is calculated once per location and day."""
+    moment = datetime(2024, 6, 1, 6, tzinfo=timezone.utc)
+    assert solar_table(*MOSCOW, moment) is solar_table(*MOSCOW, moment.replace(hour=9))
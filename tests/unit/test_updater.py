@@ -1,8 +1,31 @@
 """Tests for updater."""
-from homeassistant.components.weather import ATTR_FORECAST_NATIVE_TEMP_LOW
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.components.weather import (
+    ATTR_FORECAST_NATIVE_PRECIPITATION,
+    ATTR_FORECAST_NATIVE_TEMP,
+    ATTR_FORECAST_NATIVE_TEMP_LOW,
+    ATTR_FORECAST_NATIVE_WIND_GUST_SPEED,
+    ATTR_FORECAST_TIME,
+)
 import pytest
 
-from custom_components.yandex_weather.const import ATTR_MIN_FORECAST_TEMPERATURE
+from custom_components.yandex_weather.const import (
+    ATTR_API_TEMPERATURE,
+    ATTR_API_WEATHER_TIME,
+    ATTR_FORECAST_HOURLY,
+    ATTR_FORECAST_INDEX,
+    ATTR_MIN_FORECAST_TEMPERATURE,
+    FORECAST_PRECIPITATION_TOTAL,
+    FORECAST_TEMPERATURE_MAX,
+    FORECAST_TEMPERATURE_MEAN,
+    FORECAST_TEMPERATURE_MIN,
+    FORECAST_WIND_GUST_MAX,
+    QUERY,
+    forecast_statistic_key,
+)
+from custom_components.yandex_weather.keys import ApiKeyPool
 from custom_components.yandex_weather.updater import WeatherUpdater
 
 scenarios = {
@@ -70,3 +93,135 @@ async def test_update(hass, key, value, _bypass_get_data):
 async def test_min_forecast_temperature(hass, forecasts, expected):
     """Test min forecast temperature getter."""
     assert (await WeatherUpdater.get_min_forecast_temperature(forecasts)) == expected
+
+
+def test_forecast_statistics():
+    """Test forecast statistics for next hours."""
+    now = datetime(2024, 1, 1, 10, 30, tzinfo=timezone.utc)
+    forecasts = [
+        {
+            ATTR_FORECAST_TIME: (
+                now.replace(minute=0) + timedelta(hours=h + 1)
+            ).isoformat(),
+            ATTR_FORECAST_NATIVE_TEMP: t,
+            ATTR_FORECAST_NATIVE_WIND_GUST_SPEED: g,
+            ATTR_FORECAST_NATIVE_PRECIPITATION: p,
+        }
+        for h, (t, g, p) in enumerate(
+            [(1, 5, 0), (3, 7, 0.5), (2, 4, 1), (-4, 10, 0), (0, 1, 0.2)]
+        )
+    ]
+
+    result = WeatherUpdater.get_forecast_statistics(now, forecasts, (3, 24))
+
+    assert result[forecast_statistic_key(FORECAST_TEMPERATURE_MIN, 3)] == 1
+    assert result[forecast_statistic_key(FORECAST_TEMPERATURE_MAX, 3)] == 3
+    assert result[forecast_statistic_key(FORECAST_TEMPERATURE_MEAN, 3)] == 2
+    assert result[forecast_statistic_key(FORECAST_WIND_GUST_MAX, 3)] == 7
+    assert result[forecast_statistic_key(FORECAST_PRECIPITATION_TOTAL, 3)] == 1.5
+    assert result[forecast_statistic_key(FORECAST_TEMPERATURE_MIN, 24)] == -4
+    assert result[forecast_statistic_key(FORECAST_TEMPERATURE_MEAN, 24)] == 0.4
+    assert result[forecast_statistic_key(FORECAST_PRECIPITATION_TOTAL, 24)] == 1.7
+
+
+def _weather(start: datetime, hours: int = 48) -> dict:
+    return {
+        "now": {"temperature": -1, "condition": "CLEAR", "daytime": "DAY"},
+        "forecast": {
+            "days": [
+                {
+                    "hours": [
+                        {
+                            "time": (start + timedelta(hours=h)).isoformat(),
+                            "temperature": h,
+                            "condition": "CLEAR",
+                        }
+                        for h in range(hours)
+                    ]
+                }
+            ]
+        },
+    }
+
+
+def test_build():
+    """Test snapshot is built from response without Home Assistant."""
+    updater = WeatherUpdater(55.75, 37.62, "key", None, "device")
+    start = datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+
+    result, reused = updater.build(_weather(start), start, {})
+
+    assert not reused
+
+    assert result[ATTR_API_WEATHER_TIME] == start
+    assert result[ATTR_API_TEMPERATURE] == -1
+    hourly = result[ATTR_FORECAST_HOURLY]
+    assert isinstance(hourly, tuple)
+    assert hourly[0][ATTR_FORECAST_TIME] == (start + timedelta(hours=1)).isoformat()
+    assert hourly[0][ATTR_FORECAST_NATIVE_TEMP] == 1
+    assert result[ATTR_MIN_FORECAST_TEMPERATURE] == 1
+    assert result[ATTR_FORECAST_INDEX] is not None
+
+
+@pytest.mark.asyncio
+async def test_performance(hass):
+    """Test build and loop blocking time are measured, sections are applied."""
+    updater = WeatherUpdater(55.75, 37.62, "key", hass, "device")
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    with patch.object(
+        updater,
+        "fetch",
+        AsyncMock(return_value={"weatherByPoint": _weather(start)}),
+    ):
+        await updater.update()
+        await updater.update()
+
+    performance = updater.performance
+    assert performance["forecast_hours"] == 48
+    assert performance["build_seconds"] > 0
+    assert performance["loop_blocking_seconds"] > 0
+    assert performance["refreshes"] == 2
+    assert performance["reused_sections"] == {"now": 1, "forecast": 1}
+
+
+def test_unchanged_sections_are_reused():
+    """Test processing is skipped for unchanged response sections."""
+    updater = WeatherUpdater(55.75, 37.62, "key", None, "device")
+    start = datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+    weather = _weather(start)
+
+    sections = {}
+    first, _ = updater.build(weather, start, sections)
+    second, reused = updater.build(weather, start + timedelta(minutes=90), sections)
+
+    assert reused == {"now": 1, "forecast": 1}
+    assert not updater.performance["reused_sections"]
+    # only forecast window is moved
+    assert second[ATTR_FORECAST_HOURLY][0] is first[ATTR_FORECAST_HOURLY][1]
+    assert (
+        second[ATTR_FORECAST_HOURLY][0][ATTR_FORECAST_TIME]
+        == (start + timedelta(hours=2)).isoformat()
+    )
+
+    weather["now"]["temperature"] = 0
+    _, reused = updater.build(weather, start, sections)
+    assert reused == {"forecast": 1}
+
+
+@pytest.mark.asyncio
+async def test_request_point_uses_key_pool():
+    """Test point lookup requests API with pooled keys of updater."""
+    pool = ApiKeyPool()
+    pool.add(["test_point_pooled"])
+    updater = WeatherUpdater(55.75, 37.62, "primary", None, "device", key_pool=pool)
+    weather = {"now": {"temperature": 1}}
+    with patch.object(
+        updater,
+        "request_with_key",
+        AsyncMock(return_value={"weatherByPoint": weather}),
+    ) as request:
+        assert await updater.request_point(1.5, 2.5) == weather
+
+    request.assert_awaited_once_with(
+        "test_point_pooled", QUERY, {"lat": 1.5, "lon": 2.5}
+    )
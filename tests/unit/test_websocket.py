@@ -0,0 +1,42 @@
+"""Tests for delta forecast subscription."""
+from datetime import datetime, timedelta, timezone
+import json
+
+from custom_components.yandex_weather.websocket import forecast_delta
+
+START = datetime(2024, 1, 1, 11, tzinfo=timezone.utc)
+
+
+def _forecast(first_hour: int, hours: int = 24) -> list[dict]:
+    return [
+        {
+            "datetime": (START + timedelta(hours=h)).isoformat(),
+            "condition": "cloudy",
+            "native_temperature": h % 5,
+            "humidity": 80,
+            "native_wind_speed": 3.5,
+            "wind_bearing": 180,
+        }
+        for h in range(first_hour, first_hour + hours)
+    ]
+
+
+def test_forecast_delta():
+    """Test next hourly refresh is sent as small delta."""
+    old = _forecast(0)
+    new = _forecast(1)
+    new[0]["native_temperature"] = 10
+
+    delta = forecast_delta(old, new)
+
+    assert delta["added"] == [new[-1]]
+    assert delta["removed"] == [old[0]["datetime"]]
+    assert delta["changed"] == [
+        {"datetime": new[0]["datetime"], "native_temperature": 10}
+    ]
+    assert forecast_delta(new, new) == {"added": [], "removed": [], "changed": []}
+
+    # bytes sent per refresh compared with full forecast resend
+    full = len(json.dumps({"type": "forecast", "forecast": new}))
+    sent = len(json.dumps({"type": "delta", **delta}))
+    assert sent * 10 < full